@@ -0,0 +1,126 @@
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .engine import TranslationEngine
+from .fixer import FixerAgent
+from .llm_client import LLMClient
+from .planner import MigrationPlanner
+from .scaffolder import ProjectScaffolder
+from .scanner import ProjectScanner
+from .synthetic import SyntheticProjectGenerator
+from .translator import CodeTranslator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class SimulatedFixerAgent(FixerAgent):
+    """
+    FixerAgent whose builds are simulated: a fraction of the generated Java
+    files start out broken and compile once fix_file has rewritten them.
+    """
+    def __init__(self, project_dir: str, llm_client: LLMClient, error_rate: float = 0.1, seed: int = 0, **kwargs):
+        super().__init__(project_dir, llm_client, **kwargs)
+        sources = sorted(self.project_dir.rglob("*.java"))
+        rng = random.Random(seed)
+        self.broken = {str(p) for p in sources if rng.random() < error_rate}
+
+    def _run(self, cmd: List[str], on_line: Optional[Callable[[str], bool]] = None) -> Tuple[bool, str]:
+        if "dependency:build-classpath" in cmd:
+            return (False, "")
+        lines = []
+        for path in sorted(self.broken):
+            lines.append(f"[ERROR] {path}:[1,1] cannot find symbol")
+            lines.append("[ERROR]   symbol:   class Missing")
+        if self.broken:
+            lines.append("[INFO] BUILD FAILURE")
+        for line in lines:
+            if on_line is not None and on_line(line):
+                return (False, "\n".join(lines))
+        return (not self.broken, "\n".join(lines))
+
+    def fix_file(self, file_path: str, error_msgs: List[str], patch: Optional[bool] = None):
+        super().fix_file(file_path, error_msgs, patch=patch)
+        self.broken.discard(str(self.project_dir / file_path))
+
+
+def _timed(fn, *args, **kwargs) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(generator: SyntheticProjectGenerator, llm: LLMClient, workers: int = 8, batch_size: int = 1,
+                  shard_size: int = 40, fix_error_rate: float = 0.1, fix_retries: int = 3,
+                  work_dir: str = None) -> Dict[str, Any]:
+    """
+    Generates a synthetic project and pushes it through scan, create_plan,
+    translation and auto_heal, measuring each phase. Reproducible for a
+    fixed generator seed and LLM latency settings.
+    """
+    with tempfile.TemporaryDirectory(dir=work_dir, prefix="migrator-bench-") as tmp:
+        input_dir = Path(tmp) / "input"
+        output_dir = Path(tmp) / "output"
+        project = generator.generate(str(input_dir))
+
+        phases = {}
+        scan_result, phases["scan"] = _timed(
+            ProjectScanner(str(input_dir)).scan, lazy=True, index_symbols=True
+        )
+        planner = MigrationPlanner(llm, shard_size=shard_size, workers=workers)
+        plan, phases["create_plan"] = _timed(planner.create_plan, scan_result)
+
+        scaffolder = ProjectScaffolder(str(output_dir))
+        scaffolder.create_structure(plan)
+        contents = scan_result["contents"]
+        translator = CodeTranslator(llm, symbol_index=scan_result["symbols"])
+        engine = TranslationEngine(translator, workers=workers, batch_size=batch_size)
+
+        def translate_all() -> int:
+            failed = 0
+            results = engine.run(plan.file_mappings, lambda m: contents[m.source_file], plan,
+                                 size_of=lambda m: contents.record(m.source_file).size)
+            for result in results:
+                if result.error:
+                    failed += 1
+                    continue
+                scaffolder.write_file_async(result.mapping.target_path, result.java_code)
+            scaffolder.flush()
+            return failed
+
+        failed, phases["translate"] = _timed(translate_all)
+
+        agent = SimulatedFixerAgent(str(output_dir), llm, error_rate=fix_error_rate, workers=workers)
+        initially_broken = len(agent.broken)
+        healed, phases["auto_heal"] = _timed(agent.auto_heal, max_retries=fix_retries)
+
+    translated = len(plan.file_mappings) - failed
+    return {
+        "project": project,
+        "settings": {"workers": workers, "batch_size": batch_size, "shard_size": shard_size,
+                     "fix_error_rate": fix_error_rate},
+        "phases_s": phases,
+        "total_s": sum(phases.values()),
+        "files_translated": translated,
+        "files_failed": failed,
+        "translate_files_per_s": translated / phases["translate"] if phases["translate"] else 0.0,
+        "overall_files_per_s": translated / sum(phases.values()) if sum(phases.values()) else 0.0,
+        "fix_files_broken": initially_broken,
+        "auto_heal_succeeded": healed,
+        "fast_path_files": translator.fast_path_files,
+        "llm_calls": getattr(llm, "calls", None),
+        "peak_rss_mb": peak_rss_mb(),
+    }
@@ -0,0 +1,129 @@
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# [ERROR] /path/to/File.java:[line,col] error message  (Maven)
+MAVEN_ERROR = re.compile(r"\[ERROR\] (.*?):\[(\d+),(\d+)\] (.*)")
+# /path/to/File.java:18: error: <identifier> expected  (javac itself, fast check)
+JAVAC_ERROR = re.compile(r"^(.*?\.java):(\d+): error: (.*)")
+# 'cannot find symbol' is followed by a detail line naming the symbol
+SYMBOL_DETAIL = re.compile(r"^(?:\[ERROR\])?\s+symbol:\s+(.*)")
+# End of the compiler's error listing: "[INFO] 12 errors", "3 errors", "BUILD FAILURE"
+ERRORS_END = re.compile(r"^(?:\[INFO\]\s+)?\d+ errors?\s*$|BUILD FAILURE")
+
+
+def dedupe_errors(entries: List[List]) -> List[str]:
+    # Maven repeats every error in its summary, and one missing import
+    # shows up once per usage; group identical messages by line.
+    lines_by_msg = {}
+    for line_no, msg in entries:
+        lines = lines_by_msg.setdefault(msg, [])
+        if line_no not in lines:
+            lines.append(line_no)
+
+    deduped = []
+    for msg, lines in lines_by_msg.items():
+        if len(lines) == 1:
+            deduped.append(f"Line {lines[0]}: {msg}")
+        else:
+            deduped.append(f"Lines {', '.join(str(n) for n in sorted(lines))}: {msg}")
+    return deduped
+
+
+class BuildErrorStream:
+    """
+    Incremental parser for Maven/javac output, fed one line at a time while
+    the build runs. Compilers list a file's errors together, so when errors
+    for a new file start (or the error listing ends) the previous file is
+    reported complete through on_file_complete(path, messages). Repeats of an
+    error already seen (Maven's summary lists everything again) are dropped;
+    genuinely new errors for a file that was already reported are held back
+    and returned by finish().
+    """
+    def __init__(self, project_dir: Path, on_file_complete: Optional[Callable[[str, List[str]], None]] = None,
+                 max_errors: Optional[int] = None):
+        self.project_dir = Path(project_dir)
+        self.on_file_complete = on_file_complete
+        self.max_errors = max_errors
+        self._raw: Dict[str, List[List]] = {}
+        self._seen: Dict[str, Set[Tuple[int, Optional[str], str]]] = {}
+        # path -> how many of its entries have been handed out
+        self._reported: Dict[str, int] = {}
+        self._current: Optional[str] = None
+        self._last = None
+
+    @property
+    def error_count(self) -> int:
+        return sum(len(seen) for seen in self._seen.values())
+
+    @property
+    def reported(self) -> Set[str]:
+        return set(self._reported)
+
+    def _relative(self, file_path: str) -> str:
+        # Make relative path for cleaner context if possible
+        try:
+            return str(Path(file_path).relative_to(self.project_dir))
+        except ValueError:
+            return file_path  # Absolute if not in project dir
+
+    def _complete(self, rel_path: Optional[str]):
+        if rel_path is None or rel_path in self._reported:
+            return
+        self._reported[rel_path] = len(self._raw[rel_path])
+        if self.on_file_complete is not None:
+            self.on_file_complete(rel_path, dedupe_errors(self._raw[rel_path]))
+
+    def feed(self, line: str) -> bool:
+        """Consumes one line of output. Returns True once the error threshold is hit."""
+        match = MAVEN_ERROR.search(line)
+        javac_match = None if match else JAVAC_ERROR.search(line)
+        if match or javac_match:
+            if match:
+                file_path, line_no, column, msg = match.group(1), match.group(2), match.group(3), match.group(4)
+            else:
+                file_path, line_no, column, msg = javac_match.group(1), javac_match.group(2), None, javac_match.group(3)
+            rel_path = self._relative(file_path)
+            key = (int(line_no), column, msg.strip())
+            seen = self._seen.setdefault(rel_path, set())
+            if key in seen:
+                # A repeat (with its symbol detail lines) adds nothing
+                self._last = None
+                return False
+            seen.add(key)
+            if rel_path != self._current:
+                self._complete(self._current)
+                self._current = rel_path
+            self._last = [int(line_no), msg.strip()]
+            self._raw.setdefault(rel_path, []).append(self._last)
+            return self.max_errors is not None and self.error_count >= self.max_errors
+
+        symbol_match = SYMBOL_DETAIL.match(line)
+        if symbol_match and self._last is not None:
+            self._last[1] += f" (symbol: {' '.join(symbol_match.group(1).split())})"
+            # Same error, now with its symbol
+            return False
+        self._last = None
+        if ERRORS_END.search(line):
+            self._complete(self._current)
+            self._current = None
+        return False
+
+    def finish(self) -> Dict[str, List[str]]:
+        """
+        Build is over: returns the errors not handed out yet, i.e. files never
+        reported (including the one still open) and the new errors of files
+        that were reported before those errors showed up.
+        """
+        self._current = None
+        pending = {}
+        for path, entries in self._raw.items():
+            new = entries[self._reported.get(path, 0):]
+            if new:
+                pending[path] = dedupe_errors(new)
+                self._reported[path] = len(entries)
+        return pending
+
+    def errors(self) -> Dict[str, List[str]]:
+        """Every file with errors seen so far: {file_path: [error_messages]}."""
+        return {path: dedupe_errors(entries) for path, entries in self._raw.items()}
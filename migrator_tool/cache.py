@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("MIGRATOR_CACHE_DIR", Path.home() / ".cache" / "migrator_tool"))
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Bump when the prompt/response format changes in a way that invalidates old entries
+CACHE_VERSION = 1
+
+
+class ResponseCache:
+    """
+    On-disk, content-addressed cache of LLM responses.
+    Entries are keyed by a hash of (model, system instruction, prompt) and
+    evicted least-recently-used once the total size exceeds `max_bytes`.
+    Writes go through a temp file + rename, so concurrent processes sharing
+    the directory never see a half-written entry.
+    """
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR).resolve()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> size, oldest first
+        self._total_bytes = 0
+        self._load_index()
+
+    @staticmethod
+    def make_key(model_name: str, system_instruction: str, prompt: str) -> str:
+        payload = json.dumps([CACHE_VERSION, model_name, system_instruction, prompt])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.txt"
+
+    def _load_index(self):
+        # Rebuild LRU order from mtimes; hits touch the file so this survives restarts
+        found = []
+        for path in self.cache_dir.glob("*/*.txt"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            found.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = f.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+                if key in self._entries:
+                    # Evicted by another process
+                    self._total_bytes -= self._entries.pop(key)
+            return None
+
+        with self._lock:
+            self.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            else:
+                self._entries[key] = len(value.encode("utf-8"))
+                self._total_bytes += self._entries[key]
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: str):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = value.encode("utf-8")
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def _evict(self):
+        # Caller holds the lock
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+            }
@@ -0,0 +1,234 @@
+import re
+from dataclasses import dataclass
+from pathlib import PurePath
+from typing import Dict, List, Optional, Tuple
+from .symbols import SymbolIndex, blank_noise, type_declarations
+
+# Splitting very large C# files into member chunks that can be translated in
+# parallel and stitched back into one Java class.
+
+_USING_LINE = re.compile(r'^[ \t]*(?:global\s+)?using\s+[^;=\n]+;[ \t]*$', re.M)
+_JAVA_IMPORT = re.compile(r'^[ \t]*import\s+(?:static\s+)?[\w.*]+\s*;[ \t]*$', re.M)
+_JAVA_PACKAGE = re.compile(r'^[ \t]*package\s+[\w.]+\s*;[ \t]*$', re.M)
+_JAVA_CLASS_WRAPPER = re.compile(
+    r'^\s*(?:@\w+(?:\([^)]*\))?\s*)*(?:(?:public|protected|private|abstract|final|static)\s+)*'
+    r'(?:class|interface|record|enum)\s+\w+[^{]*\{'
+)
+# A '}' only ends a member when the next token starts a new one, not for
+# `} = value;` initialisers or lambdas inside expression-bodied members
+_MEMBER_START = re.compile(r'[\w\[\}#@]')
+
+
+def _matching_brace(text: str, open_at: int) -> int:
+    depth = 0
+    for i in range(open_at, len(text)):
+        if text[i] == "{":
+            depth += 1
+        elif text[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+@dataclass
+class ClassLayout:
+    name: str
+    header: str          # usings, namespace and declaration up to and including the body's "{"
+    members: List[str]   # member source in order, each with its leading comments/attributes
+    footer: str          # the body's "}" and whatever follows
+
+    def skeleton(self, max_chars: int = 6000) -> str:
+        """The class with member bodies and initialisers dropped, as context for chunk prompts."""
+        lines = []
+        for member in self.members:
+            blank = blank_noise(member)
+            cut = min((p for p in (blank.find(t) for t in ("{", "=>", "=")) if p != -1), default=len(blank))
+            signature = " ".join(blank[:cut].rstrip(" ;").split())
+            if not signature:
+                continue
+            if "(" not in signature and not any(type_declarations(signature)):
+                if blank[cut:cut + 1] == "{":
+                    signature += " { get; set; }"
+                elif blank[cut:cut + 2] == "=>":
+                    signature += " { get; }"
+            lines.append(f"    {signature};" if not signature.endswith("}") else f"    {signature}")
+        body, used = [], 0
+        for i, line in enumerate(lines):
+            if used + len(line) > max_chars:
+                body.append(f"    // ... {len(lines) - i} more members")
+                break
+            body.append(line)
+            used += len(line)
+        return self.header.strip() + "\n" + "\n".join(body) + "\n" + self.footer.strip()
+
+
+def parse_layout(source: str, max_other_chars: int = 2000) -> Optional[ClassLayout]:
+    """
+    Splits the file's main (largest top-level) type into members. None if
+    there is no such type or the file holds other sizeable types as well.
+    """
+    blank = blank_noise(source)
+    spans = []
+    for match in type_declarations(blank):
+        if any(start <= match.start() < end for _, start, end in spans):
+            continue  # nested type, stays inside its parent's members
+        open_at = blank.find("{", match.end())
+        semicolon = blank.find(";", match.end())
+        if open_at == -1 or (semicolon != -1 and semicolon < open_at):
+            continue
+        close_at = _matching_brace(blank, open_at)
+        if close_at == -1:
+            return None
+        spans.append((match.group("name"), open_at, close_at + 1))
+    if not spans:
+        return None
+
+    name, open_at, end = max(spans, key=lambda s: s[2] - s[1])
+    if any(e - s > max_other_chars for n, s, e in spans if (n, s) != (name, open_at)):
+        return None
+
+    members, member_start, depth = [], open_at + 1, 0
+    close_at = end - 1
+    i = open_at + 1
+    while i < close_at:
+        ch = blank[i]
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                rest = blank[i + 1:close_at].lstrip()
+                if not rest or _MEMBER_START.match(rest):
+                    members.append(source[member_start:i + 1])
+                    member_start = i + 1
+        elif ch == ";" and depth == 0:
+            members.append(source[member_start:i + 1])
+            member_start = i + 1
+        i += 1
+    if source[member_start:close_at].strip():
+        members.append(source[member_start:close_at])
+        member_start = close_at
+    members = [m for m in members if m.strip()]
+    # Whitespace before the closing brace stays with it
+    return ClassLayout(name=name, header=source[:open_at + 1], members=members, footer=source[member_start:])
+
+
+def chunk_members(members: List[str], max_chunk_chars: int) -> List[str]:
+    """Consecutive members packed into chunks of about max_chunk_chars."""
+    chunks, current, size = [], [], 0
+    for member in members:
+        if current and size + len(member) > max_chunk_chars:
+            chunks.append("".join(current))
+            current, size = [], 0
+        current.append(member)
+        size += len(member)
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+def split_chunk_output(java: str) -> Tuple[List[str], str]:
+    """(imports, member code) from a chunk response, unwrapping a stray class wrapper."""
+    imports = [line.strip() for line in _JAVA_IMPORT.findall(java)]
+    body = _JAVA_PACKAGE.sub("", _JAVA_IMPORT.sub("", java)).strip()
+    wrapper = _JAVA_CLASS_WRAPPER.match(body)
+    if wrapper and body.endswith("}"):
+        body = body[wrapper.end():-1].strip()
+    return imports, body
+
+
+def assemble_class(shell: str, imports: List[str], member_blocks: List[str]) -> str:
+    """Inserts translated members into the shell's (empty) class body and merges imports."""
+    close_at = shell.rstrip().rfind("}")
+    if close_at == -1:
+        raise ValueError("Class shell has no body")
+    existing = {line.strip() for line in _JAVA_IMPORT.findall(shell)}
+    missing = []
+    for line in imports:
+        if line not in existing and line not in missing:
+            missing.append(line)
+
+    members = "\n\n".join("\n".join("    " + line if line.strip() else "" for line in block.splitlines())
+                          for block in member_blocks if block.strip())
+    java = shell[:close_at].rstrip() + "\n\n" + members + "\n}\n"
+    if missing:
+        anchors = list(_JAVA_IMPORT.finditer(java)) or list(_JAVA_PACKAGE.finditer(java))
+        at = anchors[-1].end() if anchors else 0
+        java = java[:at] + "\n" + "\n".join(missing) + java[at:]
+    return java
+
+
+def partial_class_groups(symbols: SymbolIndex, paths: List[str]) -> Dict[str, List[str]]:
+    """
+    {primary path: all part paths} for partial types declared across several
+    of `paths`. The primary is the part named after the type, else the first.
+    """
+    wanted = set(paths)
+    groups: Dict[tuple, List[str]] = {}
+    for path in paths:
+        file_symbols = symbols.files.get(path)
+        if file_symbols is None:
+            continue
+        for type_symbol in file_symbols.types:
+            if not re.search(r"\bpartial\b", type_symbol.header):
+                continue
+            parts = groups.setdefault((type_symbol.namespace, type_symbol.name), [])
+            if path not in parts:
+                parts.append(path)
+
+    merged = {}
+    claimed = set()
+    for (_, name), parts in groups.items():
+        parts = [p for p in parts if p in wanted and p not in claimed]
+        if len(parts) < 2:
+            continue
+        primary = next((p for p in parts if PurePath(p).stem == name), parts[0])
+        ordered = [primary] + [p for p in parts if p != primary]
+        merged[primary] = ordered
+        claimed.update(ordered)
+    return merged
+
+
+def merge_partial_sources(sources: List[str]) -> str:
+    """
+    One C# source for all parts of a partial class: the first part's layout
+    with the other parts' members appended and their usings added.
+    """
+    base = parse_layout(sources[0])
+    if base is None:
+        return "\n\n".join(sources)
+    usings = set(_USING_LINE.findall(base.header))
+    extra_usings, members = [], list(base.members)
+    for source in sources[1:]:
+        layout = parse_layout(source)
+        if layout is None:
+            return "\n\n".join(sources)
+        for using in _USING_LINE.findall(layout.header):
+            if using not in usings:
+                usings.add(using)
+                extra_usings.append(using.strip())
+        members.extend(layout.members)
+    header = "\n".join(extra_usings) + ("\n" if extra_usings else "") + base.header
+    return header + "".join(members) + base.footer
+
+
+class PartialClasses:
+    """
+    Partial types spread over several files of a plan. The primary part is
+    translated from the merged source of all parts; the other parts produce
+    no Java file of their own.
+    """
+    def __init__(self, symbols: SymbolIndex, contents, paths: List[str]):
+        self.groups = partial_class_groups(symbols, paths)
+        self.secondary = {p for parts in self.groups.values() for p in parts[1:]}
+        self.contents = contents
+
+    def source(self, path: str) -> str:
+        parts = self.groups.get(path)
+        if parts is None:
+            return self.contents[path]
+        return merge_partial_sources([self.contents[p] for p in parts])
+
+    def size(self, path: str) -> int:
+        return sum(self.contents.record(p).size for p in self.groups.get(path, [path]))
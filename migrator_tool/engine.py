@@ -0,0 +1,108 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional
+from .models import FileMapping, MigrationPlan
+from .translator import CodeTranslator
+
+DEFAULT_MAX_BATCH_FILE_CHARS = 4000
+
+
+def plan_units(mappings: List[FileMapping], size_of: Optional[Callable[[FileMapping], int]], batch_size: int = 1,
+               max_batch_file_chars: int = DEFAULT_MAX_BATCH_FILE_CHARS) -> List[List[int]]:
+    """
+    Groups mapping indices into units of work. Large files always travel
+    alone; small ones are grouped per package up to batch_size.
+    """
+    if batch_size <= 1 or size_of is None:
+        return [[i] for i in range(len(mappings))]
+
+    units = []
+    open_batches = {}  # package -> indices being filled
+    for i, mapping in enumerate(mappings):
+        if size_of(mapping) > max_batch_file_chars:
+            units.append([i])
+            continue
+        batch = open_batches.setdefault(mapping.package_name, [])
+        batch.append(i)
+        if len(batch) == batch_size:
+            units.append(open_batches.pop(mapping.package_name))
+    units.extend(open_batches.values())
+    return units
+
+
+@dataclass
+class TranslationResult:
+    index: int
+    mapping: FileMapping
+    java_code: Optional[str] = None
+    error: Optional[Exception] = None
+
+
+class TranslationEngine:
+    """
+    Runs CodeTranslator over many file mappings on a thread pool.
+    LLM calls are I/O bound, so threads are enough to overlap the round trips.
+    With batch_size > 1, small files sharing a package are packed into one request.
+    """
+    def __init__(self, translator: CodeTranslator, workers: int = 8, batch_size: int = 1,
+                 max_batch_file_chars: int = DEFAULT_MAX_BATCH_FILE_CHARS):
+        self.translator = translator
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.max_batch_file_chars = max_batch_file_chars
+
+    def _translate(self, indices: List[int], mappings: List[FileMapping],
+                   load_source: Callable[[FileMapping], str], plan: MigrationPlan) -> List[TranslationResult]:
+        if len(indices) == 1:
+            index = indices[0]
+            mapping = mappings[index]
+            try:
+                # Sources are loaded inside the worker so only in-flight files are held in memory
+                source = load_source(mapping)
+                java_code = self.translator.translate_file(source, mapping, plan)
+                return [TranslationResult(index, mapping, java_code=java_code)]
+            except Exception as e:
+                return [TranslationResult(index, mapping, error=e)]
+
+        try:
+            items = [(load_source(mappings[i]), mappings[i]) for i in indices]
+            translated = self.translator.translate_batch(items, plan)
+        except Exception:
+            # Fall back to one request per member rather than failing the whole batch
+            return [r for i in indices for r in self._translate([i], mappings, load_source, plan)]
+        return [
+            TranslationResult(i, mappings[i], java_code=translated[mappings[i].source_file])
+            for i in indices
+        ]
+
+    def run(
+        self,
+        mappings: List[FileMapping],
+        load_source: Callable[[FileMapping], str],
+        plan: MigrationPlan,
+        on_complete: Optional[Callable[[TranslationResult], None]] = None,
+        size_of: Optional[Callable[[FileMapping], int]] = None,
+    ) -> Iterator[TranslationResult]:
+        """
+        Translates mappings concurrently, reading each source via `load_source`.
+        `on_complete` fires as soon as any file finishes (for progress reporting),
+        while results are yielded strictly in mapping order so the caller can write
+        them sequentially from its own thread. `size_of` enables batching.
+        """
+        finished = {}
+        next_index = 0
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="translate") as pool:
+            futures = [
+                pool.submit(self._translate, unit, mappings, load_source, plan)
+                for unit in plan_units(mappings, size_of, self.batch_size, self.max_batch_file_chars)
+            ]
+            for future in as_completed(futures):
+                for result in future.result():
+                    if on_complete:
+                        on_complete(result)
+                    finished[result.index] = result
+                # Flush the contiguous prefix that is ready
+                while next_index in finished:
+                    yield finished.pop(next_index)
+                    next_index += 1
@@ -0,0 +1,169 @@
+import json
+import math
+from collections import defaultdict
+from pathlib import PurePath
+from typing import Any, Dict, Optional, Tuple
+from .engine import plan_units
+from .models import MigrationPlan
+from .nuget import DependencyResolver, parse_csproj
+from .planner import default_mapping, planning_inputs, shard_by_directory, summarize_projects
+from .routing import ModelRouter
+from .translator import CodeTranslator
+
+# Rough sizing constants; good to within tens of percent, which is the point
+CHARS_PER_TOKEN = 4
+TRANSLATE_TEMPLATE_TOKENS = 300   # rules and target context around each source
+PLAN_TEMPLATE_TOKENS = 400
+OUTPUT_RATIO = 1.1                # Java comes out a bit longer than the C#
+MAPPING_TOKENS_PER_FILE = 50      # one file_mappings entry in a plan response
+PLAN_SETTINGS_TOKENS = 500        # dependencies + properties in a plan response
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class MigrationEstimator:
+    """
+    Offline projection of what `migrate` would send to the LLM for a scanned
+    project: calls, tokens and cost per phase. Uses the real planner sharding,
+    batching, chunking, routing, reference context, fast path and NuGet
+    resolution with provisional (directory-derived) file mappings; the fix
+    phase isn't projected.
+    prices: {model: (usd_per_1m_input, usd_per_1m_output)}.
+    """
+    def __init__(self, router: Optional[ModelRouter] = None, batch_size: int = 1, shard_size: int = 40,
+                 fast_path: bool = True, prices: Optional[Dict[str, Tuple[float, float]]] = None,
+                 chunk_chars: int = 20000, resolver: Optional[DependencyResolver] = None):
+        self.router = router or ModelRouter()
+        self.batch_size = batch_size
+        self.shard_size = shard_size
+        self.fast_path = fast_path
+        self.prices = prices or {}
+        self.chunk_chars = chunk_chars
+        self.resolver = resolver or DependencyResolver()
+
+    def _cost(self, model: str, prompt_tokens: int, output_tokens: int) -> float:
+        price_in, price_out = self.prices.get(model, (0.0, 0.0))
+        return (prompt_tokens * price_in + output_tokens * price_out) / 1_000_000
+
+    def estimate(self, scan_result: Dict[str, Any]) -> Dict[str, Any]:
+        structure = scan_result["structure"]
+        contents = scan_result["contents"]
+        files = structure["files"]
+        cs_files = [f for f in files if f.endswith(".cs") and f in contents]
+
+        by_extension = defaultdict(lambda: {"files": 0, "bytes": 0})
+        for path in files:
+            ext = PurePath(path).suffix.lower() or "(none)"
+            by_extension[ext]["files"] += 1
+            if hasattr(contents, "record") and path in contents:
+                by_extension[ext]["bytes"] += contents.record(path).size
+
+        # Planning: one call, or a skeleton call plus one per shard. The model sees
+        # .csproj files as the planner summarizes them, not their XML
+        important = planning_inputs(scan_result)
+        projects = [parse_csproj(path, text) for path, text in important.items() if path.endswith(".csproj")]
+        _, unmapped = self.resolver.resolve(projects)
+        important_tokens = estimate_tokens(json.dumps(summarize_projects(important, projects, unmapped)))
+        phases = {}
+        if len(cs_files) <= self.shard_size:
+            prompt = PLAN_TEMPLATE_TOKENS + important_tokens + estimate_tokens(json.dumps(files))
+            output = PLAN_SETTINGS_TOKENS + MAPPING_TOKENS_PER_FILE * len(cs_files)
+            phases["plan"] = self._phase([(self.router.pro_model, prompt, output)])
+        else:
+            dir_counts = defaultdict(int)
+            for path in cs_files:
+                dir_counts[str(PurePath(path).parent)] += 1
+            skeleton_prompt = PLAN_TEMPLATE_TOKENS + important_tokens + estimate_tokens(json.dumps(dir_counts))
+            calls = [(self.router.pro_model, skeleton_prompt, PLAN_SETTINGS_TOKENS)]
+            for shard in shard_by_directory(cs_files, self.shard_size):
+                shard_prompt = "x" * (PLAN_TEMPLATE_TOKENS * CHARS_PER_TOKEN) + json.dumps(shard)
+                calls.append((self.router.choose(shard_prompt), estimate_tokens(shard_prompt),
+                              MAPPING_TOKENS_PER_FILE * len(shard)))
+            phases["plan"] = self._phase(calls)
+
+        # Translation, with provisional mappings so context and fast path work offline
+        mappings = [default_mapping(path, "com.example.app") for path in cs_files]
+        plan = MigrationPlan(project_name=structure["root_name"], dependencies=[], file_mappings=mappings,
+                             application_properties={})
+        translator = CodeTranslator(None, symbol_index=scan_result.get("symbols"), fast_path=self.fast_path,
+                                    chunk_chars=self.chunk_chars)
+
+        per_file = []
+        llm_mappings = []
+        chunk_calls = []
+        for mapping in mappings:
+            source = contents[mapping.source_file]
+            record = {"file": mapping.source_file, "bytes": len(source.encode("utf-8")),
+                      "source_tokens": estimate_tokens(source), "calls": 1}
+            fast = translator.try_fast_path(source, mapping, plan) is not None
+            split = None if fast else translator.chunk_split(source)
+            if fast:
+                record.update(fast_path=True, prompt_tokens=0, output_tokens=0, model=None, calls=0)
+            elif split is not None:
+                # A shell call plus one per member chunk, each carrying the class skeleton
+                layout, chunks = split
+                context = translator.reference_context(mapping, plan) + "\n" + layout.skeleton()
+                overhead = TRANSLATE_TEMPLATE_TOKENS + estimate_tokens(context)
+                file_calls = [(self.router.choose(context), overhead,
+                               math.ceil(estimate_tokens(layout.header) * OUTPUT_RATIO))]
+                file_calls += [(self.router.choose(context + chunk), overhead + estimate_tokens(chunk),
+                                math.ceil(estimate_tokens(chunk) * OUTPUT_RATIO)) for chunk in chunks]
+                chunk_calls += file_calls
+                models = {model for model, _, _ in file_calls}
+                record.update(
+                    fast_path=False, calls=len(file_calls),
+                    prompt_tokens=sum(c[1] for c in file_calls),
+                    output_tokens=sum(c[2] for c in file_calls),
+                    model=self.router.pro_model if self.router.pro_model in models else self.router.fast_model,
+                )
+            else:
+                context = translator.reference_context(mapping, plan)
+                record.update(
+                    fast_path=False,
+                    prompt_tokens=TRANSLATE_TEMPLATE_TOKENS + estimate_tokens(context) + record["source_tokens"],
+                    output_tokens=math.ceil(record["source_tokens"] * OUTPUT_RATIO),
+                    model=self.router.choose(context + source),
+                )
+                llm_mappings.append(mapping)
+            per_file.append(record)
+
+        by_file = {r["file"]: r for r in per_file}
+        units = plan_units(llm_mappings, lambda m: by_file[m.source_file]["bytes"], self.batch_size)
+        calls = []
+        for unit in units:
+            records = [by_file[llm_mappings[i].source_file] for i in unit]
+            # A batch goes to pro if any member would
+            model = self.router.pro_model if any(r["model"] == self.router.pro_model for r in records) \
+                else self.router.fast_model
+            prompt = sum(r["prompt_tokens"] for r in records) - TRANSLATE_TEMPLATE_TOKENS * (len(records) - 1)
+            calls.append((model, prompt, sum(r["output_tokens"] for r in records)))
+        phases["translate"] = self._phase(calls + chunk_calls)
+
+        totals = {key: sum(p[key] for p in phases.values()) for key in ("calls", "prompt_tokens", "output_tokens")}
+        totals["cost_usd"] = round(sum(p["cost_usd"] for p in phases.values()), 4)
+        return {
+            "root": structure["root_name"],
+            "files": len(files),
+            "cs_files": len(cs_files),
+            "bytes": sum(v["bytes"] for v in by_extension.values()),
+            "by_extension": dict(sorted(by_extension.items(), key=lambda kv: -kv[1]["files"])),
+            "skipped": {kind: len(paths) for kind, paths in structure["skipped"].items()},
+            "fast_path_files": sum(1 for r in per_file if r["fast_path"]),
+            "phases": phases,
+            "total": totals,
+            "per_file": sorted(per_file, key=lambda r: -r["prompt_tokens"]),
+        }
+
+    def _phase(self, calls) -> Dict[str, Any]:
+        models = defaultdict(int)
+        for model, _, _ in calls:
+            models[model] += 1
+        return {
+            "calls": len(calls),
+            "prompt_tokens": sum(c[1] for c in calls),
+            "output_tokens": sum(c[2] for c in calls),
+            "cost_usd": round(sum(self._cost(*c) for c in calls), 4),
+            "calls_by_model": dict(models),
+        }
@@ -0,0 +1,165 @@
+import json
+import random
+import re
+import threading
+import time
+from pathlib import PurePath
+from types import SimpleNamespace
+from typing import Optional
+from .llm_client import LLMClient
+from .cache import ResponseCache
+from .resilience import AdaptiveRateLimiter, RetryPolicy
+from .routing import ModelRouter
+
+# Canned responses are recognised from the prompts the pipeline builds
+_CS_TYPE = re.compile(r'\b(?:class|interface|struct|enum|record)\s+([A-Za-z_]\w*)')
+_PACKAGE = re.compile(r'Package Name: (\S+)')
+_BATCH_FILE = re.compile(r'^\s*--- (\S+) \(package (\S+)\) ---$', re.M)
+_CS_METHOD = re.compile(r'^\s*public\s+[\w<>\[\]?, ]+?\s+([A-Z]\w*)\s*\(', re.M)
+
+
+class SimulatedLLMError(RuntimeError):
+    code = 503  # transient, retried by LLMClient
+
+
+class SimulatedQuotaError(RuntimeError):
+    code = 429
+
+
+class FakeLLMClient(LLMClient):
+    """
+    Offline stand-in for LLMClient with configurable latency, jitter and
+    failure rate, quota errors and slow outliers. Everything above the
+    transport (cache, routing, in-flight cap, retries, rate limiting, hedging,
+    telemetry) is the real LLMClient code; only the Vertex round trip is
+    replaced by canned, structurally valid answers.
+    """
+    def __init__(self, latency: float = 0.2, jitter: float = 0.1, failure_rate: float = 0.0,
+                 seed: Optional[int] = 0, max_in_flight: int = 8,
+                 cache: Optional[ResponseCache] = None, router: Optional[ModelRouter] = None,
+                 throttle_rate: float = 0.0, tail_rate: float = 0.0, tail_factor: float = 10.0,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None, retry: Optional[RetryPolicy] = None,
+                 timeout: Optional[float] = 180.0, hedge_percentile: Optional[float] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.throttle_rate = throttle_rate
+        # Share of calls that take tail_factor times longer, the stragglers hedging is for
+        self.tail_rate = tail_rate
+        self.tail_factor = tail_factor
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self.calls = 0
+        super().__init__(max_in_flight=max_in_flight, cache=cache, router=router, rate_limiter=rate_limiter,
+                         retry=retry, timeout=timeout, hedge_percentile=hedge_percentile)
+
+    def _init_backend(self, project_id, location):
+        # No Vertex AI, no credentials
+        pass
+
+    def _send(self, model_name: str, system_instruction: str, prompt: str):
+        with self._random_lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            if self._random.random() < self.tail_rate:
+                delay *= self.tail_factor
+            fail = self._random.random() < self.failure_rate
+            throttled = self._random.random() < self.throttle_rate
+        if throttled:
+            # Quota errors come back fast
+            time.sleep(min(delay, 0.01))
+            raise SimulatedQuotaError(f"Simulated 429 from {model_name}")
+        time.sleep(delay)
+        if fail:
+            raise SimulatedLLMError(f"Simulated failure from {model_name}")
+
+        text = self._respond(prompt)
+        usage = SimpleNamespace(prompt_token_count=len(prompt) // 4, candidates_token_count=len(text) // 4)
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+    def _respond(self, prompt: str) -> str:
+        if '"base_package"' in prompt:
+            return self._skeleton()
+        if '"file_mappings"' in prompt and "All File Paths:" in prompt:
+            return self._full_plan(prompt)
+        if '"file_mappings"' in prompt:
+            return self._shard(prompt)
+        if "Source C# Files:" in prompt:
+            return self._batch(prompt)
+        if "Class skeleton (C#, member bodies omitted):" in prompt:
+            return self._translation(prompt.replace("Class skeleton (C#, member bodies omitted):", "Source C# Code:"))
+        if "C# members to translate:" in prompt:
+            return self._members(prompt)
+        if "failed to compile" in prompt and "@@ REPLACE" in prompt:
+            return self._patch(prompt)
+        if "failed to compile" in prompt:
+            return self._fix(prompt)
+        return self._translation(prompt)
+
+    @staticmethod
+    def _mapping(source_file: str, base_package: str = "com.example.bench") -> dict:
+        source = PurePath(source_file)
+        parts = [re.sub(r"[^a-z0-9_]", "", p.lower()) for p in source.parent.parts]
+        package = ".".join([base_package] + [p for p in parts if p])
+        return {
+            "source_file": source_file,
+            "target_path": f"src/main/java/{package.replace('.', '/')}/{source.stem}.java",
+            "package_name": package,
+        }
+
+    def _skeleton(self) -> str:
+        return json.dumps({
+            "project_name": "BenchApp", "group_id": "com.example", "artifact_id": "bench-app",
+            "base_package": "com.example.bench",
+            "dependencies": [{"group_id": "org.springframework.boot", "artifact_id": "spring-boot-starter-data-jpa"}],
+            "application_properties": {"server.port": "8080"},
+        })
+
+    def _full_plan(self, prompt: str) -> str:
+        paths_json = prompt.split("All File Paths:", 1)[1].split("Goal:", 1)[0]
+        files = [f for f in json.loads(paths_json) if f.endswith(".cs")]
+        plan = json.loads(self._skeleton())
+        plan.pop("base_package")
+        plan["file_mappings"] = [self._mapping(f) for f in files]
+        return json.dumps(plan)
+
+    def _shard(self, prompt: str) -> str:
+        files_json = prompt.split("Files:", 1)[1].split("Rules:", 1)[0]
+        return json.dumps({"file_mappings": [self._mapping(f) for f in json.loads(files_json)]})
+
+    @staticmethod
+    def _java_class(package: str, source: str) -> str:
+        match = _CS_TYPE.search(source)
+        name = match.group(1) if match else "Migrated"
+        return f"package {package};\n\nimport lombok.Data;\n\n@Data\npublic class {name} {{\n}}\n"
+
+    def _translation(self, prompt: str) -> str:
+        package = _PACKAGE.search(prompt)
+        source = prompt.split("Source C# Code:", 1)[-1]
+        return self._java_class(package.group(1) if package else "com.example.bench", source)
+
+    def _members(self, prompt: str) -> str:
+        chunk = prompt.split("C# members to translate:", 1)[1]
+        methods = [f"public int {name[0].lower() + name[1:]}(int input) {{\n    return input;\n}}"
+                   for name in _CS_METHOD.findall(chunk)]
+        return "import java.util.List;\n\n" + "\n\n".join(methods) + "\n"
+
+    def _batch(self, prompt: str) -> str:
+        body = prompt.split("Source C# Files:", 1)[1]
+        headers = list(_BATCH_FILE.finditer(body))
+        blocks = []
+        for i, header in enumerate(headers):
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(body)
+            java = self._java_class(header.group(2), body[header.end():end])
+            blocks.append(f"=== FILE: {header.group(1)} ===\n{java}=== END FILE ===")
+        return "\n".join(blocks)
+
+    def _fix(self, prompt: str) -> str:
+        code = prompt.split("```java", 1)[-1].split("```", 1)[0]
+        return f"```java\n{code.strip()}\n```"
+
+    def _patch(self, prompt: str) -> str:
+        # A harmless one-line edit right after the package declaration
+        package_line = re.search(r"^\s*(\d+)\| package ", prompt, re.M)
+        after = package_line.group(1) if package_line else "0"
+        return f"@@ INSERT AFTER {after}\n// auto-heal: fixed\n@@ END\n"
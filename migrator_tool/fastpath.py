@@ -0,0 +1,307 @@
+import re
+from typing import Callable, List, Optional, Set, Tuple
+from .models import FileMapping, MigrationPlan
+
+# Translates only what it fully understands: a file with one plain class,
+# record or enum made of auto-properties. Anything else returns None and the
+# file goes to the LLM as before.
+
+_COMMENTS = re.compile(r'//[^\n]*|/\*.*?\*/', re.S)
+_USING = re.compile(r'^\s*(?:global\s+)?using\s+[\w.=\s]+;\s*$', re.M)
+_FILE_NAMESPACE = re.compile(r'^\s*namespace\s+[\w.]+\s*;', re.M)
+_BLOCK_NAMESPACE = re.compile(r'^\s*namespace\s+[\w.]+\s*\{(?P<body>.*)\}\s*$', re.S)
+_TYPE_HEADER = re.compile(
+    r'^\s*(?P<mods>(?:(?:public|internal|sealed)\s+)*)'
+    r'(?P<kind>record\s+class|record|class|enum)\s+(?P<name>[A-Za-z_]\w*)\s*'
+    r'(?P<params>\([^)]*\))?\s*(?P<open>[{;])',
+    re.S,
+)
+_TYPE = r'[A-Za-z_][\w.]*(?:<[\w\s,.<>?\[\]]+>)?(?:\[\])?\??'
+_AUTO_PROPERTY = re.compile(
+    rf'\s*public\s+(?:required\s+)?(?P<type>{_TYPE})\s+(?P<name>[A-Za-z_]\w*)\s*'
+    r'\{\s*get;\s*(?:(?:set|init);\s*)?\}\s*(?:=\s*(?P<init>[^;]+);)?'
+)
+_COMPUTED_PROPERTY = re.compile(
+    rf'\s*public\s+(?P<type>{_TYPE})\s+(?P<name>[A-Za-z_]\w*)\s*=>\s*(?P<expr>[^;{{}}]+);'
+)
+_ENUM_MEMBER = re.compile(r'^[A-Za-z_]\w*$')
+_NUMBER = re.compile(r'^-?\d+(?:\.\d+)?[LlDdFf]?$')
+_EXPRESSION_TOKEN = re.compile(r'\s*(?:(?P<num>\d+(?:\.\d+)?)|(?P<ident>[A-Za-z_]\w*)|(?P<op>[-+*/%()]))')
+
+# C# type -> (Java type, import)
+_SIMPLE_TYPES = {
+    "int": ("int", None), "long": ("long", None), "short": ("short", None), "byte": ("byte", None),
+    "double": ("double", None), "float": ("float", None), "bool": ("boolean", None), "char": ("char", None),
+    "string": ("String", None), "object": ("Object", None),
+    "decimal": ("BigDecimal", "java.math.BigDecimal"),
+    "DateTime": ("LocalDateTime", "java.time.LocalDateTime"),
+    "DateOnly": ("LocalDate", "java.time.LocalDate"),
+    "TimeOnly": ("LocalTime", "java.time.LocalTime"),
+    "DateTimeOffset": ("OffsetDateTime", "java.time.OffsetDateTime"),
+    "TimeSpan": ("Duration", "java.time.Duration"),
+    "Guid": ("UUID", "java.util.UUID"),
+}
+_BOXED = {"int": "Integer", "long": "Long", "short": "Short", "byte": "Byte", "double": "Double",
+          "float": "Float", "boolean": "Boolean", "char": "Character"}
+_COLLECTIONS = {
+    "List": ("List", "java.util.List", "ArrayList", "java.util.ArrayList"),
+    "IList": ("List", "java.util.List", "ArrayList", "java.util.ArrayList"),
+    "ICollection": ("List", "java.util.List", "ArrayList", "java.util.ArrayList"),
+    "IEnumerable": ("List", "java.util.List", "ArrayList", "java.util.ArrayList"),
+    "IReadOnlyList": ("List", "java.util.List", "ArrayList", "java.util.ArrayList"),
+    "IReadOnlyCollection": ("List", "java.util.List", "ArrayList", "java.util.ArrayList"),
+    "HashSet": ("Set", "java.util.Set", "HashSet", "java.util.HashSet"),
+    "ISet": ("Set", "java.util.Set", "HashSet", "java.util.HashSet"),
+    "Dictionary": ("Map", "java.util.Map", "HashMap", "java.util.HashMap"),
+    "IDictionary": ("Map", "java.util.Map", "HashMap", "java.util.HashMap"),
+    "IReadOnlyDictionary": ("Map", "java.util.Map", "HashMap", "java.util.HashMap"),
+}
+# Reserved words and literals that can't name a Java field, record component or package segment
+JAVA_KEYWORDS = frozenset("""
+    abstract assert boolean break byte case catch char class const continue default do double else enum
+    extends final finally float for goto if implements import instanceof int interface long native new
+    package private protected public return short static strictfp super switch synchronized this throw
+    throws transient try void volatile while true false null _
+""".split())
+
+_CASTS = {"int", "long", "double", "float", "short"}
+_NUMERIC = {"int", "long", "short", "byte", "double", "float", "Integer", "Long", "Short", "Byte", "Double", "Float"}
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _camel(name: str) -> str:
+    camel = name[:1].lower() + name[1:]
+    if camel in JAVA_KEYWORDS:
+        # `Default` -> `default` doesn't compile; renaming would change the JSON/bean names
+        raise _Unsupported()
+    return camel
+
+
+def _split_generic_args(args: str) -> List[str]:
+    parts, depth, current = [], 0, []
+    for ch in args:
+        if ch == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        depth += ch == "<"
+        depth -= ch == ">"
+        current.append(ch)
+    parts.append("".join(current).strip())
+    return parts
+
+
+class RuleBasedTranslator:
+    """
+    Deterministic C# -> Java for trivial types (POCOs, DTOs, records, plain
+    enums). `resolve_type` maps a project type name to its fully-qualified
+    Java name, or None if unknown, in which case the file is not handled.
+    """
+    def __init__(self, resolve_type: Optional[Callable[[str], Optional[str]]] = None):
+        self.resolve_type = resolve_type or (lambda name: None)
+
+    def try_translate(self, source_code: str, file_mapping: FileMapping, plan: MigrationPlan) -> Optional[str]:
+        try:
+            return self._translate(source_code, file_mapping, plan)
+        except _Unsupported:
+            return None
+
+    def _translate(self, source_code: str, file_mapping: FileMapping, plan: MigrationPlan) -> str:
+        text = _COMMENTS.sub("", source_code)
+        text = _USING.sub("", text)
+        text = _FILE_NAMESPACE.sub("", text, count=1)
+        block = _BLOCK_NAMESPACE.match(text)
+        if block:
+            text = block.group("body")
+        if "[" in text.split("{", 1)[0] or "#" in text:
+            # Attributes on the type or preprocessor directives carry semantics we don't map
+            raise _Unsupported()
+
+        header = _TYPE_HEADER.match(text)
+        if not header:
+            raise _Unsupported()
+        kind = " ".join(header.group("kind").split())
+        name = header.group("name")
+        params = header.group("params")
+        if name in JAVA_KEYWORDS:
+            raise _Unsupported()
+
+        if header.group("open") == ";":
+            if kind == "enum" or not params or text[header.end():].strip():
+                raise _Unsupported()
+            body = ""
+        else:
+            body, rest = self._body(text, header.end())
+            if rest.strip():
+                # More than one top-level type
+                raise _Unsupported()
+
+        imports: Set[str] = set()
+        if kind == "enum":
+            if params:
+                raise _Unsupported()
+            return self._emit_enum(file_mapping.package_name, name, body)
+        if params is not None:
+            if body.strip():
+                raise _Unsupported()
+            if int(re.match(r"\d+", plan.java_version).group()) < 16:
+                raise _Unsupported()
+            return self._emit_record(file_mapping.package_name, name, params, imports)
+        return self._emit_data_class(file_mapping.package_name, name, body, imports)
+
+    def _body(self, text: str, start: int) -> Tuple[str, str]:
+        depth = 1
+        for i in range(start, len(text)):
+            if text[i] == "{":
+                depth += 1
+            elif text[i] == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[start:i], text[i + 1:]
+        raise _Unsupported()
+
+    def map_type(self, cs_type: str, imports: Set[str]) -> str:
+        cs_type = cs_type.strip()
+        nullable = cs_type.endswith("?")
+        cs_type = cs_type.rstrip("?").strip()
+
+        if cs_type.endswith("[]"):
+            return self.map_type(cs_type[:-2], imports) + "[]"
+
+        generic = re.match(r"^(\w+)\s*<(.+)>$", cs_type)
+        if generic:
+            collection = _COLLECTIONS.get(generic.group(1))
+            if not collection:
+                raise _Unsupported()
+            args = [self._boxed(self.map_type(a, imports)) for a in _split_generic_args(generic.group(2))]
+            if (collection[0] == "Map") != (len(args) == 2):
+                raise _Unsupported()
+            imports.add(collection[1])
+            return f"{collection[0]}<{', '.join(args)}>"
+
+        if cs_type in _SIMPLE_TYPES:
+            java_type, import_name = _SIMPLE_TYPES[cs_type]
+            if import_name:
+                imports.add(import_name)
+            return _BOXED.get(java_type, java_type) if nullable else java_type
+
+        if not re.match(r"^[A-Za-z_]\w*$", cs_type):
+            raise _Unsupported()
+        qualified = self.resolve_type(cs_type)
+        if not qualified:
+            raise _Unsupported()
+        if "." in qualified:
+            imports.add(qualified)
+        return cs_type
+
+    @staticmethod
+    def _boxed(java_type: str) -> str:
+        return _BOXED.get(java_type, java_type)
+
+    def _initializer(self, cs_init: str, java_type: str, imports: Set[str]) -> str:
+        cs_init = cs_init.strip()
+        if cs_init in ("string.Empty", "String.Empty"):
+            return '""'
+        if re.match(r'^"(?:[^"\\]|\\.)*"$', cs_init) or cs_init in ("true", "false", "null"):
+            return cs_init
+        if _NUMBER.match(cs_init) and java_type in _NUMERIC:
+            return cs_init
+        if re.match(r"^new\s*(?:[\w<>,\s]+)?\(\s*\)$", cs_init):
+            for collection in _COLLECTIONS.values():
+                if java_type.startswith(collection[0] + "<"):
+                    imports.add(collection[3])
+                    return f"new {collection[2]}<>()"
+        raise _Unsupported()
+
+    def _expression(self, expr: str, fields: dict) -> str:
+        """
+        Arithmetic over numbers, casts and sibling numeric properties only,
+        e.g. `32 + (int)(TemperatureC / 0.5556)`.
+        """
+        out, pos = [], 0
+        expr = expr.strip()
+        while pos < len(expr):
+            token = _EXPRESSION_TOKEN.match(expr, pos)
+            if not token or token.end() == pos:
+                raise _Unsupported()
+            pos = token.end()
+            if token.group("num"):
+                out.append(token.group("num"))
+            elif token.group("ident"):
+                ident = token.group("ident")
+                if ident in fields:
+                    out.append(fields[ident])
+                elif ident in _CASTS and out and out[-1] == "(" and expr[pos:].lstrip().startswith(")"):
+                    out.append(ident)
+                else:
+                    raise _Unsupported()
+            else:
+                out.append(token.group("op"))
+        return " ".join(out).replace("( ", "(").replace(" )", ")")
+
+    def _emit_data_class(self, package: str, name: str, body: str, imports: Set[str]) -> str:
+        fields, computed, field_names = [], [], {}
+        pos = 0
+        pending_computed = []
+        while body[pos:].strip():
+            prop = _AUTO_PROPERTY.match(body, pos)
+            if prop:
+                java_type = self.map_type(prop.group("type"), imports)
+                field = _camel(prop.group("name"))
+                if java_type in _NUMERIC:
+                    # Only numeric fields may appear in computed getters
+                    field_names[prop.group("name")] = field
+                init = prop.group("init")
+                suffix = f" = {self._initializer(init, java_type, imports)}" if init else ""
+                fields.append(f"    private {java_type} {field}{suffix};")
+                pos = prop.end()
+                continue
+            getter = _COMPUTED_PROPERTY.match(body, pos)
+            if getter:
+                pending_computed.append(getter)
+                pos = getter.end()
+                continue
+            raise _Unsupported()
+
+        for getter in pending_computed:
+            java_type = self.map_type(getter.group("type"), imports)
+            expression = self._expression(getter.group("expr"), field_names)
+            computed.append(
+                f"    public {java_type} get{getter.group('name')}() {{\n"
+                f"        return {expression};\n"
+                f"    }}"
+            )
+
+        imports.add("lombok.Data")
+        members = "\n".join(fields)
+        if computed:
+            members += "\n\n" + "\n\n".join(computed)
+        return f"{self._preamble(package, imports)}@Data\npublic class {name} {{\n{members}\n}}\n"
+
+    def _emit_record(self, package: str, name: str, params: str, imports: Set[str]) -> str:
+        components = []
+        for param in _split_generic_args(params.strip()[1:-1]):
+            if not param:
+                continue
+            parts = param.rsplit(None, 1)
+            if len(parts) != 2 or "=" in param or "[" in param:
+                raise _Unsupported()
+            components.append(f"{self.map_type(parts[0], imports)} {_camel(parts[1])}")
+        return f"{self._preamble(package, imports)}public record {name}({', '.join(components)}) {{\n}}\n"
+
+    def _emit_enum(self, package: str, name: str, body: str) -> str:
+        members = [m.strip() for m in body.split(",") if m.strip()]
+        if not members or not all(_ENUM_MEMBER.match(m) and m not in JAVA_KEYWORDS for m in members):
+            # Explicit values or flags need real mapping logic
+            raise _Unsupported()
+        return f"package {package};\n\npublic enum {name} {{\n    {', '.join(members)}\n}}\n"
+
+    @staticmethod
+    def _preamble(package: str, imports: Set[str]) -> str:
+        # Same-package imports are redundant
+        needed = sorted(i for i in imports if i.rsplit(".", 1)[0] != package)
+        import_block = "".join(f"import {i};\n" for i in needed)
+        return f"package {package};\n\n{import_block}\n" if import_block else f"package {package};\n\n"
@@ -1,80 +1,282 @@
+import heapq
+import itertools
+import os
 import subprocess
 import re
+import shutil
+import threading
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Callable, List, Dict, Tuple, Set, Optional
+from concurrent.futures import ThreadPoolExecutor
+from .buildlog import BuildErrorStream
 from .llm_client import LLMClient
+from .output import OutputWriter
+from .patching import PatchError, apply_patch_response, error_lines, numbered_excerpt, validate_patch
+from .telemetry import profiler
 from rich.console import Console
 
 console = Console()
 
+CLASSPATH_FILE = "target/.fixer-classpath"
+SYSTEM_INSTRUCTION = "You are an expert Java debugger. You fix compilation errors accurately."
+# Build output kept in memory; errors are parsed from the stream, not from this
+MAX_LOG_LINES = 2000
+
 class FixerAgent:
-    def __init__(self, project_dir: str, llm_client: LLMClient):
+    def __init__(self, project_dir: str, llm_client: LLMClient, fast: bool = True, workers: int = 8,
+                 max_build_errors: Optional[int] = None, patch: bool = True):
         self.project_dir = Path(project_dir).resolve()
         self.llm = llm_client
+        self.output = OutputWriter(self.project_dir)
+        self.workers = max(1, workers)
+        # Fast mode checks fixes with incremental, offline, test-less compiles
+        # and only runs the full 'mvn clean install' once as final verification.
+        self.fast = fast
+        # Stop a build once this many distinct errors are known; fixes start anyway
+        self.max_build_errors = max_build_errors
+        # Ask for line edits instead of the whole file back
+        self.patch = patch
+        self.touched: Set[str] = set()
+        self._deps_resolved = False
+        self._classpath: Optional[str] = None
+        # javac flags matching what the Maven build uses (release, -parameters, processors)
+        self._javac_options: List[str] = []
 
-    def run_build(self) -> Tuple[bool, str]:
+    def _run(self, cmd: List[str], on_line: Optional[Callable[[str], bool]] = None) -> Tuple[bool, str]:
         """
-        Runs 'mvn clean install' and returns (success, output).
+        Runs cmd streaming its merged stdout/stderr line by line through on_line;
+        if on_line returns True the process is stopped early. Only the last
+        MAX_LOG_LINES lines are kept for the returned output.
         """
-        console.print("[yellow]Running Build...[/yellow]")
         try:
-            # Using -DskipTests to focus on compilation errors first if needed, 
-            # but let's run full install for now.
-            result = subprocess.run(
-                ["mvn", "clean", "install", "-e"], 
-                cwd=self.project_dir, 
-                capture_output=True, 
-                text=True
+            process = subprocess.Popen(
+                cmd,
+                cwd=self.project_dir,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+                bufsize=1,
             )
-            output = result.stdout + "\n" + result.stderr
-            return (result.returncode == 0, output)
         except Exception as e:
             return (False, str(e))
 
+        tail = deque(maxlen=MAX_LOG_LINES)
+        stopped = False
+        with process:
+            for line in process.stdout:
+                line = line.rstrip("\n")
+                tail.append(line)
+                if on_line is not None and on_line(line):
+                    console.print("[yellow]Error threshold reached, stopping the build early.[/yellow]")
+                    stopped = True
+                    process.terminate()
+                    break
+        return (process.returncode == 0 and not stopped, "\n".join(tail))
+
+    @profiler.timed("fixer.run_build")
+    def run_build(self, on_line: Optional[Callable[[str], bool]] = None) -> Tuple[bool, str]:
+        """
+        Runs 'mvn clean install' and returns (success, output).
+        """
+        console.print("[yellow]Running Build...[/yellow]")
+        return self._run(["mvn", "clean", "install", "-e"], on_line)
+
+    @profiler.timed("fixer.run_fast_check")
+    def run_fast_check(self, on_line: Optional[Callable[[str], bool]] = None) -> Tuple[bool, str]:
+        """
+        Compile-only check used between fix attempts. Recompiles just the files
+        touched since the last check with javac when possible, otherwise runs an
+        incremental, test-less Maven compile (offline once dependencies are resolved).
+        """
+        touched, self.touched = self.touched, set()
+        if touched and self._classpath is not None:
+            console.print(f"[yellow]Recompiling {len(touched)} fixed file(s)...[/yellow]")
+            return self._javac(sorted(touched), on_line)
+
+        console.print("[yellow]Running incremental compile...[/yellow]")
+        cmd = ["mvn", "compile", "-e", "-q", "-Dmaven.test.skip=true"]
+        if self._deps_resolved:
+            cmd.insert(1, "-o")
+        success, output = self._run(cmd, on_line)
+        # Even a failed compile has resolved dependencies unless Maven itself broke
+        if success or self.parse_errors(output):
+            self._deps_resolved = True
+            if self._classpath is None:
+                self._classpath = self._resolve_classpath()
+        return (success, output)
+
+    def _java_release(self) -> Optional[int]:
+        # Module poms of a migrated solution inherit java.version from the parent pom
+        for pom in (self.project_dir / "pom.xml", self.project_dir.parent / "pom.xml"):
+            try:
+                text = pom.read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                continue
+            match = re.search(r"<(?:java\.version|maven\.compiler\.release)>\s*(\d+)", text)
+            if match:
+                return int(match.group(1))
+        return None
+
+    def _javac_major(self) -> Optional[int]:
+        success, output = self._run(["javac", "-version"])
+        match = re.search(r"javac (\d+)(?:\.(\d+))?", output)
+        if not success or not match:
+            return None
+        major = int(match.group(1))
+        return int(match.group(2) or 0) if major == 1 else major
+
+    def _javac_flags(self) -> Optional[List[str]]:
+        """
+        The options Maven's compiler plugin would use under the Spring Boot
+        parent, or None when this javac can't match them (then checks stay on Maven).
+        """
+        major = self._javac_major()
+        release = self._java_release()
+        if major is None or (release is not None and release > major):
+            return None
+        flags = ["-encoding", "UTF-8", "-parameters"]
+        if release is not None and major >= 9:
+            flags += ["--release", str(release)]
+        if major >= 21:
+            # Processors found on the classpath (Lombok) are no longer run implicitly
+            flags.append("-proc:full")
+        return flags
+
+    def _resolve_classpath(self) -> Optional[str]:
+        if shutil.which("javac") is None:
+            return None
+        flags = self._javac_flags()
+        if flags is None:
+            return None
+        self._javac_options = flags
+        success, _ = self._run([
+            "mvn", "-o", "-q", "dependency:build-classpath", f"-Dmdep.outputFile={CLASSPATH_FILE}"
+        ])
+        cp_file = self.project_dir / CLASSPATH_FILE
+        if not success or not cp_file.exists():
+            return None
+        return cp_file.read_text().strip()
+
+    def _javac(self, files: List[str], on_line: Optional[Callable[[str], bool]] = None) -> Tuple[bool, str]:
+        classes_dir = self.project_dir / "target" / "classes"
+        classes_dir.mkdir(parents=True, exist_ok=True)
+        classpath = str(classes_dir)
+        if self._classpath:
+            classpath += os.pathsep + self._classpath
+        return self._run([
+            "javac", *self._javac_options, "-d", str(classes_dir), "-cp", classpath,
+            "-sourcepath", "src/main/java", "-Xmaxerrs", "10000",
+            *files
+        ], on_line)
+
     def parse_errors(self, build_output: str) -> Dict[str, List[str]]:
         """
         Parses Maven output and returns a dict: {file_path: [error_messages]}.
+        Repeated messages within a file are collapsed into one entry listing
+        every line they occur on.
         """
-        errors = {}
-        # Regex to capture standard javac errors:
-        # [ERROR] /path/to/File.java:[line,col] error message
-        # We need to adapt it to the actual absolute paths in the log
-        
-        # Example: [ERROR] /Users/rounakdas/.../WeatherForecastController.java:[18,50] <identifier> expected
-        pattern = re.compile(r"\[ERROR\] (.*?):\[(\d+),(\d+)\] (.*)")
-        
+        stream = BuildErrorStream(self.project_dir)
         for line in build_output.splitlines():
-            match = pattern.search(line)
-            if match:
-                file_path = match.group(1)
-                line_no = match.group(2)
-                col_no = match.group(3)
-                msg = match.group(4)
-                
-                # Make relative path for cleaner context if possible
-                try:
-                    rel_path = str(Path(file_path).relative_to(self.project_dir))
-                except ValueError:
-                    rel_path = file_path # Absolute if not in project dir
-
-                if rel_path not in errors:
-                    errors[rel_path] = []
-                errors[rel_path].append(f"Line {line_no}: {msg}")
-                
-        return errors
-
-    def fix_file(self, file_path: str, error_msgs: List[str]):
+            stream.feed(line)
+        return stream.errors()
+
+    def dependents_counter(self) -> Callable[[str], int]:
+        """
+        Reads the project sources once and returns dependents(file_path): how
+        many other sources reference that file's class.
+        """
+        sources = list((self.project_dir / "src").rglob("*.java"))
+        texts = []
+        for source in sources:
+            try:
+                texts.append(source.read_text(encoding="utf-8", errors="replace"))
+            except OSError:
+                continue
+
+        def dependents(file_path: str) -> int:
+            name = re.compile(rf"\b{re.escape(Path(file_path).stem)}\b")
+            return sum(1 for text in texts if name.search(text)) - 1
+        return dependents
+
+    def prioritize(self, errors: Dict[str, List[str]], dependents: Optional[Callable[[str], int]] = None) -> List[str]:
+        """
+        Orders broken files by how many project sources reference their class,
+        so fixes that unblock the most dependents go first.
+        """
+        dependents = dependents or self.dependents_counter()
+        return sorted(errors, key=lambda path: (-dependents(path), path))
+
+    @profiler.timed("fixer.fix_file")
+    def fix_file(self, file_path: str, error_msgs: List[str], patch: Optional[bool] = None):
         """
         Uses LLM to fix a single file based on error messages.
+        In patch mode the model returns edits scoped to the error lines; the
+        full-file rewrite is only the fallback when they don't apply.
+        `patch` overrides the agent's mode for this call.
         """
         full_path = self.project_dir / file_path
         if not full_path.exists():
             console.print(f"[red]File not found: {full_path}[/red]")
             return
 
-        with open(full_path, "r") as f:
+        with open(full_path, "r", encoding="utf-8", errors="replace") as f:
             code = f.read()
 
+        console.print(f"[cyan]Fixing {file_path}...[/cyan]")
+        use_patch = self.patch if patch is None else patch
+        fixed_code = self._fix_with_patch(file_path, code, error_msgs) if use_patch else None
+        if fixed_code is None:
+            fixed_code = self._fix_with_rewrite(file_path, code, error_msgs)
+
+        if not self.output.write(file_path, fixed_code):
+            console.print(f"[yellow]No changes proposed for {file_path}[/yellow]")
+        # Still recompiled next check so its errors stay visible
+        self.touched.add(file_path)
+
+    def _fix_with_patch(self, file_path: str, code: str, error_msgs: List[str]) -> Optional[str]:
+        prompt = f"""
+        The following Java code failed to compile.
+        
+        File: {file_path}
+        
+        Errors:
+        {chr(10).join(error_msgs)}
+        
+        Code (with line numbers; "..." marks omitted lines):
+        {numbered_excerpt(code, error_lines(error_msgs))}
+        
+        Task:
+        Fix the compilation errors with the smallest possible edits. Retain the logic.
+        Do NOT output the whole file. Output ONLY edits in this format, line numbers as shown above:
+        @@ REPLACE <first>-<last>
+        <replacement lines, without line numbers>
+        @@ END
+        @@ INSERT AFTER <line>
+        <new lines, e.g. a missing import>
+        @@ END
+        @@ DELETE <first>-<last>
+        @@ END
+        """
+        # Never cached: an attempt that repeats an earlier prompt needs a fresh answer
+        response = self.llm.generate(prompt, SYSTEM_INSTRUCTION, use_cache=False)
+        try:
+            patched = apply_patch_response(code, response)
+        except PatchError as e:
+            console.print(f"[yellow]Patch for {file_path} did not apply ({e}), rewriting the file instead.[/yellow]")
+            profiler.count("fixer.patch_fallback")
+            return None
+
+        problem = validate_patch(code, patched, Path(file_path).stem)
+        if problem:
+            console.print(f"[yellow]Patch for {file_path} rejected ({problem}), rewriting the file instead.[/yellow]")
+            profiler.count("fixer.patch_fallback")
+            return None
+        profiler.count("fixer.patch_applied")
+        return patched
+
+    def _fix_with_rewrite(self, file_path: str, code: str, error_msgs: List[str]) -> str:
         prompt = f"""
         The following Java code failed to compile.
         
@@ -92,46 +294,97 @@ class FixerAgent:
         Fix the compilation errors. Retain the logic. 
         Output ONLY the fixed Java code (complete file).
         """
-        
-        system_instruction = "You are an expert Java debugger. You fix compilation errors accurately."
-        
-        console.print(f"[cyan]Fixing {file_path}...[/cyan]")
-        fixed_code = self.llm.generate(prompt, system_instruction)
+        fixed_code = self.llm.generate(prompt, SYSTEM_INSTRUCTION, use_cache=False)
         
         # Strip markdown
         if "```java" in fixed_code:
             fixed_code = fixed_code.split("```java")[1].split("```")[0].strip()
         elif "```" in fixed_code:
              fixed_code = fixed_code.split("```")[1].split("```")[0].strip()
-             
-        # Backup? Maybe later.
-        with open(full_path, "w") as f:
-            f.write(fixed_code)
+        return fixed_code
 
+    @profiler.timed("fixer.auto_heal")
     def auto_heal(self, max_retries: int = 3):
         """
         Main loop: Build -> Detect -> Fix -> Repeat.
+        Build output is parsed while it streams; a file is queued for fixing
+        as soon as the compiler has moved past it, so fixes overlap the build.
+        Whenever a fixer frees up it takes the queued file with the most
+        dependents, not the one the compiler happened to list first.
         """
         for attempt in range(1, max_retries + 1):
             console.print(f"\n[bold blue]--- Auto-Heal Attempt {attempt}/{max_retries} ---[/bold blue]")
-            
-            success, output = self.run_build()
-            
-            if success:
-                console.print("[bold green]Build Succeeded![/bold green]")
-                return True
-            
-            console.print("[red]Build Failed. Analyzing errors...[/red]")
-            errors = self.parse_errors(output)
-            
-            if not errors:
-                console.print("[red]Build failed but no parseable compiler errors found. Check logs.[/red]")
-                # Could be a pom error, missing dependency, etc.
-                # In a robust system, we would feed the whole log to LLM.
-                return False
-                
-            for file_path, msgs in errors.items():
-                self.fix_file(file_path, msgs)
-        
+            dependents = self.dependents_counter()
+
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="fix") as pool:
+                queue, streamed, fixed = [], set(), set()
+                order = itertools.count()
+                queue_lock = threading.Lock()
+                # Late errors of a file whose first fix hasn't finished yet run right after it
+                follow_ups: Dict[str, List[str]] = {}
+
+                def fix_next():
+                    with queue_lock:
+                        _, _, path, error_msgs, patch = heapq.heappop(queue)
+                    while error_msgs:
+                        try:
+                            self.fix_file(path, error_msgs, patch=patch)
+                        except Exception as e:
+                            console.print(f"[red]Failed to fix {path}: {e}[/red]")
+                        with queue_lock:
+                            fixed.add(path)
+                            error_msgs, patch = follow_ups.pop(path, None), False
+
+                def queue_fix(path: str, error_msgs: List[str], patch: Optional[bool] = None):
+                    with queue_lock:
+                        heapq.heappush(queue, (-dependents(path), next(order), path, error_msgs, patch))
+                    pool.submit(fix_next)
+
+                def queue_follow_up(path: str, error_msgs: List[str]):
+                    # Their line numbers predate the file's first fix, so no line patches for them
+                    with queue_lock:
+                        if path not in fixed:
+                            follow_ups[path] = error_msgs
+                            return
+                    queue_fix(path, error_msgs, patch=False)
+
+                def start_fix(path: str, error_msgs: List[str]):
+                    console.print(f"[cyan]{path}: {len(error_msgs)} error(s), fixing while the build runs[/cyan]")
+                    streamed.add(path)
+                    queue_fix(path, error_msgs)
+
+                stream = BuildErrorStream(self.project_dir, on_file_complete=start_fix,
+                                          max_errors=self.max_build_errors)
+                success, output = self.run_fast_check(stream.feed) if self.fast else self.run_build(stream.feed)
+                if success and self.fast:
+                    # Compiles cleanly: confirm once with the full build (clean + tests)
+                    console.print("[green]Compile check passed. Running full verification build...[/green]")
+                    success, output = self.run_build(stream.feed)
+
+                if success:
+                    console.print("[bold green]Build Succeeded![/bold green]")
+                    return True
+
+                console.print("[red]Build Failed. Analyzing errors...[/red]")
+                remaining = stream.finish()
+                profiler.count("fixer.streamed_fixes", len(streamed))
+
+                if not remaining and not streamed:
+                    console.print("[red]Build failed but no parseable compiler errors found. Check logs.[/red]")
+                    # Could be a pom error, missing dependency, etc.
+                    # In a robust system, we would feed the whole log to LLM.
+                    return False
+
+                late = [path for path in remaining if path in streamed]
+                console.print(f"[cyan]{len(streamed)} file(s) queued during the build, "
+                              f"{len(remaining) - len(late)} more, {len(late)} with errors reported late; "
+                              f"up to {self.workers} at a time.[/cyan]")
+                for path in self.prioritize(remaining, dependents):
+                    if path in streamed:
+                        queue_follow_up(path, remaining[path])
+                    else:
+                        queue_fix(path, remaining[path])
+            # Leaving the pool waits for every queued fix
+
         console.print("[bold red]Max retries reached. Auto-heal failed.[/bold red]")
         return False
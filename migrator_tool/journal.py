@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+from .models import FileMapping, JournalHeader, JournalRecord, MigrationPlan
+
+JOURNAL_DIR = ".migration_journal"
+PLAN_FILE = "plan.json"
+RECORDS_FILE = "files.jsonl"
+
+
+class MigrationJournal:
+    """
+    Checkpoint of an in-progress `migrate` run in the output directory: the
+    validated plan plus one line per finished file. The plan is replaced
+    atomically; records are appended one fsync'd line at a time and a torn
+    last line (crash mid-append) is ignored on load.
+    """
+    def __init__(self, output_dir: str):
+        self.dir = Path(output_dir).resolve() / JOURNAL_DIR
+        self.plan_path = self.dir / PLAN_FILE
+        self.records_path = self.dir / RECORDS_FILE
+        self._lock = threading.Lock()
+        self._records_file = None
+
+    def exists(self) -> bool:
+        return self.plan_path.exists()
+
+    def start(self, input_dir: str, plan: MigrationPlan):
+        """Begins a fresh journal, dropping whatever an earlier run left behind."""
+        self.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        header = JournalHeader(input_dir=str(Path(input_dir).resolve()), plan=plan)
+        fd, tmp_path = tempfile.mkstemp(dir=self.dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(header.model_dump_json(indent=2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.plan_path)
+
+    def load_plan(self, input_dir: str) -> Optional[MigrationPlan]:
+        """The journaled plan, or None if missing, corrupt or for another project."""
+        if not self.exists():
+            return None
+        try:
+            header = JournalHeader.model_validate_json(self.plan_path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+        if header.input_dir != str(Path(input_dir).resolve()):
+            return None
+        return header.plan
+
+    def completed(self) -> Dict[str, JournalRecord]:
+        """Finished files keyed by source_file; later records win."""
+        records = {}
+        if not self.records_path.exists():
+            return records
+        with open(self.records_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = JournalRecord.model_validate_json(line)
+                except Exception:
+                    # Torn write from a crash; everything before it is intact
+                    continue
+                records[record.source_file] = record
+        return records
+
+    def is_done(self, completed: Dict[str, JournalRecord], mapping: FileMapping, source_hash: str) -> bool:
+        record = completed.get(mapping.source_file)
+        if record is None:
+            return False
+        if record.source_hash != source_hash or record.target_path != mapping.target_path:
+            return False
+        return (self.dir.parent / mapping.target_path).exists()
+
+    def append(self, record: JournalRecord):
+        line = record.model_dump_json() + "\n"
+        with self._lock:
+            if self._records_file is None:
+                self._records_file = open(self.records_path, "a", encoding="utf-8")
+            self._records_file.write(line)
+            self._records_file.flush()
+            os.fsync(self._records_file.fileno())
+
+    def close(self):
+        with self._lock:
+            if self._records_file is not None:
+                self._records_file.close()
+                self._records_file = None
+
+    def finish(self):
+        """The run completed; the manifest takes over from here."""
+        self.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
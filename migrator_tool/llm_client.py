@@ -1,42 +1,250 @@
-import vertexai
-from vertexai.generative_models import GenerativeModel, SafetySetting
 import os
-from typing import Optional
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Optional
+from .cache import ResponseCache
+from .resilience import AdaptiveRateLimiter, LatencyTracker, LLMTimeoutError, RetryPolicy, classify_error
+from .routing import ModelRouter
+from .telemetry import profiler
+
+def _build_safety_settings():
+    from vertexai.generative_models import SafetySetting
+
+    # Aggressive safety settings to prevent blocking code generation
+    return [
+        SafetySetting(
+            category=SafetySetting.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
+            threshold=SafetySetting.HarmBlockThreshold.BLOCK_ONLY_HIGH
+        ),
+        SafetySetting(
+            category=SafetySetting.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
+            threshold=SafetySetting.HarmBlockThreshold.BLOCK_ONLY_HIGH
+        ),
+        SafetySetting(
+            category=SafetySetting.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
+            threshold=SafetySetting.HarmBlockThreshold.BLOCK_ONLY_HIGH
+        ),
+        SafetySetting(
+            category=SafetySetting.HarmCategory.HARM_CATEGORY_HARASSMENT,
+            threshold=SafetySetting.HarmBlockThreshold.BLOCK_ONLY_HIGH
+        ),
+    ]
 
 class LLMClient:
-    def __init__(self, project_id: Optional[str] = None, location: str = "us-central1"):
-        # Initialize Vertex AI. If project_id is None, it infers from environment/ADC.
-        vertexai.init(project=project_id, location=location)
-        
-    def generate(self, prompt: str, system_instruction: str = "", model_name: str = "gemini-2.5-pro") -> str:
-        model = GenerativeModel(
-            model_name=model_name,
-            system_instruction=[system_instruction] if system_instruction else None
-        )
-        
-        # Aggressive safety settings to prevent blocking code generation
-        safety_settings = [
-            SafetySetting(
-                category=SafetySetting.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-                threshold=SafetySetting.HarmBlockThreshold.BLOCK_ONLY_HIGH
-            ),
-            SafetySetting(
-                category=SafetySetting.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-                threshold=SafetySetting.HarmBlockThreshold.BLOCK_ONLY_HIGH
-            ),
-            SafetySetting(
-                category=SafetySetting.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-                threshold=SafetySetting.HarmBlockThreshold.BLOCK_ONLY_HIGH
-            ),
-            SafetySetting(
-                category=SafetySetting.HarmCategory.HARM_CATEGORY_HARASSMENT,
-                threshold=SafetySetting.HarmBlockThreshold.BLOCK_ONLY_HIGH
-            ),
-        ]
-
-        response = model.generate_content(
+    def __init__(self, project_id: Optional[str] = None, location: str = "us-central1", max_in_flight: int = 8,
+                 cache: Optional[ResponseCache] = None, router: Optional[ModelRouter] = None,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None, retry: Optional[RetryPolicy] = None,
+                 timeout: Optional[float] = 180.0, hedge_percentile: Optional[float] = None):
+        # Caps concurrent requests across every thread sharing this client
+        max_in_flight = max(1, max_in_flight)
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        # Requests abandoned at their deadline give their slot back but keep a thread until they
+        # end; up to max_in_flight of them get spare threads so retries never queue behind them
+        self._max_abandoned = max_in_flight
+        self._abandoned = 0
+        self._abandoned_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_in_flight + self._max_abandoned, thread_name_prefix="llm")
+        # None sends as fast as the in-flight cap allows
+        self.rate_limiter = rate_limiter
+        self.retry = retry or RetryPolicy()
+        # Per-call deadline in seconds; a call past it is abandoned and retried
+        self.timeout = timeout
+        # Duplicate a call still running past this latency percentile of its model (None: never)
+        self.hedge_percentile = hedge_percentile
+        self.latencies = LatencyTracker()
+        # Optional response cache; None disables caching entirely
+        self.cache = cache
+        self.router = router or ModelRouter()
+        # Model handles are reused per (model, system instruction)
+        self._models = {}
+        self._models_lock = threading.Lock()
+        self._init_backend(project_id, location)
+
+    def _init_backend(self, project_id: Optional[str], location: str):
+        # Vertex AI is imported and initialised on the first real call, so
+        # commands that never reach a model (--help, scan, fully cached runs)
+        # start instantly and work without credentials.
+        self._project_id = project_id
+        self._location = location
+        self._backend_ready = False
+        self._backend_lock = threading.Lock()
+
+    def _ensure_backend(self):
+        with self._backend_lock:
+            if self._backend_ready:
+                return
+            import vertexai
+
+            # If project_id is None, it infers from environment/ADC.
+            vertexai.init(project=self._project_id, location=self._location)
+            self._safety_settings = _build_safety_settings()
+            self._backend_ready = True
+
+    def _get_model(self, model_name: str, system_instruction: str):
+        from vertexai.generative_models import GenerativeModel
+
+        key = (model_name, system_instruction)
+        with self._models_lock:
+            model = self._models.get(key)
+            if model is None:
+                model = GenerativeModel(
+                    model_name=model_name,
+                    system_instruction=[system_instruction] if system_instruction else None
+                )
+                self._models[key] = model
+            return model
+
+    def _send(self, model_name: str, system_instruction: str, prompt: str):
+        """The actual model round trip; everything around it is transport-agnostic."""
+        self._ensure_backend()
+        model = self._get_model(model_name, system_instruction)
+        return model.generate_content(
             prompt,
-            safety_settings=safety_settings,
+            safety_settings=self._safety_settings,
         )
-        
-        return response.text
+
+    def generate(self, prompt: str, system_instruction: str = "", model_name: Optional[str] = None,
+                 use_cache: bool = True, tier: str = "auto",
+                 validate: Optional[Callable[[str], bool]] = None) -> str:
+        """
+        Sends one prompt. An explicit model_name wins; otherwise the router
+        picks a model for the tier ("auto", "fast" or "pro"). With `validate`,
+        only responses it accepts are cached (and cached ones it rejects are
+        asked again), so a bad answer isn't replayed on every retry.
+        """
+        model_name = model_name or self.router.choose(prompt, tier)
+
+        cache_key = None
+        if self.cache is not None and use_cache:
+            cache_key = ResponseCache.make_key(model_name, system_instruction, prompt)
+            cached = self.cache.get(cache_key)
+            if cached is not None and (validate is None or validate(cached)):
+                profiler.record_llm_call(model_name, 0.0, len(prompt), len(cached), cached=True)
+                return cached
+
+        response, latency = self._call(model_name, system_instruction, prompt)
+
+        text = response.text
+        usage = getattr(response, "usage_metadata", None)
+        profiler.record_llm_call(
+            model_name, latency, len(prompt), len(text),
+            prompt_tokens=getattr(usage, "prompt_token_count", None),
+            response_tokens=getattr(usage, "candidates_token_count", None),
+        )
+        if cache_key is not None and (validate is None or validate(text)):
+            self.cache.put(cache_key, text)
+        return text
+
+    def _call(self, model_name: str, system_instruction: str, prompt: str):
+        """
+        Rate-limited send with jittered exponential backoff on quota and
+        transient errors. Quota errors also slow down the shared rate limiter.
+        Returns (response, latency).
+        """
+        for attempt in range(self.retry.max_attempts):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                with profiler.track_concurrency("llm.in_flight"):
+                    result = self._attempt(model_name, system_instruction, prompt)
+            except Exception as e:
+                kind = classify_error(e)
+                if kind == "throttle":
+                    profiler.count("llm.throttled")
+                    if self.rate_limiter is not None:
+                        self.rate_limiter.on_throttle()
+                if kind == "fatal" or attempt + 1 == self.retry.max_attempts:
+                    raise
+                profiler.count("llm.retries")
+                time.sleep(self.retry.delay(attempt))
+                continue
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_success()
+            return result
+
+    def _submit(self, model_name: str, system_instruction: str, prompt: str):
+        """
+        Starts a request on a slot the caller holds. Returns (future, release):
+        the slot is given back once, when the request ends or by release() when
+        the caller abandons it, even if nobody waits for it any more.
+        """
+        once = threading.Lock()
+
+        def release() -> bool:
+            if not once.acquire(blocking=False):
+                return False
+            self._in_flight.release()
+            return True
+
+        future = self._pool.submit(self._send, model_name, system_instruction, prompt)
+        future.add_done_callback(lambda _: release())
+        return future, release
+
+    def _abandon(self, future, release):
+        # Past its deadline: free the slot for the retry, unless every spare thread
+        # is already taken by an abandoned request, in which case it keeps the slot
+        with self._abandoned_lock:
+            if self._abandoned >= self._max_abandoned:
+                return
+            self._abandoned += 1
+        future.add_done_callback(lambda _: self._end_abandoned())
+        if release():
+            profiler.count("llm.abandoned")
+
+    def _end_abandoned(self):
+        with self._abandoned_lock:
+            self._abandoned -= 1
+
+    def _attempt(self, model_name: str, system_instruction: str, prompt: str):
+        """
+        One try within the per-call deadline. With hedging on, a call running
+        past the model's latency percentile gets a duplicate request (if an
+        in-flight slot is free) and the first answer wins.
+        """
+        hedge_after = None
+        if self.hedge_percentile is not None:
+            hedge_after = self.latencies.threshold(model_name, self.hedge_percentile)
+
+        self._in_flight.acquire()
+        start = time.perf_counter()
+        deadline = start + self.timeout if self.timeout else None
+        future, release = self._submit(model_name, system_instruction, prompt)
+        releases = {future: release}
+        pending = {future}
+        hedged = hedge_after is None
+        error = None
+        while pending:
+            now = time.perf_counter()
+            waits = []
+            if deadline is not None:
+                waits.append(deadline - now)
+            if not hedged:
+                waits.append(start + hedge_after - now)
+            done, pending = wait(pending, timeout=max(0.0, min(waits)) if waits else None,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                latency = time.perf_counter() - start
+                self.latencies.observe(model_name, latency)
+                return response, latency
+            if done:
+                continue  # failed, but the other copy may still answer
+
+            now = time.perf_counter()
+            if deadline is not None and now >= deadline:
+                for future in pending:
+                    self._abandon(future, releases[future])
+                raise LLMTimeoutError(f"{model_name} did not answer within {self.timeout:g}s")
+            if not hedged and now - start >= hedge_after:
+                hedged = True
+                if self._in_flight.acquire(blocking=False):
+                    profiler.count("llm.hedged")
+                    future, release = self._submit(model_name, system_instruction, prompt)
+                    releases[future] = release
+                    pending.add(future)
+        raise error
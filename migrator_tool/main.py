@@ -1,102 +1,348 @@
 import typer
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.table import Table
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn
 import json
 import os
+from functools import partial
 from .llm_client import LLMClient
 from .scanner import ProjectScanner
 from .planner import MigrationPlanner
-from .translator import CodeTranslator
-from .scaffolder import ProjectScaffolder
 from .fixer import FixerAgent
+from . import pipeline
+from .cache import ResponseCache
+from .nuget import DependencyResolver
+from .solution import SolutionGraph, migrate_solution
+from .resilience import AdaptiveRateLimiter, RetryPolicy
+from .routing import ModelRouter, DEFAULT_FAST_MODEL, DEFAULT_PRO_MODEL
+from .telemetry import profiler
 
 app = typer.Typer()
 console = Console()
 
+def build_llm(project_id: str = None, no_cache: bool = False, cache_dir: str = None, max_in_flight: int = 8,
+              fast_model: str = DEFAULT_FAST_MODEL, pro_model: str = DEFAULT_PRO_MODEL,
+              requests_per_second: float = 10.0, llm_timeout: float = 180.0, hedge_percentile: float = None) -> LLMClient:
+    cache = None if no_cache else ResponseCache(cache_dir)
+    router = ModelRouter(fast_model=fast_model, pro_model=pro_model)
+    # Starting rate only; it adapts to quota errors. 0 disables throttling
+    limiter = AdaptiveRateLimiter(rate=requests_per_second) if requests_per_second > 0 else None
+    return LLMClient(project_id=project_id, max_in_flight=max_in_flight, cache=cache, router=router,
+                     rate_limiter=limiter, timeout=llm_timeout or None, hedge_percentile=hedge_percentile)
+
+def print_cache_stats(llm: LLMClient):
+    if llm.cache is None:
+        return
+    stats = llm.cache.stats()
+    console.print(f"[dim]LLM cache: {stats['hits']} hits, {stats['misses']} misses ({stats['entries']} entries on disk)[/dim]")
+
+def start_profile(enabled: bool, **info):
+    profiler.reset()
+    profiler.enabled = enabled
+    for key, value in info.items():
+        profiler.set_info(key, value)
+
+def finish_profile(report_path: str):
+    if not profiler.enabled:
+        return
+    path = profiler.write_report(report_path)
+    console.print(profiler.summary_table())
+    console.print(f"[dim]Profile written to {path}[/dim]")
+
 @app.command()
-def fix(project_dir: str, project_id: str = None, retries: int = 3):
+def fix(project_dir: str, project_id: str = None, retries: int = 3, no_cache: bool = False, cache_dir: str = None,
+        fast: bool = True, workers: int = 8, fast_model: str = DEFAULT_FAST_MODEL, pro_model: str = DEFAULT_PRO_MODEL,
+        max_build_errors: int = None, patch: bool = True, profile: bool = False):
     """
     Iteratively attempts to fix compilation errors in a Maven project.
+    With --fast (default) attempts use incremental compile checks and a single full build at the end.
+    Fixes start while the build is still running; --max-build-errors N stops a build after N errors.
+    Fixes are requested as line edits (--no-patch asks for whole files, as before).
+    --profile writes fix_profile.json into the project directory.
     """
-    llm = LLMClient(project_id=project_id)
-    agent = FixerAgent(project_dir, llm)
+    start_profile(profile, command="fix", workers=workers, fast=fast)
+    llm = build_llm(project_id, no_cache, cache_dir, fast_model=fast_model, pro_model=pro_model)
+    agent = FixerAgent(project_dir, llm, fast=fast, workers=workers, max_build_errors=max_build_errors,
+                       patch=patch)
     agent.auto_heal(max_retries=retries)
+    print_cache_stats(llm)
+    finish_profile(os.path.join(project_dir, "fix_profile.json"))
 
 @app.command()
-def analyze(input_dir: str, project_id: str = None):
+def scan(input_dir: str, max_file_mb: int = 5, batch_size: int = 1, shard_size: int = 40, fast_path: bool = True,
+         fast_model: str = DEFAULT_FAST_MODEL, pro_model: str = DEFAULT_PRO_MODEL,
+         fast_price_in: float = 0.30, fast_price_out: float = 2.50, pro_price_in: float = 1.25,
+         pro_price_out: float = 10.0, top: int = 10, report: str = None, chunk_chars: int = 20000,
+         nuget_map: str = None):
+    """
+    Offline sizing, no LLM and no credentials needed: file counts and sizes, estimated prompt tokens per file,
+    and projected LLM calls, tokens and cost for planning and translation (fix attempts not included).
+    Prices are USD per 1M tokens; check them against current model pricing.
+    """
+    from .estimate import MigrationEstimator
+
+    scanner = ProjectScanner(input_dir, max_file_bytes=max_file_mb * 1024 * 1024)
+    scan_result = scanner.scan(lazy=True, index_symbols=True)
+    router = ModelRouter(fast_model=fast_model, pro_model=pro_model)
+    estimator = MigrationEstimator(router, batch_size=batch_size, shard_size=shard_size, fast_path=fast_path,
+                                   prices={fast_model: (fast_price_in, fast_price_out),
+                                           pro_model: (pro_price_in, pro_price_out)},
+                                   chunk_chars=chunk_chars, resolver=DependencyResolver.from_file(nuget_map))
+    estimate = estimator.estimate(scan_result)
+
+    table = Table(title=f"{estimate['root']}: {estimate['files']} files, {estimate['bytes'] / 1024:.0f} KiB")
+    table.add_column("Extension")
+    table.add_column("Files", justify="right")
+    table.add_column("KiB", justify="right")
+    for ext, stats in estimate["by_extension"].items():
+        table.add_row(ext, str(stats["files"]), f"{stats['bytes'] / 1024:.1f}")
+    console.print(table)
+    skipped = estimate["skipped"]
+    if any(skipped.values()):
+        console.print(f"[yellow]Skipped: {skipped['binary']} binary, {skipped['too_large']} over {max_file_mb} MB[/yellow]")
+
+    table = Table(title=f"Largest prompts (of {estimate['cs_files']} .cs files)")
+    table.add_column("File")
+    table.add_column("Prompt tokens", justify="right")
+    table.add_column("Model")
+    for record in estimate["per_file"][:top]:
+        table.add_row(record["file"], str(record["prompt_tokens"]), record["model"] or "fast path")
+    console.print(table)
+
+    table = Table(title="Projected LLM usage")
+    table.add_column("Phase")
+    table.add_column("Calls", justify="right")
+    table.add_column("Prompt tokens", justify="right")
+    table.add_column("Output tokens", justify="right")
+    table.add_column("Cost (USD)", justify="right")
+    for phase, stats in list(estimate["phases"].items()) + [("total", estimate["total"])]:
+        table.add_row(phase, str(stats["calls"]), str(stats["prompt_tokens"]), str(stats["output_tokens"]),
+                      f"{stats['cost_usd']:.2f}")
+    console.print(table)
+    console.print(f"[dim]{estimate['fast_path_files']} file(s) would be translated without the LLM.[/dim]")
+
+    if report:
+        with open(report, "w") as f:
+            json.dump(estimate, f, indent=2)
+        console.print(f"[dim]Scan report written to {report}[/dim]")
+
+@app.command()
+def analyze(input_dir: str, project_id: str = None, no_cache: bool = False, cache_dir: str = None,
+            max_file_mb: int = 5, shard_size: int = 40, pro_model: str = DEFAULT_PRO_MODEL, nuget_map: str = None,
+            profile: bool = False):
     """
     Analyzes the .NET project and proposes a migration plan.
+    --nuget-map points to a JSON file of NuGet -> Maven overrides for the built-in mapping table.
+    --profile writes analyze_profile.json into the current directory.
     """
+    start_profile(profile, command="analyze", shard_size=shard_size)
     with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), transient=True) as progress:
         progress.add_task(description="Scanning project...", total=None)
-        scanner = ProjectScanner(input_dir)
-        scan_result = scanner.scan()
+        scanner = ProjectScanner(input_dir, max_file_bytes=max_file_mb * 1024 * 1024)
+        scan_result = scanner.scan(lazy=True)
         
         progress.add_task(description="Planning migration (consulting AI)...", total=None)
-        llm = LLMClient(project_id=project_id)
-        planner = MigrationPlanner(llm)
+        llm = build_llm(project_id, no_cache, cache_dir, pro_model=pro_model)
+        planner = MigrationPlanner(llm, shard_size=shard_size, resolver=DependencyResolver.from_file(nuget_map))
         plan = planner.create_plan(scan_result)
 
     console.print("[green]Analysis Complete![/green]")
     console.print_json(plan.model_dump_json())
+    print_cache_stats(llm)
+    finish_profile("analyze_profile.json")
 
 @app.command()
-def migrate(input_dir: str, output_dir: str, project_id: str = None):
+def migrate(input_dir: str, output_dir: str, project_id: str = None, workers: int = 8, max_in_flight: int = 8,
+            no_cache: bool = False, cache_dir: str = None, full: bool = False, max_file_mb: int = 5,
+            shard_size: int = 40, fast_model: str = DEFAULT_FAST_MODEL, pro_model: str = DEFAULT_PRO_MODEL,
+            batch_size: int = 1, fast_path: bool = True, resume: bool = False, nuget_map: str = None,
+            chunk_chars: int = 20000, requests_per_second: float = 10.0, llm_timeout: float = 180.0,
+            hedge_percentile: float = None, profile: bool = False):
     """
     Full migration: Analysis -> Planning -> Translation -> Code Generation.
+    Re-runs into the same output directory only retranslate changed sources unless --full is given.
+    --batch-size N packs up to N small files of the same package into one LLM request.
+    Trivial models, DTOs, records and enums are translated without the LLM unless --no-fast-path is given.
+    --resume continues an interrupted run from its journal, reusing the saved plan and finished files.
+    --nuget-map points to a JSON file of NuGet -> Maven overrides for the built-in mapping table.
+    Sources over --chunk-chars are translated in parallel member chunks (0 disables); partial classes become one Java class.
+    LLM calls start at --requests-per-second (adapting to quota errors), are retried with backoff on quota and
+    transient errors, and abandoned after --llm-timeout seconds. --hedge-percentile 95 duplicates calls slower than p95.
+    --profile writes migration_profile.json (timings, LLM latencies, tokens) next to the output.
     """
-    llm = LLMClient(project_id=project_id)
-    
-    # 1. Scan
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), transient=True) as progress:
-        task1 = progress.add_task(description="Scanning project...", total=None)
-        scanner = ProjectScanner(input_dir)
-        scan_result = scanner.scan()
-        
-    # 2. Plan
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), transient=True) as progress:
-        task2 = progress.add_task(description="Generating Migration Plan...", total=None)
-        planner = MigrationPlanner(llm)
-        plan = planner.create_plan(scan_result)
-        
-    console.print(f"[blue]Plan generated: {plan.project_name} -> {plan.artifact_id}[/blue]")
-
-    # 3. Scaffold
-    scaffolder = ProjectScaffolder(output_dir)
-    scaffolder.create_structure(plan)
-    
-    # 4. Translate
-    translator = CodeTranslator(llm)
-    
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), transient=True) as progress:
-        task3 = progress.add_task(description="Translating files...", total=len(plan.file_mappings))
-        
-        for mapping in plan.file_mappings:
-            # Find content
-            source_content = scan_result['contents'].get(mapping.source_file)
-            if not source_content:
-                console.print(f"[red]Warning: Could not find content for {mapping.source_file}[/red]")
-                continue
-                
-            progress.update(task3, description=f"Translating {mapping.source_file}...")
-            
-            # Translate
-            java_code = translator.translate_file(source_content, mapping, plan)
-            
-            # Write
-            scaffolder.write_file(mapping.target_path, java_code)
-            progress.advance(task3)
-
-    # 5. Metadata
-    console.print("[yellow]Generating Build Files...[/yellow]")
-    pom_xml = scaffolder.generate_pom(plan)
-    scaffolder.write_file("pom.xml", pom_xml)
-    
-    props = scaffolder.generate_application_properties(plan)
-    scaffolder.write_file("src/main/resources/application.properties", props)
-    
+    start_profile(profile, command="migrate", workers=workers, max_in_flight=max_in_flight,
+                  batch_size=batch_size, shard_size=shard_size)
+    llm = build_llm(project_id, no_cache, cache_dir, max_in_flight, fast_model, pro_model,
+                    requests_per_second, llm_timeout, hedge_percentile)
+    settings = {"workers": workers, "full": full, "max_file_mb": max_file_mb, "shard_size": shard_size,
+                "batch_size": batch_size, "fast_path": fast_path, "resume": resume, "nuget_map": nuget_map,
+                "chunk_chars": chunk_chars}
+
+    stages = {"scan": "Scanning project...", "plan": "Generating Migration Plan...",
+              "translate": "Translating files...", "write": "Generating Build Files..."}
+    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), BarColumn(),
+                  MofNCompleteColumn(), transient=True) as progress:
+        task = progress.add_task(description=stages["scan"], total=None)
+
+        def on_progress(stage: str, done: int, total: int):
+            # Only translation has a meaningful count
+            progress.update(task, description=stages[stage], completed=done,
+                            total=total if stage == "translate" else None)
+
+        result = pipeline.migrate_project(llm, input_dir, output_dir, settings,
+                                          on_progress=on_progress, on_message=progress.console.print)
+
+    translated = result["fast_path"] + result["llm"]
+    if result["fast_path"]:
+        console.print(f"[blue]{result['fast_path']}/{translated} file(s) translated without the LLM "
+                      f"({100 * result['fast_path'] / translated:.0f}%).[/blue]")
+    if result["failed"]:
+        console.print(f"[red]{len(result['failed'])} file(s) failed to translate.[/red]")
+        console.print("[yellow]Journal kept; re-run with --resume to retry the failed files.[/yellow]")
+
+    console.print(f"[dim]Output: {result['written']} file(s) written, {result['unchanged_on_disk']} unchanged on disk.[/dim]")
     console.print(f"[green]Migration Complete! Output at: {output_dir}[/green]")
+    print_cache_stats(llm)
+    console.print("Try running: [bold]mvn clean install[/bold] in the output directory.")
+    finish_profile(os.path.join(output_dir, "migration_profile.json"))
+
+@app.command("migrate-solution")
+def migrate_sln(sln_path: str, output_dir: str, project_id: str = None, processes: int = os.cpu_count() or 4,
+                workers: int = 8, max_in_flight: int = 16, no_cache: bool = False, cache_dir: str = None,
+                full: bool = False, max_file_mb: int = 5, shard_size: int = 40, fast_model: str = DEFAULT_FAST_MODEL,
+                pro_model: str = DEFAULT_PRO_MODEL, batch_size: int = 1, fast_path: bool = True,
+                nuget_map: str = None, chunk_chars: int = 20000, requests_per_second: float = 10.0,
+                llm_timeout: float = 180.0, hedge_percentile: float = None, group_id: str = "com.example",
+                profile: bool = False):
+    """
+    Migrates every project of a .sln into a Maven multi-module build, one worker process per project.
+    Projects start once the projects they reference are done; independent ones run in parallel.
+    --max-in-flight and --requests-per-second are for the whole run, split across --processes.
+    --profile writes solution_profile.json (per-project reports) into the output directory.
+    """
+    graph = SolutionGraph(sln_path)
+    if not graph.projects:
+        console.print(f"[red]No C# projects found in {sln_path}[/red]")
+        raise typer.Exit(code=1)
+
+    processes = max(1, min(processes, len(graph.projects)))
+    console.print(f"[blue]{len(graph.projects)} project(s), up to {processes} at a time: "
+                  f"{' -> '.join(graph.build_order())}[/blue]")
+    # Each process gets its own client, so the quota is shared out up front
+    llm_factory = partial(build_llm, project_id, no_cache, cache_dir, max(1, max_in_flight // processes),
+                          fast_model, pro_model, requests_per_second / processes, llm_timeout, hedge_percentile)
+    settings = {"workers": workers, "full": full, "max_file_mb": max_file_mb, "shard_size": shard_size,
+                "batch_size": batch_size, "fast_path": fast_path, "nuget_map": nuget_map, "chunk_chars": chunk_chars,
+                "profile": profile}
+
+    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), BarColumn(),
+                  MofNCompleteColumn(), transient=True) as progress:
+        task = progress.add_task(description="Migrating projects...", total=len(graph.projects))
+
+        def on_done(result):
+            if "error" in result:
+                progress.console.print(f"[red]{result['name']} failed: {result['error']}[/red]")
+            else:
+                progress.console.print(f"[green]{result['name']}: {result['translated']} translated, "
+                                       f"{result['unchanged']} unchanged, {len(result['failed'])} failed[/green]")
+            if result.get("missing_references"):
+                progress.console.print(f"[yellow]{result['name']} was migrated without its failed reference(s) "
+                                       f"{', '.join(result['missing_references'])}; expect compile errors there.[/yellow]")
+            progress.advance(task)
+
+        results = migrate_solution(graph, output_dir, llm_factory, settings, processes=processes,
+                                   group_id=group_id, on_done=on_done)
+
+    failed = [name for name, result in results.items() if "error" in result or result["failed"]]
+    if failed:
+        console.print(f"[red]{len(failed)} project(s) incomplete: {', '.join(failed)}[/red]")
+    dropped = [name for name, result in results.items() if "error" in result]
+    if dropped:
+        console.print(f"[yellow]Left out of the parent pom: {', '.join(dropped)}[/yellow]")
+    if profile:
+        path = os.path.join(output_dir, "solution_profile.json")
+        with open(path, "w") as f:
+            json.dump({name: result.get("profile") for name, result in results.items()}, f, indent=2)
+        console.print(f"[dim]Profile written to {path}[/dim]")
+    console.print(f"[green]Solution migrated! Parent pom at: {os.path.join(output_dir, 'pom.xml')}[/green]")
     console.print("Try running: [bold]mvn clean install[/bold] in the output directory.")
 
+@app.command()
+def serve(host: str = "127.0.0.1", port: int = 8765, jobs: int = 2, project_id: str = None, max_in_flight: int = 16,
+          no_cache: bool = False, cache_dir: str = None, fast_model: str = DEFAULT_FAST_MODEL,
+          pro_model: str = DEFAULT_PRO_MODEL, fake_llm: bool = False, fake_latency: float = 0.2):
+    """
+    Runs a local HTTP/JSON migration service: POST /jobs with {"type": "analyze|migrate|fix", "params": {...}},
+    poll GET /jobs/<id>. One warm LLM client and cache serve every job; --max-in-flight caps LLM calls
+    across all --jobs running at once. --fake-llm uses the offline fake backend (for testing).
+    """
+    from .server import MigrationService, make_server
+
+    if fake_llm:
+        from .fake_llm import FakeLLMClient
+        llm = FakeLLMClient(latency=fake_latency, max_in_flight=max_in_flight,
+                            cache=None if no_cache else ResponseCache(cache_dir),
+                            router=ModelRouter(fast_model=fast_model, pro_model=pro_model))
+    else:
+        llm = build_llm(project_id, no_cache, cache_dir, max_in_flight, fast_model, pro_model)
+    service = MigrationService(llm, jobs=jobs)
+    server = make_server(service, host, port)
+    console.print(f"[green]Migration service listening on http://{host}:{server.server_port} "
+                  f"({jobs} job(s) at a time, {max_in_flight} LLM calls in flight)[/green]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("[yellow]Shutting down, waiting for running jobs...[/yellow]")
+    finally:
+        server.server_close()
+        service.shutdown()
+
+@app.command()
+def bench(models: int = 40, services: int = 20, controllers: int = 20, depth: int = 2, large_files: int = 2,
+          large_file_methods: int = 300, seed: int = 0, latency: float = 0.2, jitter: float = 0.1,
+          failure_rate: float = 0.0, throttle_rate: float = 0.0, tail_rate: float = 0.0,
+          requests_per_second: float = 0.0, hedge_percentile: float = None, workers: int = 8, max_in_flight: int = 8,
+          batch_size: int = 1, shard_size: int = 40, fix_error_rate: float = 0.1, report: str = None,
+          profile: bool = False):
+    """
+    Offline benchmark: generates a synthetic ASP.NET Core project and runs scan, planning,
+    translation and auto-heal against a fake LLM with configurable latency and failures.
+    --throttle-rate and --tail-rate simulate 429s and 10x-slow stragglers for the retry, rate limiting
+    (--requests-per-second, 0 = off) and hedging (--hedge-percentile) paths.
+    """
+    from .benchmark import run_benchmark
+    from .fake_llm import FakeLLMClient
+    from .synthetic import SyntheticProjectGenerator
+
+    start_profile(profile, command="bench", workers=workers, batch_size=batch_size)
+    generator = SyntheticProjectGenerator(models=models, services=services, controllers=controllers, depth=depth,
+                                          large_files=large_files, large_file_methods=large_file_methods, seed=seed)
+    llm = FakeLLMClient(latency=latency, jitter=jitter, failure_rate=failure_rate, seed=seed,
+                        max_in_flight=max_in_flight, throttle_rate=throttle_rate, tail_rate=tail_rate,
+                        rate_limiter=AdaptiveRateLimiter(rate=requests_per_second) if requests_per_second > 0 else None,
+                        retry=RetryPolicy(base_delay=0.05, max_delay=1.0, seed=seed),
+                        hedge_percentile=hedge_percentile)
+    result = run_benchmark(generator, llm, workers=workers, batch_size=batch_size, shard_size=shard_size,
+                           fix_error_rate=fix_error_rate)
+
+    table = Table(title=f"Benchmark: {result['project']['cs_files']} .cs files, {result['project']['bytes'] // 1024} KiB")
+    table.add_column("Phase")
+    table.add_column("Seconds", justify="right")
+    for phase, seconds in result["phases_s"].items():
+        table.add_row(phase, f"{seconds:.2f}")
+    table.add_row("total", f"{result['total_s']:.2f}")
+    console.print(table)
+    console.print(f"Translated {result['files_translated']} file(s) ({result['files_failed']} failed) at "
+                  f"{result['translate_files_per_s']:.1f} files/s, {result['overall_files_per_s']:.1f} files/s end to end.")
+    console.print(f"Fast path: {result['fast_path_files']} file(s) translated without the LLM.")
+    console.print(f"LLM calls: {result['llm_calls']}, peak RSS: {result['peak_rss_mb']:.0f} MB, "
+                  f"auto-heal {'succeeded' if result['auto_heal_succeeded'] else 'failed'}.")
+
+    if report:
+        with open(report, "w") as f:
+            json.dump(result, f, indent=2)
+        console.print(f"[dim]Benchmark report written to {report}[/dim]")
+    finish_profile("bench_profile.json")
+
 if __name__ == "__main__":
     app()
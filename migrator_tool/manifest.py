@@ -0,0 +1,82 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import List
+from .models import FileMapping, ManifestEntry, MigrationManifest
+
+MANIFEST_FILE = ".migration_manifest.json"
+
+
+def hash_content(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class ManifestTracker:
+    """
+    Tracks what a previous `migrate` run produced so the next run only
+    retranslates sources whose content or mapping changed.
+    """
+    def __init__(self, output_dir: str):
+        self.output_dir = Path(output_dir).resolve()
+        self.path = self.output_dir / MANIFEST_FILE
+        self.previous = self._load()
+        self.current = MigrationManifest()
+
+    def _load(self) -> MigrationManifest:
+        if not self.path.exists():
+            return MigrationManifest()
+        try:
+            return MigrationManifest.model_validate_json(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            # A corrupt or outdated manifest just means a full run
+            return MigrationManifest()
+
+    def is_up_to_date(self, mapping: FileMapping, source_hash: str) -> bool:
+        """
+        True if the previous run translated this exact source with this exact
+        mapping and its output is still on disk. Carries the entry forward.
+        """
+        entry = self.previous.entries.get(mapping.source_file)
+        if entry is None:
+            return False
+        if entry.source_hash != source_hash or entry.mapping != mapping:
+            return False
+        if not (self.output_dir / mapping.target_path).exists():
+            return False
+        self.current.entries[mapping.source_file] = entry
+        return True
+
+    def record(self, mapping: FileMapping, source_hash: str, java_code: str):
+        self.record_hash(mapping, source_hash, hash_content(java_code))
+
+    def record_hash(self, mapping: FileMapping, source_hash: str, java_hash: str):
+        self.current.entries[mapping.source_file] = ManifestEntry(
+            source_hash=source_hash,
+            mapping=mapping,
+            java_hash=java_hash,
+        )
+
+    def remove_stale(self, mappings: List[FileMapping]) -> List[str]:
+        """
+        Deletes Java files from the previous run that no mapping in the current
+        plan produces any more: either the source was removed or its target moved.
+        """
+        live_targets = {m.target_path for m in mappings}
+        removed = []
+        for entry in self.previous.entries.values():
+            target = entry.mapping.target_path
+            if target in live_targets:
+                continue
+            full_path = self.output_dir / target
+            if full_path.exists():
+                full_path.unlink()
+                removed.append(target)
+        return removed
+
+    def save(self):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(self.current.model_dump_json(indent=2))
+        os.replace(tmp_path, self.path)
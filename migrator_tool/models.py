@@ -21,3 +21,55 @@ class MigrationPlan(BaseModel):
     dependencies: List[MavenDependency]
     file_mappings: List[FileMapping]
     application_properties: Dict[str, str] = Field(description="Key-value pairs for application.properties")
+
+class PlanSkeleton(BaseModel):
+    """Project-wide part of a MigrationPlan, decided once before sharded file mapping."""
+    project_name: str
+    group_id: str = "com.example"
+    artifact_id: str = "demo"
+    java_version: str = "17"
+    spring_boot_version: str = "3.2.0"
+    base_package: str = Field(default="com.example.demo", description="Root Java package for mapped files")
+    dependencies: List[MavenDependency]
+    application_properties: Dict[str, str] = Field(description="Key-value pairs for application.properties")
+
+class FileMappingBatch(BaseModel):
+    file_mappings: List[FileMapping]
+
+class ManifestEntry(BaseModel):
+    source_hash: str = Field(description="sha256 of the .NET source file content")
+    mapping: FileMapping
+    java_hash: str = Field(description="sha256 of the Java code generated for this source")
+
+class MigrationManifest(BaseModel):
+    version: int = 1
+    entries: Dict[str, ManifestEntry] = Field(default_factory=dict, description="Keyed by source_file")
+
+class JournalHeader(BaseModel):
+    version: int = 1
+    input_dir: str = Field(description="Absolute path of the .NET project being migrated")
+    plan: MigrationPlan
+
+class JournalRecord(BaseModel):
+    source_file: str
+    source_hash: str
+    target_path: str
+    java_hash: str
+
+class PackageReference(BaseModel):
+    name: str
+    version: str | None = None
+
+class CsprojInfo(BaseModel):
+    path: str = Field(description="Relative path of the .csproj file")
+    sdk: str | None = None
+    target_frameworks: List[str] = Field(default_factory=list)
+    package_references: List[PackageReference] = Field(default_factory=list)
+    project_references: List[str] = Field(default_factory=list, description="Relative paths of referenced .csproj files")
+
+class SolutionProject(BaseModel):
+    name: str
+    path: str = Field(description="Path of the .csproj relative to the .sln directory")
+    directory: str = Field(description="Project directory relative to the .sln directory")
+    module: str = Field(description="Maven module (directory and artifactId) it migrates to")
+    references: List[str] = Field(default_factory=list, description="Names of referenced projects")
@@ -0,0 +1,249 @@
+import fnmatch
+import json
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from .models import CsprojInfo, MavenDependency, PackageReference
+
+# Bump when entries change meaning, so override files can say what they were written against
+MAPPING_TABLE_VERSION = 1
+
+# NuGet package (exact name or glob) -> rules, first match wins. A rule may
+# restrict the NuGet version with "versions" (e.g. ">=7", "<6.0"); an empty
+# "maven" list means the package is known and needs no extra Java dependency
+# (Spring Boot or the generated pom already covers it). version None means
+# managed by the Spring Boot parent.
+DEFAULT_MAPPINGS: Dict[str, List[dict]] = {
+    "Microsoft.EntityFrameworkCore": [
+        {"maven": [{"group_id": "org.springframework.boot", "artifact_id": "spring-boot-starter-data-jpa"}]},
+    ],
+    "Microsoft.EntityFrameworkCore.SqlServer": [
+        {"maven": [{"group_id": "org.springframework.boot", "artifact_id": "spring-boot-starter-data-jpa"},
+                   {"group_id": "com.microsoft.sqlserver", "artifact_id": "mssql-jdbc", "scope": "runtime"}]},
+    ],
+    "Npgsql.EntityFrameworkCore.PostgreSQL": [
+        {"maven": [{"group_id": "org.springframework.boot", "artifact_id": "spring-boot-starter-data-jpa"},
+                   {"group_id": "org.postgresql", "artifact_id": "postgresql", "scope": "runtime"}]},
+    ],
+    "Pomelo.EntityFrameworkCore.MySql": [
+        {"maven": [{"group_id": "org.springframework.boot", "artifact_id": "spring-boot-starter-data-jpa"},
+                   {"group_id": "com.mysql", "artifact_id": "mysql-connector-j", "scope": "runtime"}]},
+    ],
+    "Microsoft.EntityFrameworkCore.Sqlite": [
+        {"maven": [{"group_id": "org.springframework.boot", "artifact_id": "spring-boot-starter-data-jpa"},
+                   {"group_id": "org.xerial", "artifact_id": "sqlite-jdbc", "scope": "runtime"},
+                   {"group_id": "org.hibernate.orm", "artifact_id": "hibernate-community-dialects"}]},
+    ],
+    "Microsoft.EntityFrameworkCore.InMemory": [
+        {"maven": [{"group_id": "org.springframework.boot", "artifact_id": "spring-boot-starter-data-jpa"},
+                   {"group_id": "com.h2database", "artifact_id": "h2", "scope": "runtime"}]},
+    ],
+    # Design-time/migration tooling, nothing to carry over
+    "Microsoft.EntityFrameworkCore.Design": [{"maven": []}],
+    "Microsoft.EntityFrameworkCore.Tools": [{"maven": []}],
+    "Dapper": [
+        {"maven": [{"group_id": "org.springframework.boot", "artifact_id": "spring-boot-starter-jdbc"}]},
+    ],
+    "Microsoft.Data.SqlClient": [
+        {"maven": [{"group_id": "com.microsoft.sqlserver", "artifact_id": "mssql-jdbc", "scope": "runtime"}]},
+    ],
+    "Npgsql": [
+        {"maven": [{"group_id": "org.postgresql", "artifact_id": "postgresql", "scope": "runtime"}]},
+    ],
+    "StackExchange.Redis": [
+        {"maven": [{"group_id": "org.springframework.boot", "artifact_id": "spring-boot-starter-data-redis"}]},
+    ],
+    "MongoDB.Driver": [
+        {"maven": [{"group_id": "org.springframework.boot", "artifact_id": "spring-boot-starter-data-mongodb"}]},
+    ],
+    "Newtonsoft.Json": [
+        {"maven": [{"group_id": "com.fasterxml.jackson.core", "artifact_id": "jackson-databind"}]},
+    ],
+    "Swashbuckle.AspNetCore*": [
+        {"maven": [{"group_id": "org.springdoc", "artifact_id": "springdoc-openapi-starter-webmvc-ui", "version": "2.3.0"}]},
+    ],
+    "Microsoft.AspNetCore.OpenApi": [
+        {"maven": [{"group_id": "org.springdoc", "artifact_id": "springdoc-openapi-starter-webmvc-ui", "version": "2.3.0"}]},
+    ],
+    # Logback via spring-boot-starter-logging is already on the classpath
+    "Serilog*": [{"maven": []}],
+    "NLog*": [{"maven": []}],
+    "AutoMapper*": [
+        {"maven": [{"group_id": "org.mapstruct", "artifact_id": "mapstruct", "version": "1.5.5.Final"}]},
+    ],
+    "FluentValidation*": [
+        {"maven": [{"group_id": "org.springframework.boot", "artifact_id": "spring-boot-starter-validation"}]},
+    ],
+    "Microsoft.AspNetCore.Authentication.JwtBearer": [
+        {"maven": [{"group_id": "org.springframework.boot", "artifact_id": "spring-boot-starter-oauth2-resource-server"}]},
+    ],
+    "Microsoft.AspNetCore.Identity*": [
+        {"maven": [{"group_id": "org.springframework.boot", "artifact_id": "spring-boot-starter-security"}]},
+    ],
+    "Polly*": [
+        {"maven": [{"group_id": "io.github.resilience4j", "artifact_id": "resilience4j-spring-boot3", "version": "2.2.0"}]},
+    ],
+    "Microsoft.Extensions.Caching.StackExchangeRedis": [
+        {"maven": [{"group_id": "org.springframework.boot", "artifact_id": "spring-boot-starter-data-redis"},
+                   {"group_id": "org.springframework.boot", "artifact_id": "spring-boot-starter-cache"}]},
+    ],
+    # Hosting/DI/config/logging abstractions are Spring Boot itself
+    "Microsoft.Extensions.*": [{"maven": []}],
+    "Microsoft.AspNetCore.Mvc*": [{"maven": []}],
+    # Test stack: spring-boot-starter-test is always in the generated pom
+    "Microsoft.NET.Test.Sdk": [{"maven": []}],
+    "xunit*": [{"maven": []}],
+    "NUnit*": [{"maven": []}],
+    "MSTest*": [{"maven": []}],
+    "Moq": [{"maven": []}],
+    "FluentAssertions": [{"maven": []}],
+    "coverlet*": [{"maven": []}],
+}
+
+
+def _local_name(tag: str) -> str:
+    # Old-style projects put everything in the MSBuild XML namespace
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_csproj(path: str, content: str) -> CsprojInfo:
+    """
+    Reads PackageReference, TargetFramework(s) and ProjectReference from a
+    .csproj. Project references come back as paths relative to the scan root.
+    """
+    info = CsprojInfo(path=path)
+    try:
+        root = ET.fromstring(content.lstrip("\ufeff"))
+    except ET.ParseError:
+        return info
+    info.sdk = root.get("Sdk")
+    base_dir = posixpath.dirname(path.replace("\\", "/"))
+
+    for element in root.iter():
+        tag = _local_name(element.tag)
+        if tag in ("TargetFramework", "TargetFrameworks") and element.text:
+            for framework in element.text.split(";"):
+                if framework.strip() and framework.strip() not in info.target_frameworks:
+                    info.target_frameworks.append(framework.strip())
+        elif tag == "PackageReference":
+            name = element.get("Include") or element.get("Update")
+            if not name:
+                continue
+            version = element.get("Version")
+            if version is None:
+                child = next((c for c in element if _local_name(c.tag) == "Version"), None)
+                version = child.text.strip() if child is not None and child.text else None
+            info.package_references.append(PackageReference(name=name, version=version))
+        elif tag == "ProjectReference" and element.get("Include"):
+            reference = element.get("Include").replace("\\", "/")
+            info.project_references.append(posixpath.normpath(posixpath.join(base_dir, reference)))
+    return info
+
+
+def _version_tuple(version: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in re.findall(r"\d+", version)[:3])
+
+
+def version_matches(version: Optional[str], constraint: Optional[str]) -> bool:
+    """Tiny range check for rule constraints like ">=7", "<6.0" or ">=6,<8"."""
+    if not constraint:
+        return True
+    if not version:
+        # Unknown (e.g. central package management): only unconstrained rules apply
+        return False
+    current = _version_tuple(version)
+    for clause in constraint.split(","):
+        match = re.match(r"^\s*(>=|<=|>|<|==)\s*([\d.]+)\s*$", clause)
+        if not match:
+            return False
+        op, bound = match.group(1), _version_tuple(match.group(2))
+        width = max(len(current), len(bound))
+        left = current + (0,) * (width - len(current))
+        right = bound + (0,) * (width - len(bound))
+        if not {"<": left < right, "<=": left <= right, ">": left > right,
+                ">=": left >= right, "==": left == right}[op]:
+            return False
+    return True
+
+
+class DependencyResolver:
+    """
+    Resolves NuGet package references to Maven dependencies from the built-in
+    table plus optional user overrides (a JSON file in the same format as
+    DEFAULT_MAPPINGS; a bare list of Maven coordinates is accepted as a
+    single unconstrained rule). Overrides win over built-in entries.
+    """
+    def __init__(self, overrides: Optional[Dict[str, object]] = None):
+        self.mappings: Dict[str, List[dict]] = {}
+        for name, rules in (overrides or {}).items():
+            if name.startswith("$"):
+                # "$table_version" and friends
+                continue
+            if rules and all(isinstance(rule, dict) and "maven" in rule for rule in rules):
+                self.mappings[name] = list(rules)
+            else:
+                self.mappings[name] = [{"maven": rules}]
+        for name, rules in DEFAULT_MAPPINGS.items():
+            self.mappings.setdefault(name, rules)
+
+    @classmethod
+    def from_file(cls, path: Optional[str]) -> "DependencyResolver":
+        if not path:
+            return cls()
+        overrides = json.loads(Path(path).read_text(encoding="utf-8"))
+        table_version = overrides.get("$table_version", MAPPING_TABLE_VERSION)
+        if table_version > MAPPING_TABLE_VERSION:
+            raise ValueError(f"{path} targets mapping table version {table_version}, "
+                             f"this tool knows version {MAPPING_TABLE_VERSION}")
+        return cls(overrides)
+
+    def _rules_for(self, name: str) -> Optional[List[dict]]:
+        if name in self.mappings:
+            return self.mappings[name]
+        lowered = name.lower()
+        # Exact (case-insensitive) names beat globs, longer globs beat shorter ones
+        for key in self.mappings:
+            if key.lower() == lowered:
+                return self.mappings[key]
+        patterns = sorted((k for k in self.mappings if "*" in k or "?" in k), key=len, reverse=True)
+        for pattern in patterns:
+            if fnmatch.fnmatchcase(lowered, pattern.lower()):
+                return self.mappings[pattern]
+        return None
+
+    def lookup(self, package: PackageReference) -> Optional[List[MavenDependency]]:
+        """Maven dependencies for one package, [] if none are needed, None if unknown."""
+        rules = self._rules_for(package.name)
+        if rules is None:
+            return None
+        for rule in rules:
+            if version_matches(package.version, rule.get("versions")):
+                return [MavenDependency(**coordinates) for coordinates in rule.get("maven", [])]
+        return None
+
+    def resolve(self, projects: List[CsprojInfo]) -> Tuple[List[MavenDependency], List[PackageReference]]:
+        """
+        (resolved Maven dependencies, unmapped NuGet packages) across all
+        projects, each deduplicated and in first-seen order.
+        """
+        resolved: Dict[Tuple[str, str], MavenDependency] = {}
+        unmapped: Dict[str, PackageReference] = {}
+        for project in projects:
+            for package in project.package_references:
+                dependencies = self.lookup(package)
+                if dependencies is None:
+                    unmapped.setdefault(package.name.lower(), package)
+                    continue
+                for dependency in dependencies:
+                    resolved.setdefault((dependency.group_id, dependency.artifact_id), dependency)
+        return list(resolved.values()), list(unmapped.values())
+
+
+def merge_dependencies(resolved: List[MavenDependency], suggested: List[MavenDependency]) -> List[MavenDependency]:
+    """Locally resolved coordinates win; model suggestions only add what is missing."""
+    merged = {(d.group_id, d.artifact_id): d for d in resolved}
+    for dependency in suggested:
+        merged.setdefault((dependency.group_id, dependency.artifact_id), dependency)
+    return list(merged.values())
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from .telemetry import profiler
+
+
+# Read once at import; os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class OutputWriter:
+    """
+    Shared write path for generated files. A file is only rewritten when its
+    content hash differs from what is on disk, so mtimes of unchanged files
+    survive and incremental builds/indexers skip them. Writes go to a temp
+    file in the same directory and are renamed into place, so readers (and
+    crashes) never see half-written files.
+    """
+    def __init__(self, root: str):
+        self.root = Path(root).resolve()
+        # Hash of what we last saw/wrote per path, saves re-reading the file
+        self._known: Dict[Path, str] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Future] = []
+        self.written = 0
+        self.unchanged = 0
+
+    def _current_hash(self, path: Path) -> Optional[str]:
+        with self._lock:
+            known = self._known.get(path)
+        if known is not None and path.exists():
+            return known
+        try:
+            return _digest(path.read_bytes())
+        except FileNotFoundError:
+            return None
+
+    def write(self, relative_path: str, content: str) -> bool:
+        """Writes content atomically unless identical. Returns True if the file changed."""
+        path = self.root / relative_path
+        data = content.encode("utf-8")
+        new_hash = _digest(data)
+        if self._current_hash(path) == new_hash:
+            with self._lock:
+                self._known[path] = new_hash
+                self.unchanged += 1
+            profiler.count("output.unchanged")
+            return False
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                # mkstemp creates 0600; keep the target's mode, or what open() would give a new file
+                try:
+                    mode = path.stat().st_mode & 0o7777
+                except FileNotFoundError:
+                    mode = 0o666 & ~_UMASK
+                os.fchmod(f.fileno(), mode)
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        with self._lock:
+            self._known[path] = new_hash
+            self.written += 1
+        profiler.count("output.written")
+        return True
+
+    def submit(self, relative_path: str, content: str, on_done: Optional[Callable[[bool], None]] = None) -> Future:
+        """
+        Queues the write on a single background thread, so callers never block
+        on disk. on_done(changed) runs on that thread once the file is in place.
+        Errors surface from flush().
+        """
+        def task() -> bool:
+            changed = self.write(relative_path, content)
+            if on_done is not None:
+                on_done(changed)
+            return changed
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="output-writer")
+            future = self._executor.submit(task)
+            self._pending.append(future)
+        return future
+
+    def flush(self):
+        """Waits for queued writes; re-raises the first failure."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        errors = [f.exception() for f in pending]
+        errors = [e for e in errors if e is not None]
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                executor, self._executor = self._executor, None
+            if executor is not None:
+                executor.shutdown(wait=True)
@@ -0,0 +1,183 @@
+import re
+from typing import List, Optional, Tuple
+
+# Line-range edit protocol the fixer asks for in patch mode:
+#   @@ REPLACE 12-14      (or @@ REPLACE 12)
+#   <new lines>
+#   @@ END
+#   @@ INSERT AFTER 3
+#   <new lines>
+#   @@ END
+#   @@ DELETE 20-21       (or @@ DELETE 20; @@ END optional)
+_DIRECTIVE = re.compile(r"^\s*@@ (?:(REPLACE|DELETE) (\d+)(?:\s*-\s*(\d+))?|INSERT AFTER (\d+))\s*$")
+_END = re.compile(r"^\s*@@ END\s*$")
+_HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_NUMBERED = re.compile(r"^\s*\d+\| ?")
+_ERROR_LINES = re.compile(r"^Lines? ([\d, ]+):")
+
+# An edit replaces original lines start..end (1-based, inclusive); start == end + 1 is a pure insert
+Edit = Tuple[int, int, List[str]]
+
+
+class PatchError(ValueError):
+    pass
+
+
+def error_lines(error_msgs: List[str]) -> List[int]:
+    """Line numbers mentioned by deduped fixer messages ("Line 3: ...", "Lines 3, 9: ...")."""
+    lines = set()
+    for msg in error_msgs:
+        match = _ERROR_LINES.match(msg)
+        if match:
+            lines.update(int(n) for n in re.findall(r"\d+", match.group(1)))
+    return sorted(lines)
+
+
+def numbered_excerpt(code: str, lines: List[int], context: int = 25, full_below: int = 300) -> str:
+    """
+    The code with line numbers: all of it for small files, otherwise the
+    package/import header plus a window around each error line.
+    """
+    source = code.splitlines()
+    if len(source) <= full_below or not lines:
+        keep = set(range(1, len(source) + 1))
+    else:
+        header_end = next((i for i, line in enumerate(source, 1)
+                           if re.search(r"\b(class|interface|enum|record)\s+\w+", line)), 1)
+        keep = set(range(1, header_end + 1))
+        for line in lines:
+            keep.update(range(max(1, line - context), min(len(source), line + context) + 1))
+
+    out, previous = [], 0
+    for n in sorted(keep):
+        if n != previous + 1:
+            out.append("  ...")
+        out.append(f"{n:>5}| {source[n - 1]}")
+        previous = n
+    if previous < len(source):
+        out.append("  ...")
+    return "\n".join(out)
+
+
+def _strip_numbers(lines: List[str]) -> List[str]:
+    # Models sometimes echo the "  12| " prefixes back
+    if lines and all(_NUMBERED.match(line) or not line.strip() for line in lines):
+        return [_NUMBERED.sub("", line, count=1) for line in lines]
+    return lines
+
+
+def parse_line_edits(response: str) -> List[Edit]:
+    edits = []
+    lines = response.splitlines()
+    i = 0
+    while i < len(lines):
+        match = _DIRECTIVE.match(lines[i])
+        i += 1
+        if not match:
+            continue
+        body = []
+        while i < len(lines) and not _END.match(lines[i]) and not _DIRECTIVE.match(lines[i]):
+            body.append(lines[i])
+            i += 1
+        if i < len(lines) and _END.match(lines[i]):
+            i += 1
+        elif match.group(1) != "DELETE":
+            raise PatchError(f"Unterminated edit: {match.group(0).strip()}")
+
+        if match.group(4):
+            after = int(match.group(4))
+            edits.append((after + 1, after, _strip_numbers(body)))
+            continue
+        start = int(match.group(2))
+        end = int(match.group(3) or start)
+        if end < start:
+            raise PatchError(f"Bad range {start}-{end}")
+        if match.group(1) == "DELETE":
+            if any(line.strip() for line in body):
+                raise PatchError(f"DELETE {start}-{end} has a body")
+            edits.append((start, end, []))
+        else:
+            edits.append((start, end, _strip_numbers(body)))
+    return edits
+
+
+def parse_unified_diff(code: str, diff: str, fuzz: int = 30) -> List[Edit]:
+    """
+    Hunks of a unified diff as edits. Each hunk's context/removed lines must
+    match the original (ignoring trailing whitespace) at its stated position
+    or within `fuzz` lines of it.
+    """
+    source = [line.rstrip() for line in code.splitlines()]
+    edits = []
+    lines = diff.splitlines()
+    i = 0
+    while i < len(lines):
+        header = _HUNK.match(lines[i])
+        i += 1
+        if not header:
+            continue
+        old, new = [], []
+        while i < len(lines) and not _HUNK.match(lines[i]) and not lines[i].startswith(("--- ", "+++ ", "diff ")):
+            line = lines[i]
+            i += 1
+            if line.startswith("\\"):
+                continue  # "\ No newline at end of file"
+            tag, text = (line[:1], line[1:]) if line else (" ", "")
+            if tag in (" ", "-"):
+                old.append(text.rstrip())
+            if tag in (" ", "+"):
+                new.append(text)
+            if tag not in (" ", "-", "+"):
+                raise PatchError(f"Unexpected diff line: {line!r}")
+
+        stated = int(header.group(1)) - (1 if old else 0)
+        position = None
+        for offset in sorted(range(-fuzz, fuzz + 1), key=abs):
+            candidate = stated + offset
+            if 0 <= candidate <= len(source) - len(old) and source[candidate:candidate + len(old)] == old:
+                position = candidate
+                break
+        if position is None:
+            raise PatchError(f"Hunk at line {header.group(1)} does not match the file")
+        edits.append((position + 1, position + len(old), new))
+    return edits
+
+
+def apply_edits(code: str, edits: List[Edit]) -> str:
+    if not edits:
+        raise PatchError("No edits in response")
+    source = code.splitlines()
+    ordered = sorted(edits, key=lambda e: (e[0], e[1]))
+    last_end = 0
+    for start, end, _ in ordered:
+        if start < 1 or end > len(source) or start > end + 1:
+            raise PatchError(f"Edit {start}-{end} outside the file ({len(source)} lines)")
+        if start <= last_end:
+            raise PatchError(f"Overlapping edits around line {start}")
+        last_end = max(last_end, end)
+    # Bottom-up so earlier line numbers stay valid
+    for start, end, replacement in reversed(ordered):
+        source[start - 1:end] = replacement
+    return "\n".join(source) + ("\n" if code.endswith("\n") else "")
+
+
+def apply_patch_response(code: str, response: str) -> str:
+    """Applies either protocol; raises PatchError when nothing applies cleanly."""
+    if re.search(r"^@@ -\d", response, re.M):
+        return apply_edits(code, parse_unified_diff(code, response))
+    return apply_edits(code, parse_line_edits(response))
+
+
+def validate_patch(original: str, patched: str, type_name: Optional[str] = None) -> Optional[str]:
+    """Reason the patched file is unusable, or None. Cheap checks, not a compiler."""
+    if not patched.strip():
+        return "empty result"
+    package = re.search(r"^\s*package\s+[\w.]+\s*;", original, re.M)
+    if package and package.group(0).strip() not in patched:
+        return "package declaration changed or removed"
+    if type_name and re.search(rf"\b(class|interface|enum|record)\s+{re.escape(type_name)}\b", original) \
+            and not re.search(rf"\b(class|interface|enum|record)\s+{re.escape(type_name)}\b", patched):
+        return f"type {type_name} no longer declared"
+    if patched.count("{") != patched.count("}") and original.count("{") == original.count("}"):
+        return "unbalanced braces"
+    return None
@@ -0,0 +1,216 @@
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .chunking import PartialClasses
+from .engine import TranslationEngine
+from .fixer import FixerAgent
+from .journal import MigrationJournal
+from .llm_client import LLMClient
+from .manifest import ManifestTracker, hash_content
+from .models import FileMapping, JournalRecord, MigrationPlan
+from .nuget import DependencyResolver
+from .planner import MigrationPlanner
+from .scaffolder import ProjectScaffolder
+from .scanner import ProjectScanner
+from .telemetry import profiler
+from .translator import CodeTranslator
+
+# The analyze/migrate/fix pipelines behind the CLI, the solution workers and
+# the migration service. on_progress(stage, done, total) reports where a run
+# is; on_message(text) gets the run's notes, in rich markup.
+
+ProgressCallback = Callable[[str, int, int], None]
+MessageCallback = Callable[[str], None]
+
+
+def _noop(stage: str, done: int, total: int):
+    pass
+
+
+def _quiet(text: str):
+    pass
+
+
+def _scan(input_dir: str, settings: Dict[str, Any], exclude: List[str] = None) -> dict:
+    scanner = ProjectScanner(input_dir, max_file_bytes=settings.get("max_file_mb", 5) * 1024 * 1024, exclude=exclude)
+    return scanner.scan(lazy=True, index_symbols=True)
+
+
+def _planner(llm: LLMClient, settings: Dict[str, Any], on_message: MessageCallback) -> MigrationPlanner:
+    return MigrationPlanner(llm, shard_size=settings.get("shard_size", 40), workers=settings.get("workers", 8),
+                            resolver=DependencyResolver.from_file(settings.get("nuget_map")), on_message=on_message)
+
+
+def plan_project(llm: LLMClient, input_dir: str, settings: Dict[str, Any], exclude: List[str] = None,
+                 on_progress: ProgressCallback = _noop,
+                 on_message: MessageCallback = _quiet) -> Tuple[dict, MigrationPlan]:
+    """Scan + plan. Returns (scan_result, plan)."""
+    on_progress("scan", 0, 1)
+    scan_result = _scan(input_dir, settings, exclude)
+    on_progress("plan", 0, 1)
+    return scan_result, _planner(llm, settings, on_message).create_plan(scan_result)
+
+
+def migrate_project(llm: LLMClient, input_dir: str, output_dir: str, settings: Dict[str, Any],
+                    exclude: List[str] = None, plan_overrides: Optional[Dict[str, str]] = None,
+                    references: List[Dict[str, Any]] = (), pom_options: Optional[Dict[str, Any]] = None,
+                    on_progress: ProgressCallback = _noop, on_message: MessageCallback = _quiet) -> Dict[str, Any]:
+    """
+    scan -> plan -> translate -> write for one project, incremental through
+    the output manifest and resumable through the journal (settings["resume"]).
+    `references` are other projects ({name, input_dir, file_mappings}) whose
+    types this one may use; `pom_options` go to ProjectScaffolder.generate_pom.
+    """
+    # 1. Scan
+    on_progress("scan", 0, 1)
+    with profiler.timer("migrate.scan"):
+        scan_result = _scan(input_dir, settings, exclude)
+    too_large = scan_result["structure"]["skipped"]["too_large"]
+    if too_large:
+        on_message(f"[yellow]Skipped {len(too_large)} file(s) over {settings.get('max_file_mb', 5)} MB: "
+                   f"{', '.join(too_large[:5])}[/yellow]")
+
+    # 2. Plan, or the journaled one when resuming
+    journal = MigrationJournal(output_dir)
+    resume = settings.get("resume", False)
+    plan = journal.load_plan(input_dir) if resume else None
+    if resume and plan is None:
+        on_message("[yellow]No usable journal to resume from, starting a fresh run.[/yellow]")
+    if plan is not None:
+        completed = journal.completed()
+        on_message(f"[blue]Resuming: reusing saved plan, {len(completed)} file(s) already done.[/blue]")
+    else:
+        on_progress("plan", 0, 1)
+        with profiler.timer("migrate.plan"):
+            plan = _planner(llm, settings, on_message).create_plan(scan_result)
+        for key, value in (plan_overrides or {}).items():
+            setattr(plan, key, value)
+        # Checkpoint the plan before paying for any translation
+        journal.start(input_dir, plan)
+        completed = {}
+    on_message(f"[blue]Plan generated: {plan.project_name} -> {plan.artifact_id}[/blue]")
+    symbols = scan_result["symbols"]
+
+    # Types of referenced projects, mapped to the Java packages they were migrated to
+    external = {}
+    for reference in references:
+        for mapping in reference["file_mappings"]:
+            key = f"{reference['name']}:{mapping['source_file']}"
+            source = Path(reference["input_dir"]) / mapping["source_file"]
+            try:
+                symbols.add_file(key, source.read_text(encoding="utf-8-sig", errors="replace"))
+            except OSError:
+                continue
+            external[key] = FileMapping(**{**mapping, "source_file": key})
+
+    # 3. Scaffold
+    scaffolder = ProjectScaffolder(output_dir)
+    scaffolder.create_structure(plan)
+
+    # 4. Translate
+    translator = CodeTranslator(llm, symbol_index=symbols, fast_path=settings.get("fast_path", True),
+                                external_mappings=external, chunk_chars=settings.get("chunk_chars", 20000))
+    engine = TranslationEngine(translator, workers=settings.get("workers", 8), batch_size=settings.get("batch_size", 1))
+    manifest = ManifestTracker(output_dir)
+
+    contents = scan_result["contents"]
+    partials = PartialClasses(symbols, contents, [m.source_file for m in plan.file_mappings])
+    if partials.groups:
+        on_message(f"[blue]{len(partials.groups)} partial class(es) spread over "
+                   f"{len(partials.groups) + len(partials.secondary)} files, each migrated as one Java class.[/blue]")
+    jobs, source_hashes, unchanged, resumed = [], {}, 0, 0
+    for mapping in plan.file_mappings:
+        if mapping.source_file in partials.secondary:
+            continue
+        if not contents.get(mapping.source_file):
+            on_message(f"[red]Warning: Could not find content for {mapping.source_file}[/red]")
+            continue
+        # Keep only the hash; contents are re-read lazily by the translation workers
+        source_hash = hash_content(partials.source(mapping.source_file))
+        if not settings.get("full") and manifest.is_up_to_date(mapping, source_hash):
+            unchanged += 1
+            continue
+        if journal.is_done(completed, mapping, source_hash):
+            manifest.record_hash(mapping, source_hash, completed[mapping.source_file].java_hash)
+            resumed += 1
+            continue
+        source_hashes[mapping.source_file] = source_hash
+        jobs.append(mapping)
+
+    # Dependencies first (models before the controllers using them)
+    by_source = {m.source_file: m for m in jobs}
+    jobs = [by_source[path] for path in symbols.dependency_order(list(by_source))]
+
+    if unchanged:
+        on_message(f"[blue]{unchanged} file(s) unchanged since last run, {len(jobs)} to translate.[/blue]")
+    if resumed:
+        on_message(f"[blue]{resumed} file(s) finished before the interruption, {len(jobs)} to translate.[/blue]")
+    for target in manifest.remove_stale(plan.file_mappings):
+        on_message(f"[yellow]Removed stale output {target}[/yellow]")
+
+    profiler.count("migrate.files_unchanged", unchanged)
+    profiler.count("migrate.files_resumed", resumed)
+    profiler.count("migrate.files_to_translate", len(jobs))
+
+    failed = []
+    done = 0
+    on_progress("translate", 0, len(jobs))
+
+    def on_complete(result):
+        # Progress counts files as they finish, in any order
+        nonlocal done
+        done += 1
+        on_progress("translate", done, len(jobs))
+
+    # Results come back in dependency order (the order of jobs), so writes stay sequential and deterministic
+    with profiler.timer("migrate.translate"):
+        try:
+            for result in engine.run(jobs, lambda m: partials.source(m.source_file), plan, on_complete=on_complete,
+                                     size_of=lambda m: partials.size(m.source_file)):
+                if result.error:
+                    on_message(f"[red]Failed to translate {result.mapping.source_file}: {result.error}[/red]")
+                    failed.append(result.mapping.source_file)
+                    continue
+                source_hash = source_hashes[result.mapping.source_file]
+                java_hash = hash_content(result.java_code)
+                # Journal only once the file is on disk (the writer calls back from its thread)
+                record = JournalRecord(source_file=result.mapping.source_file, source_hash=source_hash,
+                                       target_path=result.mapping.target_path, java_hash=java_hash)
+                scaffolder.write_file_async(result.mapping.target_path, result.java_code,
+                                            on_done=lambda changed, record=record: journal.append(record))
+                manifest.record_hash(result.mapping, source_hash, java_hash)
+        finally:
+            scaffolder.flush()
+            journal.close()
+    manifest.save()
+    if failed:
+        profiler.count("migrate.files_failed", len(failed))
+
+    # 5. Metadata
+    on_progress("write", 0, 1)
+    scaffolder.write_file("pom.xml", scaffolder.generate_pom(plan, **(pom_options or {})))
+    scaffolder.write_file("src/main/resources/application.properties",
+                          scaffolder.generate_application_properties(plan))
+    # Failed files keep the journal so --resume can retry just those
+    if not failed:
+        journal.finish()
+
+    return {
+        "plan": plan.model_dump(),
+        "translated": len(jobs) - len(failed),
+        "unchanged": unchanged,
+        "resumed": resumed,
+        "failed": failed,
+        "fast_path": translator.fast_path_files,
+        "llm": translator.llm_files,
+        "written": scaffolder.output.written,
+        "unchanged_on_disk": scaffolder.output.unchanged,
+    }
+
+
+def fix_project(llm: LLMClient, project_dir: str, settings: Dict[str, Any],
+                on_progress: ProgressCallback = _noop) -> Dict[str, Any]:
+    on_progress("fix", 0, 1)
+    agent = FixerAgent(project_dir, llm, fast=settings.get("fast", True), workers=settings.get("workers", 8),
+                       max_build_errors=settings.get("max_build_errors"), patch=settings.get("patch", True))
+    succeeded = agent.auto_heal(max_retries=settings.get("retries", 3))
+    return {"succeeded": succeeded}
@@ -1,35 +1,170 @@
 import json
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePath
+from typing import Callable, Dict, List, Optional, Set
+from .fastpath import JAVA_KEYWORDS
 from .llm_client import LLMClient
-from .models import MigrationPlan
+from .models import CsprojInfo, MigrationPlan, PlanSkeleton, FileMapping, FileMappingBatch, PackageReference
+from .nuget import DependencyResolver, merge_dependencies, parse_csproj
+from .resilience import classify_error
 from .scanner import ProjectScanner
+from .telemetry import profiler
+from rich.console import Console
+
+console = Console()
+
+SYSTEM_INSTRUCTION = "You are a Senior Architect specializing in .NET to Java migrations. You output strictly JSON."
+
+def _strip_json_fence(response_text: str) -> str:
+    # Strip markdown if present
+    response_text = response_text.strip()
+    if response_text.startswith("```json"):
+        response_text = response_text.split("```json")[1].split("```")[0]
+    elif response_text.startswith("```"):
+        response_text = response_text.split("```")[1].split("```")[0]
+    return response_text
+
+
+def _parses_as(model):
+    """Cache validator: the response parses as `model`."""
+    def validate(response_text: str) -> bool:
+        try:
+            model.model_validate_json(_strip_json_fence(response_text))
+        except ValueError:
+            return False
+        return True
+    return validate
+
+def planning_inputs(scan_result: dict) -> Dict[str, str]:
+    """The files planning looks at: .csproj, Program.cs, Startup.cs and appsettings.json."""
+    # Only these are read, contents may be loaded lazily
+    important = {}
+    contents = scan_result['contents']
+    for path in contents:
+        if path.endswith('.csproj') or path.endswith('Program.cs') or path.endswith('Startup.cs') or path.endswith('appsettings.json'):
+            important[path] = contents[path]
+    return important
+
+
+def summarize_projects(important_files: Dict[str, str], projects: List[CsprojInfo],
+                       unmapped: List[PackageReference]) -> Dict[str, str]:
+    """Planning inputs with raw .csproj XML replaced by the facts the model still needs."""
+    unmapped_names = {p.name for p in unmapped}
+    summarized = dict(important_files)
+    for project in projects:
+        summarized[project.path] = json.dumps({
+            "sdk": project.sdk,
+            "target_frameworks": project.target_frameworks,
+            "project_references": project.project_references,
+            "unmapped_packages": [
+                f"{p.name} {p.version}" if p.version else p.name
+                for p in project.package_references if p.name in unmapped_names
+            ],
+        })
+    return summarized
+
+
+def shard_by_directory(cs_files: List[str], shard_size: int) -> List[List[str]]:
+    """
+    Packs whole directories into shards of at most `shard_size` files, so
+    files that share a namespace are usually mapped by the same call.
+    """
+    by_dir = defaultdict(list)
+    for path in cs_files:
+        by_dir[str(PurePath(path).parent)].append(path)
+
+    shards = []
+    current = []
+    for directory in sorted(by_dir):
+        files = by_dir[directory]
+        if current and len(current) + len(files) > shard_size:
+            shards.append(current)
+            current = []
+        for i in range(0, len(files), shard_size):
+            chunk = files[i:i + shard_size]
+            if len(chunk) == shard_size:
+                shards.append(chunk)
+            else:
+                current.extend(chunk)
+    if current:
+        shards.append(current)
+    return shards
+
+
+def _package_segment(part: str) -> str:
+    # Java's own advice for names that can't be packages: prefix digits, suffix keywords
+    segment = re.sub(r"[^a-z0-9_]", "", part.lower())
+    if segment[:1].isdigit():
+        segment = "_" + segment
+    if segment in JAVA_KEYWORDS:
+        segment += "_"
+    return segment
+
+
+def default_mapping(source_file: str, base_package: str) -> FileMapping:
+    """Mapping derived from the source directory, for files the model didn't map."""
+    source = PurePath(source_file)
+    sub_packages = [_package_segment(part) for part in source.parent.parts]
+    package_name = ".".join([base_package] + [p for p in sub_packages if p])
+    return FileMapping(
+        source_file=source_file,
+        target_path=f"src/main/java/{package_name.replace('.', '/')}/{source.stem}.java",
+        package_name=package_name,
+    )
+
 
 class MigrationPlanner:
-    def __init__(self, llm_client: LLMClient):
+    """
+    Small projects are planned in one call. Once there are more .cs files than
+    `shard_size`, planning is split: one global call decides dependencies and
+    properties, then per-directory shards produce file mappings in parallel.
+    NuGet packages with a known Maven equivalent are resolved locally; the
+    model only sees the .csproj facts and the packages left unmapped.
+    """
+    def __init__(self, llm_client: LLMClient, shard_size: int = 40, workers: int = 8,
+                 resolver: DependencyResolver = None, on_message: Optional[Callable[[str], None]] = None):
         self.llm = llm_client
+        self.shard_size = max(1, shard_size)
+        self.workers = max(1, workers)
+        self.resolver = resolver or DependencyResolver()
+        # Where planning notes go (rich markup); the console unless the caller collects them
+        self.on_message = on_message or console.print
 
+    @profiler.timed("planner.create_plan")
     def create_plan(self, scan_result: dict) -> MigrationPlan:
-        # 1. Prepare context
-        # We focus on project files to determine dependencies and structure
-        important_files = {}
-        for path, content in scan_result['contents'].items():
-            # CSPROJ, Program, Startup are critical for planning
-            if path.endswith('.csproj') or path.endswith('Program.cs') or path.endswith('Startup.cs') or path.endswith('appsettings.json'):
-                important_files[path] = content
-        
+        important_files = planning_inputs(scan_result)
+        projects = [parse_csproj(path, content) for path, content in important_files.items() if path.endswith('.csproj')]
+        resolved, unmapped = self.resolver.resolve(projects)
+        profiler.count("planner.packages_mapped_locally", sum(len(p.package_references) for p in projects) - len(unmapped))
+        profiler.count("planner.packages_unmapped", len(unmapped))
+        important_files = summarize_projects(important_files, projects, unmapped)
+
         # files_list for structure mapping
         file_list = scan_result['structure']['files']
+        cs_files = [f for f in file_list if f.endswith('.cs')]
+
+        if len(cs_files) <= self.shard_size:
+            plan = self._create_single_plan(important_files, file_list)
+        else:
+            plan = self._create_sharded_plan(important_files, file_list, cs_files)
+        plan.dependencies = merge_dependencies(resolved, plan.dependencies)
+        return plan
 
+    def _create_single_plan(self, important_files: Dict[str, str], file_list: List[str]) -> MigrationPlan:
         prompt = f"""
         Analyze this .NET Core project and create a precise migration plan to a Spring Boot Java application.
         
         Input Files:
-        {json.dumps(important_files, indent=2)}
+        {json.dumps(important_files)}
         
         All File Paths:
-        {json.dumps(file_list, indent=2)}
+        {json.dumps(file_list)}
         
         Goal:
-        1. Identify equivalent Maven dependencies for the NuGet packages.
+        1. Identify equivalent Maven dependencies for the NuGet packages listed under "unmapped_packages" only
+           (all other packages are already mapped; return an empty list if there are none).
         2. Map every .cs file to a corresponding Java path following standard Maven layout (src/main/java/com/example/...).
         3. Extract configuration from appsettings.json to application.properties key-values.
         
@@ -51,15 +186,141 @@ class MigrationPlanner:
         }}
         """
 
-        system_instruction = "You are a Senior Architect specializing in .NET to Java migrations. You output strictly JSON."
+        # Call LLM (architecture decisions always go to the pro model)
+        response_text = self.llm.generate(prompt, SYSTEM_INSTRUCTION, tier="pro", validate=_parses_as(MigrationPlan))
+        return MigrationPlan.model_validate_json(_strip_json_fence(response_text))
+
+    def _create_sharded_plan(self, important_files: Dict[str, str], file_list: List[str], cs_files: List[str]) -> MigrationPlan:
+        skeleton = self._plan_skeleton(important_files, file_list)
+
+        shards = shard_by_directory(cs_files, self.shard_size)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="plan") as pool:
+            batches = list(pool.map(lambda shard: self._map_shard(skeleton, shard), shards))
+
+        file_mappings = self._merge_mappings(cs_files, batches, skeleton.base_package)
+        return MigrationPlan(
+            **skeleton.model_dump(exclude={"base_package"}),
+            file_mappings=file_mappings,
+        )
+
+    def _plan_skeleton(self, important_files: Dict[str, str], file_list: List[str]) -> PlanSkeleton:
+        # The global call only needs the shape of the tree, not every path
+        dir_counts = defaultdict(int)
+        for path in file_list:
+            if path.endswith('.cs'):
+                dir_counts[str(PurePath(path).parent)] += 1
+
+        prompt = f"""
+        Analyze this .NET Core project and decide the project-wide settings for a Spring Boot Java migration.
+        File mappings are NOT needed here, they are produced separately.
+        
+        Input Files:
+        {json.dumps(important_files)}
+        
+        Source directories (.cs file count per directory):
+        {json.dumps(dict(sorted(dir_counts.items())))}
+        
+        Goal:
+        1. Identify equivalent Maven dependencies for the NuGet packages listed under "unmapped_packages" only
+           (all other packages are already mapped; return an empty list if there are none).
+        2. Choose the root Java package all classes will live under.
+        3. Extract configuration from appsettings.json to application.properties key-values.
+        
+        Output:
+        Return ONLY valid JSON that matches the following schema:
+        {{
+            "project_name": "...",
+            "group_id": "com.example",
+            "artifact_id": "migrated-app",
+            "java_version": "17",
+            "spring_boot_version": "3.2.0",
+            "base_package": "com.example.migratedapp",
+            "dependencies": [
+                {{"group_id": "...", "artifact_id": "...", "version": "..."}}
+            ],
+            "application_properties": {{ "key": "value" }}
+        }}
+        """
+
+        response_text = self.llm.generate(prompt, SYSTEM_INSTRUCTION, tier="pro", validate=_parses_as(PlanSkeleton))
+        return PlanSkeleton.model_validate_json(_strip_json_fence(response_text))
 
-        # Call LLM
-        response_text = self.llm.generate(prompt, system_instruction)
+    @profiler.timed("planner.map_shard")
+    def _map_shard(self, skeleton: PlanSkeleton, shard: List[str]) -> List[FileMapping]:
+        prompt = f"""
+        Map the following C# files of the .NET project "{skeleton.project_name}" to Java paths for a Spring Boot application.
+        
+        Root package: {skeleton.base_package}
+        
+        Files:
+        {json.dumps(shard)}
+        
+        Rules:
+        1. Follow standard Maven layout: src/main/java/<package path>/<ClassName>.java.
+        2. Every package must start with `{skeleton.base_package}` and mirror the logical structure (controller, model, service...).
+        3. Map every file listed above exactly once.
         
-        # Strip markdown if present
-        if response_text.startswith("```json"):
-            response_text = response_text.split("```json")[1].split("```")[0]
-        elif response_text.startswith("```"):
-             response_text = response_text.split("```")[1].split("```")[0]
+        Output:
+        Return ONLY valid JSON that matches the following schema:
+        {{
+            "file_mappings": [
+                {{"source_file": "...", "target_path": "...", "package_name": "..."}}
+            ]
+        }}
+        """
+
+        # A bad answer or a call that kept failing must not sink the whole plan: the
+        # shard's files get default mappings on merge. Anything else (auth,
+        # permissions, bad model name) would fail every shard, so it fails the run.
+        try:
+            response_text = self.llm.generate(prompt, SYSTEM_INSTRUCTION, validate=_parses_as(FileMappingBatch))
+            return FileMappingBatch.model_validate_json(_strip_json_fence(response_text)).file_mappings
+        except Exception as e:
+            if not isinstance(e, ValueError) and classify_error(e) == "fatal":
+                raise
+            profiler.count("planner.shard_failures")
+            self.on_message(f"[yellow]Mapping shard of {len(shard)} file(s) failed ({type(e).__name__}: {e}); "
+                            f"using directory-based packages for them.[/yellow]")
+            return []
+
+    def _merge_mappings(self, cs_files: List[str], batches: List[List[FileMapping]], base_package: str) -> List[FileMapping]:
+        """
+        Merges shard outputs into one list in source order. Mappings for unknown
+        or duplicate sources are dropped, and sources no shard mapped fall back
+        to a package derived from their directory. So do sources whose target
+        an earlier source already claimed, since one would overwrite the other.
+        """
+        known = set(cs_files)
+        by_source = {}
+        for batch in batches:
+            for mapping in batch:
+                if mapping.source_file in known and mapping.source_file not in by_source:
+                    by_source[mapping.source_file] = mapping
+
+        merged, targets = [], set()
+        for path in cs_files:
+            mapping = by_source.get(path)
+            if mapping is not None and mapping.target_path in targets:
+                profiler.count("planner.target_collisions")
+                self.on_message(f"[yellow]{path} was mapped to {mapping.target_path}, which another file already "
+                                f"uses; using its directory-based package instead.[/yellow]")
+                mapping = None
+            mapping = mapping or self._unique_default(path, base_package, targets)
+            targets.add(mapping.target_path)
+            merged.append(mapping)
+        return merged
 
-        return MigrationPlan.model_validate_json(response_text)
+    @staticmethod
+    def _unique_default(source_file: str, base_package: str, targets: Set[str]) -> FileMapping:
+        # Directories that differ only in dropped characters ("Api-V1", "ApiV1") share a package
+        base = mapping = default_mapping(source_file, base_package)
+        n = 2
+        while mapping.target_path in targets:
+            package_name = f"{base.package_name}{n}"
+            mapping = FileMapping(
+                source_file=source_file,
+                target_path=f"src/main/java/{package_name.replace('.', '/')}/{PurePath(source_file).stem}.java",
+                package_name=package_name,
+            )
+            n += 1
+        return mapping
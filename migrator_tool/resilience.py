@@ -0,0 +1,122 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Optional
+from .telemetry import percentile_of
+
+# Retry/throttle building blocks for LLMClient. Errors are classified by name
+# and status code so google.api_core doesn't have to be imported here.
+
+THROTTLE_ERRORS = {"ResourceExhausted", "TooManyRequests"}
+TRANSIENT_ERRORS = {
+    "ServiceUnavailable", "InternalServerError", "BadGateway", "GatewayTimeout", "DeadlineExceeded",
+    "Aborted", "Unknown", "RetryError",
+}
+
+
+class LLMTimeoutError(TimeoutError):
+    """A call passed its per-call deadline."""
+
+
+def classify_error(error: BaseException) -> str:
+    """"throttle" (quota / 429), "transient" (5xx, timeouts, dropped connections) or "fatal"."""
+    code = getattr(error, "code", None)
+    code = getattr(code, "value", code)  # grpc StatusCode enums carry (number, name)
+    if isinstance(code, tuple):
+        code = code[0]
+    name = type(error).__name__
+    if name in THROTTLE_ERRORS or code == 429:
+        return "throttle"
+    if name in TRANSIENT_ERRORS or isinstance(error, (TimeoutError, ConnectionError)):
+        return "transient"
+    if isinstance(code, int) and 500 <= code < 600:
+        return "transient"
+    return "fatal"
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket shared by every thread using one client, with an AIMD send
+    rate: each success adds about `increase` requests/s per second of traffic,
+    a quota error multiplies the rate by `decrease`. Decreases within
+    `cooldown` seconds of the last one are ignored, so a burst of 429s from
+    requests already on the wire only backs off once.
+    """
+    def __init__(self, rate: float = 10.0, min_rate: float = 0.2, max_rate: float = 100.0,
+                 increase: float = 1.0, decrease: float = 0.5, cooldown: float = 2.0):
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, rate)
+        self.rate = max(min_rate, rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        # Burst capacity is one second's worth of requests
+        self._tokens = min(max(1.0, self.rate), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def on_throttle(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._tokens = min(self._tokens, 0.0)
+            self._last_decrease = now
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: attempt n sleeps uniform(0, min(max_delay, base_delay * 2**n))."""
+    def __init__(self, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 30.0,
+                 seed: Optional[int] = None):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self, attempt: int) -> float:
+        with self._lock:
+            return self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class LatencyTracker:
+    """Recent successful call latencies per model, for the hedging threshold."""
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def observe(self, model_name: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(model_name, deque(maxlen=self.window)).append(seconds)
+
+    def threshold(self, model_name: str, percentile: float) -> Optional[float]:
+        """The model's latency percentile, or None until enough calls have been seen."""
+        with self._lock:
+            samples = sorted(self._samples.get(model_name, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return percentile_of(samples, percentile)
@@ -0,0 +1,40 @@
+import re
+
+DEFAULT_FAST_MODEL = "gemini-2.5-flash"
+DEFAULT_PRO_MODEL = "gemini-2.5-pro"
+
+# Constructs that tend to trip up the fast model when porting C# to Java
+_COMPLEX_CONSTRUCTS = re.compile(
+    r'\basync\b|\bawait\b|\byield\b|\bdelegate\b|\bevent\b|\bunsafe\b|\bdynamic\b|\block\s*\('
+    r'|\boperator\b|\bwhere\s+\w+\s*:|\.(?:Select|Where|GroupBy|Join|Aggregate|SelectMany)\('
+    r'|\bTask<|\bExpression<|=>'
+)
+
+
+class ModelRouter:
+    """
+    Chooses between a fast, cheap model and the pro model, following the
+    design doc's cost plan: simple inputs (POCOs, DTOs, short fixer prompts)
+    go to the fast model, large or construct-heavy ones escalate to pro.
+    """
+    def __init__(self, fast_model: str = DEFAULT_FAST_MODEL, pro_model: str = DEFAULT_PRO_MODEL,
+                 max_fast_chars: int = 12000, max_fast_score: int = 8):
+        self.fast_model = fast_model
+        self.pro_model = pro_model
+        self.max_fast_chars = max_fast_chars
+        self.max_fast_score = max_fast_score
+
+    def complexity(self, prompt: str) -> int:
+        return len(_COMPLEX_CONSTRUCTS.findall(prompt))
+
+    def choose(self, prompt: str, tier: str = "auto") -> str:
+        """
+        tier is "fast", "pro" or "auto" (decide from size and complexity).
+        """
+        if tier == "pro":
+            return self.pro_model
+        if tier == "fast":
+            return self.fast_model
+        if len(prompt) > self.max_fast_chars or self.complexity(prompt) > self.max_fast_score:
+            return self.pro_model
+        return self.fast_model
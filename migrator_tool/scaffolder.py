@@ -1,10 +1,14 @@
 import os
 from pathlib import Path
-from .models import MigrationPlan
+from typing import Callable, List, Optional
+from .models import MavenDependency, MigrationPlan
+from .output import OutputWriter
+from .telemetry import profiler
 
 class ProjectScaffolder:
     def __init__(self, output_dir: str):
         self.output_dir = Path(output_dir).resolve()
+        self.output = OutputWriter(self.output_dir)
 
     def create_structure(self, plan: MigrationPlan):
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -13,28 +17,43 @@ class ProjectScaffolder:
         (self.output_dir / "src/main/resources").mkdir(parents=True, exist_ok=True)
         (self.output_dir / "src/test/java").mkdir(parents=True, exist_ok=True)
 
-    def write_file(self, relative_path: str, content: str):
-        full_path = self.output_dir / relative_path
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(full_path, "w") as f:
-            f.write(content)
+    @profiler.timed("scaffolder.write_file")
+    def write_file(self, relative_path: str, content: str) -> bool:
+        """Atomic and skipped when the content is unchanged. True if the file changed."""
+        return self.output.write(relative_path, content)
 
-    def generate_pom(self, plan: MigrationPlan) -> str:
+    def write_file_async(self, relative_path: str, content: str, on_done: Optional[Callable[[bool], None]] = None):
+        """Like write_file but on the background writer; call flush() before relying on the result."""
+        return self.output.submit(relative_path, content, on_done)
+
+    def flush(self):
+        self.output.flush()
+
+    def _dependency_xml(self, dependencies: List[MavenDependency]) -> str:
         deps = ""
-        for d in plan.dependencies:
+        for d in dependencies:
+            # No version (or "managed") means the Spring Boot parent manages it
+            version = f"\n            <version>{d.version}</version>" if d.version and d.version != "managed" else ""
+            scope = f"\n            <scope>{d.scope}</scope>" if d.scope and d.scope != "compile" else ""
             deps += f"""
         <dependency>
             <groupId>{d.group_id}</groupId>
-            <artifactId>{d.artifact_id}</artifactId>
-            <version>{d.version}</version>
+            <artifactId>{d.artifact_id}</artifactId>{version}{scope}
         </dependency>"""
+        return deps
 
-        pom_content = f"""<?xml version="1.0" encoding="UTF-8"?>
-<project xmlns="http://maven.apache.org/POM/4.0.0" 
-         xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-         xsi:schemaLocation="http://maven.apache.org/POM/4.0.0 https://maven.apache.org/xsd/maven-4.0.0.xsd">
-    <modelVersion>4.0.0</modelVersion>
-    <parent>
+    def generate_pom(self, plan: MigrationPlan, parent: Optional[MavenDependency] = None,
+                     module_dependencies: List[MavenDependency] = (), executable: bool = True) -> str:
+        """
+        Standalone Spring Boot pom, or with `parent` a module of a multi-module
+        build (versions and java.version come from the parent). Library
+        modules other modules depend on pass executable=False, as a
+        repackaged Boot jar can't be used as a dependency.
+        """
+        deps = self._dependency_xml(list(module_dependencies) + list(plan.dependencies))
+
+        if parent is None:
+            parent_xml = f"""<parent>
         <groupId>org.springframework.boot</groupId>
         <artifactId>spring-boot-starter-parent</artifactId>
         <version>{plan.spring_boot_version}</version>
@@ -42,12 +61,39 @@ class ProjectScaffolder:
     </parent>
     <groupId>{plan.group_id}</groupId>
     <artifactId>{plan.artifact_id}</artifactId>
-    <version>0.0.1-SNAPSHOT</version>
-    <name>{plan.project_name}</name>
-    <description>Migrated Project</description>
+    <version>0.0.1-SNAPSHOT</version>"""
+            properties_xml = f"""
     <properties>
         <java.version>{plan.java_version}</java.version>
-    </properties>
+    </properties>"""
+        else:
+            parent_xml = f"""<parent>
+        <groupId>{parent.group_id}</groupId>
+        <artifactId>{parent.artifact_id}</artifactId>
+        <version>{parent.version}</version>
+    </parent>
+    <artifactId>{plan.artifact_id}</artifactId>"""
+            properties_xml = ""
+
+        build_xml = """
+
+    <build>
+        <plugins>
+            <plugin>
+                <groupId>org.springframework.boot</groupId>
+                <artifactId>spring-boot-maven-plugin</artifactId>
+            </plugin>
+        </plugins>
+    </build>""" if executable else ""
+
+        pom_content = f"""<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0" 
+         xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+         xsi:schemaLocation="http://maven.apache.org/POM/4.0.0 https://maven.apache.org/xsd/maven-4.0.0.xsd">
+    <modelVersion>4.0.0</modelVersion>
+    {parent_xml}
+    <name>{plan.project_name}</name>
+    <description>Migrated Project</description>{properties_xml}
     <dependencies>
         <dependency>
             <groupId>org.springframework.boot</groupId>
@@ -64,20 +110,40 @@ class ProjectScaffolder:
             <artifactId>spring-boot-starter-test</artifactId>
             <scope>test</scope>
         </dependency>
-    </dependencies>
-
-    <build>
-        <plugins>
-            <plugin>
-                <groupId>org.springframework.boot</groupId>
-                <artifactId>spring-boot-maven-plugin</artifactId>
-            </plugin>
-        </plugins>
-    </build>
+    </dependencies>{build_xml}
 </project>
 """
         return pom_content
 
+    def generate_parent_pom(self, group_id: str, artifact_id: str, name: str, modules: List[str],
+                            spring_boot_version: str, java_version: str) -> str:
+        """Aggregator pom of a migrated solution; modules are listed in build order."""
+        modules_xml = "".join(f"\n        <module>{module}</module>" for module in modules)
+        return f"""<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0" 
+         xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+         xsi:schemaLocation="http://maven.apache.org/POM/4.0.0 https://maven.apache.org/xsd/maven-4.0.0.xsd">
+    <modelVersion>4.0.0</modelVersion>
+    <parent>
+        <groupId>org.springframework.boot</groupId>
+        <artifactId>spring-boot-starter-parent</artifactId>
+        <version>{spring_boot_version}</version>
+        <relativePath/> <!-- lookup parent from repository -->
+    </parent>
+    <groupId>{group_id}</groupId>
+    <artifactId>{artifact_id}</artifactId>
+    <version>0.0.1-SNAPSHOT</version>
+    <packaging>pom</packaging>
+    <name>{name}</name>
+    <description>Migrated Solution</description>
+    <properties>
+        <java.version>{java_version}</java.version>
+    </properties>
+    <modules>{modules_xml}
+    </modules>
+</project>
+"""
+
     def generate_application_properties(self, plan: MigrationPlan) -> str:
         props = ""
         for k, v in plan.application_properties.items():
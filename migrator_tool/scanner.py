@@ -1,56 +1,168 @@
 import os
 import json
+import mmap
+from collections.abc import Mapping
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional
 import pathspec
+from .symbols import SymbolIndex
+from .telemetry import profiler
+
+# We mainly care about .cs, .csproj, .json, .xml, .config
+TEXT_EXTENSIONS = ('.cs', '.csproj', '.json', '.xml', 'config')
+
+DEFAULT_MAX_FILE_BYTES = 5 * 1024 * 1024
+# Above this size text is decoded straight from an mmap, without a bytes copy
+MMAP_THRESHOLD = 1024 * 1024
+SNIFF_BYTES = 8192
+
+
+def _looks_binary(chunk: bytes) -> bool:
+    # Same heuristic git uses: a NUL byte in the first block means binary
+    return b"\0" in chunk
+
+
+def _decode(data) -> str:
+    # str() takes any buffer (bytes, mmap), so mapped files decode without a copy
+    try:
+        # utf-8-sig strips the BOM Visual Studio likes to add
+        return str(data, "utf-8-sig")
+    except UnicodeDecodeError:
+        # Legacy .NET sources are often cp1252; never fail on a stray byte
+        return str(data, "cp1252", errors="replace")
+
+
+@dataclass
+class FileRecord:
+    rel_path: str
+    path: Path
+    size: int
+    kind: str  # "text", "binary", "too_large" or "other" (not a source type we read)
+
+    def read_bytes(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    @property
+    def content(self) -> Optional[str]:
+        """
+        Loaded on every access and never cached, so holding records is cheap.
+        """
+        if self.kind != "text":
+            return None
+        if self.size < MMAP_THRESHOLD:
+            return _decode(self.read_bytes())
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _decode(mm)
+
+
+class LazyContents(Mapping):
+    """
+    Read-only {rel_path: content} mapping that loads each file on access.
+    Drop-in for the eager `contents` dict, but peak memory is one file.
+    """
+    def __init__(self, records: Dict[str, FileRecord]):
+        self._records = records
+
+    def __getitem__(self, rel_path: str) -> str:
+        return self._records[rel_path].content
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def record(self, rel_path: str) -> FileRecord:
+        return self._records[rel_path]
+
 
 class ProjectScanner:
-    def __init__(self, root_path: str):
+    def __init__(self, root_path: str, max_file_bytes: int = DEFAULT_MAX_FILE_BYTES, exclude: List[str] = None):
         self.root = Path(root_path).resolve()
+        self.max_file_bytes = max_file_bytes
+        # Extra gitwildmatch patterns, e.g. nested projects of a solution scanned on their own
         self.ignore_spec = pathspec.PathSpec.from_lines(
-            'gitwildmatch', 
-            ['bin/', 'obj/', '.git/', '.idea/', '.vscode/', '__pycache__/', '*.exe', '*.dll', '*.pdb']
+            'gitwildmatch',
+            ['bin/', 'obj/', '.git/', '.idea/', '.vscode/', '__pycache__/', '*.exe', '*.dll', '*.pdb'] + list(exclude or [])
         )
 
-    def scan(self) -> Dict[str, Any]:
+    def _classify(self, file_path: Path, size: int) -> str:
+        if not file_path.name.endswith(TEXT_EXTENSIONS):
+            return "other"
+        if size > self.max_file_bytes:
+            return "too_large"
+        try:
+            with open(file_path, "rb") as f:
+                chunk = f.read(SNIFF_BYTES)
+        except OSError:
+            return "binary"
+        return "binary" if _looks_binary(chunk) else "text"
+
+    def iter_files(self) -> Iterator[FileRecord]:
         """
-        Scans the project directory and returns a dictionary representation
-        of the structure and file contents.
+        Walks the project and yields one FileRecord per non-ignored file.
+        Contents are not read here, only a small sniff for binary detection.
         """
-        project_structure = {
-            "root_name": self.root.name,
-            "files": [],
-            "directories": []
-        }
-        
-        files_content = {}
-        
         for root, dirs, files in os.walk(self.root):
             # Filtering directories in-place
             rel_root = Path(root).relative_to(self.root)
             dirs[:] = [d for d in dirs if not self.ignore_spec.match_file(str(rel_root / d) + "/")]
-            
+
             for file in files:
                 file_path = Path(root) / file
                 rel_path = str(file_path.relative_to(self.root))
-                
+
                 if self.ignore_spec.match_file(rel_path):
                     continue
-                
-                project_structure["files"].append(rel_path)
-                
-                # We mainly care about .cs, .csproj, .json, .xml, .config
-                if file.endswith(('.cs', '.csproj', '.json', '.xml', 'config')):
-                    try:
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            files_content[rel_path] = f.read()
-                    except Exception:
-                        files_content[rel_path] = "<BINARY_OR_UNREADABLE>"
-
-        return {
+
+                try:
+                    size = file_path.stat().st_size
+                except OSError:
+                    continue
+                yield FileRecord(rel_path, file_path, size, self._classify(file_path, size))
+
+    @profiler.timed("scanner.scan")
+    def scan(self, lazy: bool = False, index_symbols: bool = False) -> Dict[str, Any]:
+        """
+        Scans the project directory and returns a dictionary representation
+        of the structure and file contents.
+        With lazy=True, `contents` loads files on access instead of up front.
+        With index_symbols=True, the result also carries a SymbolIndex of the .cs files.
+        """
+        project_structure = {
+            "root_name": self.root.name,
+            "files": [],
+            "directories": [],
+            "skipped": {"binary": [], "too_large": []},
+        }
+
+        records = {}
+        symbols = SymbolIndex() if index_symbols else None
+
+        for record in self.iter_files():
+            project_structure["files"].append(record.rel_path)
+            if record.kind == "text":
+                records[record.rel_path] = record
+                if symbols is not None and record.rel_path.endswith(".cs"):
+                    # Only signatures are kept, the content is dropped right after parsing
+                    symbols.add_file(record.rel_path, record.content)
+            elif record.kind in project_structure["skipped"]:
+                project_structure["skipped"][record.kind].append(record.rel_path)
+
+        if lazy:
+            files_content = LazyContents(records)
+        else:
+            files_content = {path: record.content for path, record in records.items()}
+
+        result = {
             "structure": project_structure,
             "contents": files_content
         }
+        if symbols is not None:
+            result["symbols"] = symbols
+        return result
 
 if __name__ == "__main__":
     import sys
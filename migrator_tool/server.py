@@ -0,0 +1,206 @@
+import json
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from rich.text import Text
+from .llm_client import LLMClient
+from .pipeline import fix_project, migrate_project, plan_project
+
+JOB_TYPES = ("analyze", "migrate", "fix")
+# Job parameters that are paths/settings, everything else is rejected
+REQUIRED_PARAMS = {"analyze": ["input_dir"], "migrate": ["input_dir", "output_dir"], "fix": ["project_dir"]}
+SETTINGS = {"workers", "full", "max_file_mb", "shard_size", "batch_size", "fast_path", "resume", "nuget_map",
+            "chunk_chars", "fast", "max_build_errors", "patch", "retries"}
+MAX_JOB_MESSAGES = 200
+
+
+@dataclass
+class Job:
+    id: str
+    type: str
+    params: Dict[str, Any]
+    status: str = "queued"  # queued -> running -> succeeded | failed | cancelled
+    stage: Optional[str] = None
+    done: int = 0
+    total: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    # The run's notes (skipped files, failures), newest last
+    messages: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id, "type": self.type, "params": self.params, "status": self.status,
+            "progress": {"stage": self.stage, "done": self.done, "total": self.total},
+            "result": self.result, "error": self.error, "messages": list(self.messages),
+            "created": self.created, "started": self.started, "finished": self.finished,
+        }
+
+
+class MigrationService:
+    """
+    Job queue in front of one warm LLMClient. All jobs share its model
+    handles, response cache and in-flight limit, so concurrent jobs together
+    never exceed the configured LLM concurrency.
+    """
+    def __init__(self, llm: LLMClient, jobs: int = 2):
+        self.llm = llm
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix="job")
+
+    def submit(self, job_type: str, params: Dict[str, Any]) -> Job:
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"Unknown job type {job_type!r}, expected one of {', '.join(JOB_TYPES)}")
+        missing = [p for p in REQUIRED_PARAMS[job_type] if not params.get(p)]
+        if missing:
+            raise ValueError(f"Missing parameter(s): {', '.join(missing)}")
+        unknown = set(params) - set(REQUIRED_PARAMS[job_type]) - SETTINGS
+        if unknown:
+            raise ValueError(f"Unknown parameter(s): {', '.join(sorted(unknown))}")
+
+        job = Job(id=uuid.uuid4().hex[:12], type=job_type, params=params)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created)
+
+    def cancel(self, job_id: str) -> bool:
+        """Only queued jobs can be cancelled; running ones finish."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != "queued":
+                return False
+            job.status = "cancelled"
+            job.finished = time.time()
+            return True
+
+    def _run(self, job: Job):
+        with self._lock:
+            if job.status != "queued":
+                return
+            job.status = "running"
+            job.started = time.time()
+
+        def on_progress(stage: str, done: int, total: int):
+            with self._lock:
+                job.stage, job.done, job.total = stage, done, total
+
+        def on_message(text: str):
+            with self._lock:
+                job.messages.append(Text.from_markup(text).plain)
+                del job.messages[:-MAX_JOB_MESSAGES]
+
+        params = job.params
+        settings = {k: v for k, v in params.items() if k in SETTINGS}
+        try:
+            if job.type == "analyze":
+                _, plan = plan_project(self.llm, params["input_dir"], settings,
+                                       on_progress=on_progress, on_message=on_message)
+                result = {"plan": plan.model_dump()}
+            elif job.type == "migrate":
+                result = migrate_project(self.llm, params["input_dir"], params["output_dir"], settings,
+                                         on_progress=on_progress, on_message=on_message)
+            else:
+                result = fix_project(self.llm, params["project_dir"], settings, on_progress=on_progress)
+            status, error = "succeeded", None
+        except Exception as e:
+            result, status, error = None, "failed", f"{type(e).__name__}: {e}"
+
+        with self._lock:
+            job.result, job.status, job.error = result, status, error
+            job.finished = time.time()
+
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "status": "ok",
+            "jobs": counts,
+            "cache": self.llm.cache.stats() if self.llm.cache is not None else None,
+        }
+
+    def shutdown(self, wait: bool = True):
+        # Jobs still queued are dropped, not run
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status == "queued":
+                    job.status = "cancelled"
+                    job.finished = time.time()
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # GET  /health               service and cache stats
+    # GET  /jobs                 all jobs
+    # POST /jobs                 {"type": "migrate", "params": {...}} -> job
+    # GET  /jobs/<id>            status, progress and result
+    # POST /jobs/<id>/cancel     cancel a queued job
+    service: MigrationService = None
+
+    def _send(self, status: int, body: Any):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        if self.path == "/health":
+            return self._send(200, self.service.health())
+        if self.path == "/jobs":
+            return self._send(200, [job.to_dict() for job in self.service.list()])
+        match = re.fullmatch(r"/jobs/(\w+)", self.path)
+        if match:
+            job = self.service.get(match.group(1))
+            return self._send(200, job.to_dict()) if job else self._send(404, {"error": "No such job"})
+        self._send(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path == "/jobs":
+            try:
+                body = self._body()
+                if not isinstance(body, dict) or not isinstance(body.get("params") or {}, dict):
+                    return self._send(400, {"error": 'Expected a JSON object {"type": ..., "params": {...}}'})
+                job = self.service.submit(body.get("type"), body.get("params") or {})
+            except ValueError as e:
+                return self._send(400, {"error": str(e)})
+            return self._send(202, job.to_dict())
+        match = re.fullmatch(r"/jobs/(\w+)/cancel", self.path)
+        if match:
+            if self.service.cancel(match.group(1)):
+                return self._send(200, self.service.get(match.group(1)).to_dict())
+            return self._send(409, {"error": "Job is not queued"})
+        self._send(404, {"error": "Not found"})
+
+    def log_message(self, format, *args):
+        # Job status is the interesting log, not every poll
+        pass
+
+
+def make_server(service: MigrationService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    handler = type("MigrationHandler", (_Handler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,232 @@
+import posixpath
+import re
+from collections import Counter, defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from .llm_client import LLMClient
+from .models import MavenDependency, MigrationPlan, SolutionProject
+from .nuget import parse_csproj
+from .pipeline import migrate_project
+from .scaffolder import ProjectScaffolder
+from .telemetry import profiler
+
+# Project("{type guid}") = "Name", "Relative\Path.csproj", "{project guid}"
+_PROJECT_LINE = re.compile(
+    r'^Project\("\{(?P<type>[^}]+)\}"\)\s*=\s*"(?P<name>[^"]+)",\s*"(?P<path>[^"]+)",\s*"\{(?P<guid>[^}]+)\}"',
+    re.M,
+)
+SOLUTION_FOLDER_TYPE = "2150E333-8FDC-42A3-9474-1A3956D46DE8"
+
+
+def module_name(project_name: str) -> str:
+    # Api.Core -> api-core
+    return re.sub(r"[^a-z0-9]+", "-", project_name.lower()).strip("-") or "module"
+
+
+class SolutionGraph:
+    """
+    Projects of a .sln and their ProjectReference graph. Paths are relative
+    to the directory holding the .sln.
+    """
+    def __init__(self, sln_path: str):
+        self.sln_path = Path(sln_path).resolve()
+        self.root = self.sln_path.parent
+        self.projects: Dict[str, SolutionProject] = {}
+        self._parse()
+
+    def _parse(self):
+        text = self.sln_path.read_text(encoding="utf-8-sig", errors="replace")
+        by_path = {}
+        modules = set()
+        for match in _PROJECT_LINE.finditer(text):
+            path = match.group("path").replace("\\", "/")
+            if match.group("type").upper() == SOLUTION_FOLDER_TYPE or not path.endswith(".csproj"):
+                continue
+            if not (self.root / path).exists():
+                continue
+            module = module_name(match.group("name"))
+            while module in modules:
+                module += "-x"
+            modules.add(module)
+            project = SolutionProject(
+                name=match.group("name"),
+                path=posixpath.normpath(path),
+                directory=posixpath.dirname(posixpath.normpath(path)) or ".",
+                module=module,
+            )
+            self.projects[project.name] = project
+            by_path[project.path] = project
+
+        for project in self.projects.values():
+            csproj = (self.root / project.path).read_text(encoding="utf-8-sig", errors="replace")
+            for reference in parse_csproj(project.path, csproj).project_references:
+                target = by_path.get(reference)
+                if target is not None and target.name != project.name and target.name not in project.references:
+                    project.references.append(target.name)
+
+    def dependencies(self, name: str) -> List[str]:
+        """All projects `name` references, directly or transitively."""
+        seen, queue = [], deque(self.projects[name].references)
+        while queue:
+            other = queue.popleft()
+            if other in seen or other == name:
+                continue
+            seen.append(other)
+            queue.extend(self.projects[other].references)
+        return seen
+
+    def referenced(self) -> set:
+        return {ref for project in self.projects.values() for ref in project.references}
+
+    def build_order(self) -> List[str]:
+        """Referenced projects first; cycles (invalid in MSBuild anyway) keep .sln order."""
+        remaining = {name: len(p.references) for name, p in self.projects.items()}
+        dependents = defaultdict(list)
+        for name, project in self.projects.items():
+            for ref in project.references:
+                dependents[ref].append(name)
+        ready = deque(name for name in self.projects if remaining[name] == 0)
+        ordered = []
+        while ready:
+            name = ready.popleft()
+            ordered.append(name)
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        ordered.extend(name for name in self.projects if name not in ordered)
+        return ordered
+
+    def nested_excludes(self, name: str) -> List[str]:
+        """Directories of other projects nested inside this one, scanned by their own worker."""
+        directory = self.projects[name].directory
+        excludes = []
+        for other in self.projects.values():
+            if other.name == name or other.directory == directory:
+                continue
+            if directory == "." or other.directory.startswith(directory + "/"):
+                rel = other.directory if directory == "." else other.directory[len(directory) + 1:]
+                excludes.append(f"/{rel}/")
+        return excludes
+
+
+def migrate_module(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    One project's scan -> plan -> translate -> write pipeline. Runs in a
+    worker process, so it takes and returns plain data only.
+    """
+    settings = task["settings"]
+    profiler.reset()
+    profiler.enabled = settings.get("profile", False)
+    try:
+        llm: LLMClient = task["llm_factory"]()
+        parent = MavenDependency(**task["parent"])
+        module_dependencies = [MavenDependency(group_id=task["group_id"], artifact_id=ref["module"],
+                                               version="${project.version}")
+                               for ref in task["references"] if ref["direct"]]
+        result = migrate_project(
+            llm, task["input_dir"], task["output_dir"], settings,
+            exclude=task["exclude"],
+            # Coordinates are fixed by the solution so modules can depend on each other
+            plan_overrides={"group_id": task["group_id"], "artifact_id": task["module"]},
+            references=task["references"],
+            pom_options={"parent": parent, "module_dependencies": module_dependencies,
+                         "executable": task["executable"]},
+        )
+        return {"name": task["name"], **result, "missing_references": task["missing_references"],
+                "profile": profiler.report() if profiler.enabled else None}
+    except Exception as e:
+        return {"name": task["name"], "error": f"{type(e).__name__}: {e}",
+                "missing_references": task["missing_references"]}
+
+
+def migrate_solution(graph: SolutionGraph, output_dir: str, llm_factory: Callable[[], LLMClient],
+                     settings: Dict[str, Any], processes: int = 4, group_id: str = "com.example",
+                     on_done: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Migrates every project of the solution in worker processes. A project
+    starts once the projects it references are done, so it can import their
+    Java types; independent projects run side by side. Writes the parent
+    pom last. A project that fails is left out of the parent pom and out of
+    its dependents' poms; they list it under "missing_references". Returns
+    the per-project results keyed by project name.
+    """
+    output = Path(output_dir).resolve()
+    parent_artifact = module_name(graph.sln_path.stem) + "-parent"
+    parent = {"group_id": group_id, "artifact_id": parent_artifact, "version": "0.0.1-SNAPSHOT"}
+    referenced = graph.referenced()
+    order = graph.build_order()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    started = set()
+
+    def task_for(name: str) -> Dict[str, Any]:
+        project = graph.projects[name]
+        references, missing = [], []
+        for ref in graph.dependencies(name):
+            plan = results.get(ref, {}).get("plan")
+            if plan is None:
+                # Failed module: not in the parent pom, so depending on it would break the build
+                missing.append(ref)
+                continue
+            references.append({
+                "name": ref,
+                "module": graph.projects[ref].module,
+                "direct": ref in project.references,
+                "input_dir": str(graph.root / graph.projects[ref].directory),
+                "file_mappings": plan["file_mappings"],
+            })
+        return {
+            "name": name,
+            "module": project.module,
+            "input_dir": str(graph.root / project.directory),
+            "output_dir": str(output / project.module),
+            "exclude": graph.nested_excludes(name),
+            "references": references,
+            "missing_references": missing,
+            "group_id": group_id,
+            "parent": parent,
+            "executable": name not in referenced,
+            "settings": settings,
+            "llm_factory": llm_factory,
+        }
+
+    def ready(name: str) -> bool:
+        # A failed reference doesn't block dependents, it just contributes no types
+        return name not in started and all(ref in results for ref in graph.dependencies(name))
+
+    with ProcessPoolExecutor(max_workers=max(1, processes)) as pool:
+        running = {}
+        while len(results) < len(order):
+            for name in order:
+                if ready(name):
+                    started.add(name)
+                    running[pool.submit(migrate_module, task_for(name))] = name
+            if not running:
+                # Only reachable with a reference cycle: run the rest regardless
+                for name in order:
+                    if name not in started:
+                        started.add(name)
+                        running[pool.submit(migrate_module, task_for(name))] = name
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    # Worker process died (OOM, killed)
+                    results[name] = {"name": name, "error": f"{type(e).__name__}: {e}"}
+                if on_done is not None:
+                    on_done(results[name])
+
+    plans = [MigrationPlan(**r["plan"]) for r in results.values() if "plan" in r]
+    spring_boot = Counter(p.spring_boot_version for p in plans).most_common(1)
+    java = max((p.java_version for p in plans), key=lambda v: int(re.match(r"\d+", v).group()), default="17")
+    scaffolder = ProjectScaffolder(str(output))
+    modules = [graph.projects[name].module for name in order if "plan" in results[name]]
+    scaffolder.write_file("pom.xml", scaffolder.generate_parent_pom(
+        group_id, parent_artifact, graph.sln_path.stem, modules,
+        spring_boot[0][0] if spring_boot else "3.2.0", java,
+    ))
+    return results
@@ -0,0 +1,217 @@
+import re
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set
+
+# Comments and string/char literals are blanked before parsing so braces and
+# keywords inside them don't confuse the brace walk below.
+_NOISE = re.compile(
+    r'//[^\n]*'
+    r'|/\*.*?\*/'
+    r'|@"(?:[^"]|"")*"'
+    r'|\$?"(?:\\.|[^"\\\n])*"'
+    r"|'(?:\\.|[^'\\\n])'",
+    re.S,
+)
+_NAMESPACE = re.compile(r'\bnamespace\s+([\w.]+)')
+_USING = re.compile(r'^\s*(?:global\s+)?using\s+(?:static\s+)?([\w.]+)\s*;', re.M)
+_TYPE_DECL = re.compile(
+    r'\b(?P<kind>class|interface|struct|enum|record(?:\s+class|\s+struct)?)\s+(?P<name>[A-Za-z_]\w*)'
+)
+_LEADING_ATTRIBUTES = re.compile(r'^\s*(?:\[[^\]]*\]\s*)+')
+_IDENTIFIER = re.compile(r'\b[A-Z]\w*\b')
+_VISIBLE = ('public', 'internal', 'protected')
+
+
+def blank_noise(source: str) -> str:
+    """The source with comments and string/char literals blanked to spaces (newlines kept), same length."""
+    return _NOISE.sub(lambda m: re.sub(r"[^\n]", " ", m.group(0)), source)
+
+
+def type_declarations(text: str) -> Iterator[re.Match]:
+    """Type declaration keywords in `text`, with `kind` and `name` groups; run it on blanked source."""
+    return _TYPE_DECL.finditer(text)
+
+
+@dataclass
+class TypeSymbol:
+    name: str
+    kind: str
+    namespace: str
+    header: str
+    path: str = ""
+    members: List[str] = field(default_factory=list)
+
+    def signature(self) -> str:
+        """Declaration plus visible member signatures, no bodies."""
+        if not self.members and "(" in self.header:
+            return self.header + ";"
+        if self.kind == "enum":
+            return f"{self.header} {{ {', '.join(self.members)} }}"
+        lines = [self.header + " {"]
+        lines += [f"    {m}" for m in self.members]
+        lines.append("}")
+        return "\n".join(lines)
+
+
+@dataclass
+class FileSymbols:
+    path: str
+    namespaces: List[str] = field(default_factory=list)
+    usings: List[str] = field(default_factory=list)
+    types: List[TypeSymbol] = field(default_factory=list)
+    # Capitalised identifiers used anywhere in the file, candidates for type references
+    identifiers: Set[str] = field(default_factory=set)
+
+
+def _clean_segment(segment: str) -> str:
+    segment = _LEADING_ATTRIBUTES.sub("", segment)
+    return " ".join(segment.split())
+
+
+def _is_member(owner: TypeSymbol, segment: str) -> bool:
+    # Interface members carry no access modifier
+    if owner.kind == "interface":
+        return bool(segment)
+    return segment.startswith(_VISIBLE)
+
+
+def parse_csharp(path: str, source: str) -> FileSymbols:
+    """
+    Lightweight structural parse of a C# file: namespaces, usings, declared
+    types and their visible member signatures. Not a compiler, but good enough
+    to know which sibling types a file touches.
+    """
+    text = _NOISE.sub('""', source)
+    symbols = FileSymbols(path=path)
+    symbols.namespaces = _NAMESPACE.findall(text)
+    symbols.usings = _USING.findall(text)
+    symbols.identifiers = set(_IDENTIFIER.findall(text))
+    default_namespace = symbols.namespaces[0] if symbols.namespaces else ""
+
+    # Each open brace pushes the type it opens, or None for any other block
+    stack: List[Optional[TypeSymbol]] = []
+    segment = []
+
+    for ch in text:
+        if ch not in "{};":
+            segment.append(ch)
+            continue
+
+        current = _clean_segment("".join(segment))
+        segment = []
+        owner = stack[-1] if stack else None
+        at_type_body = owner is not None
+
+        if ch == "{":
+            match = _TYPE_DECL.search(current) if current else None
+            if match and "(" not in current[:match.start()]:
+                kind = " ".join(match.group("kind").split())
+                type_symbol = TypeSymbol(match.group("name"), kind, default_namespace, current, path)
+                symbols.types.append(type_symbol)
+                stack.append(type_symbol)
+                continue
+            if at_type_body and owner.kind != "enum" and _is_member(owner, current):
+                # Method, constructor or property header followed by its body
+                owner.members.append(current + ";" if "(" in current else current + " { get; set; }")
+            stack.append(None)
+        elif ch == ";":
+            match = _TYPE_DECL.search(current) if current.startswith(("public", "internal", "record")) else None
+            if match and match.group("kind").startswith("record"):
+                # Positional record without a body: `public record Person(string Name);`
+                kind = " ".join(match.group("kind").split())
+                symbols.types.append(TypeSymbol(match.group("name"), kind, default_namespace, current, path))
+            elif at_type_body and _is_member(owner, current):
+                # Expression-bodied members and field initialisers: keep the declaration only
+                declaration, _, body = current.partition("=>")
+                declaration = declaration.split("=")[0].strip()
+                if body and "(" not in declaration:
+                    owner.members.append(declaration + " { get; }")
+                else:
+                    owner.members.append(declaration + ";")
+        else:
+            if at_type_body and owner.kind == "enum" and current:
+                owner.members.extend(m.split("=")[0].strip() for m in current.split(",") if m.strip())
+            if stack:
+                stack.pop()
+
+    return symbols
+
+
+class SymbolIndex:
+    """
+    Project-wide index of C# declarations, used to give each translation only
+    the signatures of the sibling types it actually references.
+    """
+    def __init__(self):
+        self.files: Dict[str, FileSymbols] = {}
+        self._declared_in: Dict[str, List[str]] = defaultdict(list)  # type name -> files
+
+    def add_file(self, path: str, source: str):
+        symbols = parse_csharp(path, source)
+        self.files[path] = symbols
+        for type_symbol in symbols.types:
+            if path not in self._declared_in[type_symbol.name]:
+                self._declared_in[type_symbol.name].append(path)
+
+    def declared_in(self, name: str) -> List[str]:
+        return list(self._declared_in.get(name, []))
+
+    def referenced_types(self, path: str) -> List[TypeSymbol]:
+        """
+        Types declared in other files that `path` mentions. When a name is
+        declared in several namespaces, those visible through the file's own
+        namespace or usings win.
+        """
+        symbols = self.files.get(path)
+        if symbols is None:
+            return []
+        own = {t.name for t in symbols.types}
+        visible = set(symbols.namespaces) | set(symbols.usings)
+
+        referenced = []
+        for name in sorted(symbols.identifiers - own):
+            candidates = [
+                t for other in self._declared_in.get(name, []) if other != path
+                for t in self.files[other].types if t.name == name
+            ]
+            preferred = [t for t in candidates if t.namespace in visible]
+            referenced.extend(preferred or candidates)
+        return referenced
+
+    def dependencies(self, path: str) -> Set[str]:
+        symbols = self.files.get(path)
+        if symbols is None:
+            return set()
+        deps = set()
+        for name in symbols.identifiers:
+            deps.update(p for p in self._declared_in.get(name, []) if p != path)
+        return deps
+
+    def dependency_order(self, paths: List[str]) -> List[str]:
+        """
+        Orders `paths` so that files come after the files whose types they use
+        (models before the controllers using them). Cycles keep input order.
+        """
+        wanted = set(paths)
+        position = {p: i for i, p in enumerate(paths)}
+        deps = {p: self.dependencies(p) & wanted for p in paths}
+        dependents = defaultdict(list)
+        for p, ds in deps.items():
+            for d in ds:
+                dependents[d].append(p)
+
+        remaining = {p: len(ds) for p, ds in deps.items()}
+        ready = deque(sorted((p for p in paths if remaining[p] == 0), key=position.get))
+        ordered = []
+        while ready:
+            p = ready.popleft()
+            ordered.append(p)
+            for dependent in sorted(dependents[p], key=position.get):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        done = set(ordered)
+        ordered.extend(p for p in paths if p not in done)
+        return ordered
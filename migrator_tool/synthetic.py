@@ -0,0 +1,205 @@
+import json
+import random
+from pathlib import Path
+from typing import Dict, List
+
+CSPROJ = """<Project Sdk="Microsoft.NET.Sdk.Web">
+
+  <PropertyGroup>
+    <TargetFramework>net8.0</TargetFramework>
+    <Nullable>enable</Nullable>
+    <ImplicitUsings>enable</ImplicitUsings>
+  </PropertyGroup>
+
+  <ItemGroup>
+    <PackageReference Include="Swashbuckle.AspNetCore" Version="6.4.0" />
+    <PackageReference Include="Microsoft.EntityFrameworkCore" Version="8.0.0" />
+    <PackageReference Include="Serilog.AspNetCore" Version="8.0.0" />
+    <PackageReference Include="Newtonsoft.Json" Version="13.0.3" />
+  </ItemGroup>
+
+</Project>
+"""
+
+PROGRAM = """var builder = WebApplication.CreateBuilder(args);
+
+builder.Services.AddControllers();
+{registrations}
+var app = builder.Build();
+
+app.UseHttpsRedirection();
+app.UseAuthorization();
+app.MapControllers();
+
+app.Run();
+"""
+
+PROPERTY_TYPES = ["int", "string", "bool", "decimal", "DateTime", "Guid", "long", "double", "string?", "List<string>"]
+
+
+class SyntheticProjectGenerator:
+    """
+    Writes a fake but structurally realistic ASP.NET Core project: models,
+    service interfaces and implementations, controllers, nested namespaces
+    and a few very large files. Deterministic for a given seed.
+    """
+    def __init__(self, root_namespace: str = "BenchApp", models: int = 20, services: int = 10,
+                 controllers: int = 10, depth: int = 2, large_files: int = 1, large_file_methods: int = 300,
+                 seed: int = 0):
+        self.root_namespace = root_namespace
+        self.models = models
+        self.services = services
+        self.controllers = controllers
+        self.depth = max(0, depth)
+        self.large_files = large_files
+        self.large_file_methods = large_file_methods
+        self._random = random.Random(seed)
+
+    def _sub_namespace(self, i: int) -> List[str]:
+        # Spread files over nested namespaces, e.g. Billing/Invoices
+        areas = ["Billing", "Catalog", "Identity", "Shipping", "Reporting"]
+        levels = i % (self.depth + 1)
+        if not levels:
+            return []
+        return [areas[i % len(areas)]] + [f"Area{level}" for level in range(1, levels)]
+
+    def _write(self, root: Path, rel_path: str, content: str, written: List[str]):
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        written.append(rel_path)
+
+    def _model(self, i: int) -> str:
+        props = []
+        for p in range(self._random.randint(3, 12)):
+            prop_type = self._random.choice(PROPERTY_TYPES)
+            props.append(f"    public {prop_type} Field{p} {{ get; set; }}")
+        if i > 0 and self._random.random() < 0.4:
+            props.append(f"    public Model{self._random.randrange(i)}? Related {{ get; set; }}")
+        return "\n".join(props)
+
+    def generate(self, root: str) -> Dict[str, int]:
+        root_path = Path(root)
+        root_path.mkdir(parents=True, exist_ok=True)
+        written: List[str] = []
+        ns = self.root_namespace
+        model_namespaces = {}
+
+        self._write(root_path, f"{ns}.csproj", CSPROJ, written)
+        self._write(root_path, "appsettings.json", json.dumps({
+            "Logging": {"LogLevel": {"Default": "Information"}},
+            "ConnectionStrings": {"Default": "Server=localhost;Database=bench"},
+            "AllowedHosts": "*",
+        }, indent=2), written)
+
+        for i in range(self.models):
+            sub = self._sub_namespace(i)
+            namespace = ".".join([ns, "Models"] + sub)
+            model_namespaces[i] = namespace
+            body = self._model(i)
+            self._write(root_path, "/".join(["Models"] + sub + [f"Model{i}.cs"]),
+                        f"namespace {namespace};\n\npublic class Model{i}\n{{\n{body}\n}}\n", written)
+
+        usings = sorted(set(model_namespaces.values()))
+        using_block = "\n".join(f"using {u};" for u in usings)
+
+        registrations = []
+        for i in range(self.services):
+            model = i % max(1, self.models)
+            self._write(root_path, f"Services/IService{i}.cs", f"""{using_block}
+
+namespace {ns}.Services;
+
+public interface IService{i}
+{{
+    Task<IEnumerable<Model{model}>> GetAllAsync();
+    Task<Model{model}?> GetAsync(int id);
+    Task SaveAsync(Model{model} item);
+}}
+""", written)
+            self._write(root_path, f"Services/Service{i}.cs", f"""{using_block}
+
+namespace {ns}.Services;
+
+public class Service{i} : IService{i}
+{{
+    private readonly List<Model{model}> _items = new();
+
+    public async Task<IEnumerable<Model{model}>> GetAllAsync()
+    {{
+        await Task.Delay(1);
+        return _items.Where(x => x != null).ToList();
+    }}
+
+    public Task<Model{model}?> GetAsync(int id) => Task.FromResult(_items.ElementAtOrDefault(id));
+
+    public Task SaveAsync(Model{model} item)
+    {{
+        _items.Add(item);
+        return Task.CompletedTask;
+    }}
+}}
+""", written)
+            registrations.append(f"builder.Services.AddScoped<IService{i}, Service{i}>();")
+
+        for i in range(self.controllers):
+            service = i % max(1, self.services)
+            model = service % max(1, self.models)
+            self._write(root_path, f"Controllers/Resource{i}Controller.cs", f"""using Microsoft.AspNetCore.Mvc;
+using {ns}.Services;
+{using_block}
+
+namespace {ns}.Controllers;
+
+[ApiController]
+[Route("api/[controller]")]
+public class Resource{i}Controller : ControllerBase
+{{
+    private readonly IService{service} _service;
+
+    public Resource{i}Controller(IService{service} service)
+    {{
+        _service = service;
+    }}
+
+    [HttpGet]
+    public async Task<IEnumerable<Model{model}>> Get() => await _service.GetAllAsync();
+
+    [HttpGet("{{id}}")]
+    public async Task<ActionResult<Model{model}>> Get(int id)
+    {{
+        var item = await _service.GetAsync(id);
+        return item is null ? NotFound() : Ok(item);
+    }}
+
+    [HttpPost]
+    public async Task<IActionResult> Post(Model{model} item)
+    {{
+        await _service.SaveAsync(item);
+        return Ok();
+    }}
+}}
+""", written)
+
+        for i in range(self.large_files):
+            methods = "\n".join(f"""    public int Compute{m}(int input)
+    {{
+        var total = input;
+        for (var k = 0; k < {m % 17 + 1}; k++)
+        {{
+            total += k * {m % 7 + 1};
+        }}
+        return total;
+    }}
+""" for m in range(self.large_file_methods))
+            self._write(root_path, f"Legacy/GodService{i}.cs", f"""namespace {ns}.Legacy;
+
+public partial class GodService{i}
+{{
+{methods}}}
+""", written)
+
+        self._write(root_path, "Program.cs", PROGRAM.format(registrations="\n".join(registrations)), written)
+
+        total_bytes = sum((root_path / p).stat().st_size for p in written)
+        return {"files": len(written), "cs_files": sum(p.endswith(".cs") for p in written), "bytes": total_bytes}
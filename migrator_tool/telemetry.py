@@ -0,0 +1,190 @@
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from rich.table import Table
+
+# Upper bounds (seconds) of the latency histogram buckets
+HISTOGRAM_BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 120]
+
+
+def percentile_of(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values; 0.0 when there are none."""
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+def _summarize(samples: List[float]) -> Dict[str, Any]:
+    values = sorted(samples)
+    histogram = {}
+    for bound in HISTOGRAM_BUCKETS:
+        histogram[f"<={bound}s"] = 0
+    histogram["inf"] = 0
+    for v in values:
+        for bound in HISTOGRAM_BUCKETS:
+            if v <= bound:
+                histogram[f"<={bound}s"] += 1
+                break
+        else:
+            histogram["inf"] += 1
+    return {
+        "count": len(values),
+        "total_s": sum(values),
+        "mean_s": sum(values) / len(values) if values else 0.0,
+        "min_s": values[0] if values else 0.0,
+        "p50_s": percentile_of(values, 50),
+        "p90_s": percentile_of(values, 90),
+        "p99_s": percentile_of(values, 99),
+        "max_s": values[-1] if values else 0.0,
+        "histogram": histogram,
+    }
+
+
+class Telemetry:
+    """
+    Process-wide, thread-safe collector for pipeline timings and LLM call
+    statistics. Disabled by default so instrumentation costs next to nothing
+    unless --profile is given.
+    """
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._started = time.time()
+            self._timings: Dict[str, List[float]] = {}
+            self._counters: Dict[str, int] = {}
+            self._info: Dict[str, Any] = {}
+            self._concurrency: Dict[str, Dict[str, int]] = {}
+            self._llm_models: Dict[str, Dict[str, Any]] = {}
+
+    def observe(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._timings.setdefault(name, []).append(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name: str):
+        """Decorator form of timer()."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name: str, n: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def set_info(self, key: str, value: Any):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._info[key] = value
+
+    @contextmanager
+    def track_concurrency(self, name: str):
+        """Counts how many threads are inside the block at once (current and peak)."""
+        if not self.enabled:
+            yield
+            return
+        with self._lock:
+            gauge = self._concurrency.setdefault(name, {"current": 0, "peak": 0})
+            gauge["current"] += 1
+            gauge["peak"] = max(gauge["peak"], gauge["current"])
+        try:
+            yield
+        finally:
+            with self._lock:
+                gauge["current"] -= 1
+
+    def record_llm_call(self, model: str, latency: float, prompt_chars: int, response_chars: int,
+                        prompt_tokens: Optional[int] = None, response_tokens: Optional[int] = None,
+                        cached: bool = False):
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._llm_models.setdefault(model, {
+                "calls": 0, "cache_hits": 0, "prompt_chars": 0, "response_chars": 0,
+                "prompt_tokens": 0, "response_tokens": 0, "latencies": [],
+            })
+            stats["calls"] += 1
+            stats["prompt_chars"] += prompt_chars
+            stats["response_chars"] += response_chars
+            if cached:
+                stats["cache_hits"] += 1
+                return
+            # Token counts come from the API when available, otherwise ~4 chars per token
+            stats["prompt_tokens"] += prompt_tokens if prompt_tokens is not None else prompt_chars // 4
+            stats["response_tokens"] += response_tokens if response_tokens is not None else response_chars // 4
+            stats["latencies"].append(latency)
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            llm = {}
+            for model, stats in self._llm_models.items():
+                entry = {k: v for k, v in stats.items() if k != "latencies"}
+                entry["latency"] = _summarize(stats["latencies"])
+                llm[model] = entry
+            return {
+                "started_at": self._started,
+                "wall_time_s": time.time() - self._started,
+                "info": dict(self._info),
+                "timings": {name: _summarize(samples) for name, samples in sorted(self._timings.items())},
+                "counters": dict(sorted(self._counters.items())),
+                "concurrency_peak": {name: g["peak"] for name, g in self._concurrency.items()},
+                "llm": llm,
+            }
+
+    def write_report(self, path: str) -> Path:
+        report_path = Path(path)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(json.dumps(self.report(), indent=2))
+        return report_path
+
+    def summary_table(self) -> Table:
+        report = self.report()
+        table = Table(title=f"Profile ({report['wall_time_s']:.1f}s wall)")
+        table.add_column("Stage")
+        table.add_column("Count", justify="right")
+        table.add_column("Total s", justify="right")
+        table.add_column("Mean s", justify="right")
+        table.add_column("p90 s", justify="right")
+        table.add_column("Max s", justify="right")
+        for name, t in report["timings"].items():
+            table.add_row(name, str(t["count"]), f"{t['total_s']:.2f}", f"{t['mean_s']:.3f}",
+                          f"{t['p90_s']:.3f}", f"{t['max_s']:.3f}")
+        for model, stats in report["llm"].items():
+            lat = stats["latency"]
+            table.add_row(
+                f"llm {model} ({stats['cache_hits']} cached, {stats['prompt_tokens']}+{stats['response_tokens']} tok)",
+                str(stats["calls"]), f"{lat['total_s']:.2f}", f"{lat['mean_s']:.3f}",
+                f"{lat['p90_s']:.3f}", f"{lat['max_s']:.3f}",
+            )
+        return table
+
+
+# Shared by every pipeline stage, like the module-level consoles
+profiler = Telemetry()
@@ -1,11 +1,215 @@
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from .chunking import ClassLayout, assemble_class, chunk_members, parse_layout, split_chunk_output
+from .fastpath import RuleBasedTranslator
 from .llm_client import LLMClient
-from .models import MigrationPlan
+from .models import MigrationPlan, FileMapping
+from .symbols import SymbolIndex
+from .telemetry import profiler
+
+SYSTEM_INSTRUCTION = "You are an expert Java Developer. Output strictly valid Java code."
+
+# Multi-file output protocol for batched translations
+FILE_START = "=== FILE: {} ==="
+FILE_END = "=== END FILE ==="
+_FILE_BLOCK = re.compile(r"^=== FILE: (.+?) ===\s*$(.*?)^=== END FILE ===\s*$", re.M | re.S)
+
+def _balanced(java_code: str) -> bool:
+    return java_code.count("{") == java_code.count("}")
+
 
 class CodeTranslator:
-    def __init__(self, llm_client: LLMClient):
+    def __init__(self, llm_client: Optional[LLMClient], symbol_index: Optional[SymbolIndex] = None, max_context_types: int = 30,
+                 fast_path: bool = True, external_mappings: Optional[Dict[str, FileMapping]] = None,
+                 chunk_chars: int = 20000, max_chunk_chars: int = 8000, chunk_workers: int = 4):
+        # None is enough for offline use of the fast path and reference context (scan estimates)
         self.llm = llm_client
+        self.symbols = symbol_index
+        self.max_context_types = max_context_types
+        self.fast_path = fast_path
+        # Mappings of indexed sources that belong to other modules (multi-project solutions)
+        self.external_mappings = external_mappings or {}
+        # Sources over chunk_chars are translated member chunk by member chunk (0 disables)
+        self.chunk_chars = chunk_chars
+        self.max_chunk_chars = max_chunk_chars
+        self.chunk_workers = max(1, chunk_workers)
+        # How many files skipped the LLM entirely vs. went through it
+        self.fast_path_files = 0
+        self.llm_files = 0
+        self._counts_lock = threading.Lock()
+
+    def _count(self, fast: bool):
+        with self._counts_lock:
+            if fast:
+                self.fast_path_files += 1
+            else:
+                self.llm_files += 1
+        profiler.count("translator.fast_path" if fast else "translator.llm")
+
+    def _targets(self, plan: MigrationPlan) -> Dict[str, FileMapping]:
+        targets = dict(self.external_mappings)
+        targets.update((m.source_file, m) for m in plan.file_mappings)
+        return targets
+
+    def resolve_type(self, name: str, plan: MigrationPlan) -> Optional[str]:
+        """
+        Fully-qualified Java name of a project type, or None when it isn't
+        declared exactly once in the project (or there is no symbol index).
+        """
+        if self.symbols is None:
+            return None
+        paths = self.symbols.declared_in(name)
+        if len(paths) != 1:
+            return None
+        targets = self._targets(plan)
+        if paths[0] not in targets:
+            return None
+        return f"{targets[paths[0]].package_name}.{name}"
+
+    def try_fast_path(self, source_code: str, file_mapping: FileMapping, plan: MigrationPlan) -> Optional[str]:
+        """Deterministic translation for trivial types, or None to use the LLM."""
+        if not self.fast_path:
+            return None
+        rules = RuleBasedTranslator(resolve_type=lambda name: self.resolve_type(name, plan))
+        java_code = rules.try_translate(source_code, file_mapping, plan)
+        if java_code is None or not self.looks_valid(java_code, file_mapping):
+            return None
+        return java_code
+
+    def reference_context(self, file_mapping: dict, plan: MigrationPlan) -> str:
+        """
+        Signatures of the sibling types this file references, each annotated
+        with the Java class it is being migrated to.
+        """
+        if self.symbols is None:
+            return ""
+        targets = self._targets(plan)
+        blocks = []
+        for type_symbol in self.symbols.referenced_types(file_mapping.source_file)[:self.max_context_types]:
+            java_name = type_symbol.name
+            if type_symbol.path in targets:
+                java_name = f"{targets[type_symbol.path].package_name}.{type_symbol.name}"
+            blocks.append(f"// Java: {java_name}\n{type_symbol.signature()}")
+        return "\n\n".join(blocks)
 
+    @profiler.timed("translator.translate_file")
     def translate_file(self, source_code: str, file_mapping: dict, plan: MigrationPlan) -> str:
+        java_code = self.try_fast_path(source_code, file_mapping, plan)
+        if java_code is not None:
+            self._count(fast=True)
+            return java_code
+        self._count(fast=False)
+        return self._model_translate(source_code, file_mapping, plan)
+
+    def chunk_split(self, source_code: str) -> Optional[Tuple[ClassLayout, List[str]]]:
+        """(layout, member chunks) when the source is translated in chunks, else None."""
+        if not self.chunk_chars or len(source_code) <= self.chunk_chars:
+            return None
+        layout = parse_layout(source_code)
+        if layout is None:
+            return None
+        chunks = chunk_members(layout.members, self.max_chunk_chars)
+        return (layout, chunks) if len(chunks) >= 2 else None
+
+    def _model_translate(self, source_code: str, file_mapping: FileMapping, plan: MigrationPlan) -> str:
+        # The LLM part of translate_file, without counting the file
+        if self.chunk_split(source_code) is not None:
+            java_code = self._chunked_translate(source_code, file_mapping, plan)
+            if java_code is not None:
+                return java_code
+        return self._llm_translate(source_code, file_mapping, plan)
+
+    def _target_section(self, file_mapping: FileMapping, plan: MigrationPlan) -> str:
+        context = self.reference_context(file_mapping, plan)
+        return f"""
+        Referenced project types (C# signatures, already migrated to the Java classes noted above each):
+        {context}
+        """ if context else ""
+
+    @profiler.timed("translator.chunked")
+    def _chunked_translate(self, source_code: str, file_mapping: FileMapping, plan: MigrationPlan) -> Optional[str]:
+        """
+        Translates a very large class as a shell (package, imports, declaration)
+        plus member chunks in parallel, each with the class skeleton as
+        context, then stitches them into one class. None when the file can't
+        be split or the result doesn't hold together; the caller falls back to
+        a whole-file translation.
+        """
+        split = self.chunk_split(source_code)
+        if split is None:
+            return None
+        layout, chunks = split
+        skeleton = layout.skeleton()
+        context_section = self._target_section(file_mapping, plan)
+
+        shell_prompt = f"""
+        Translate the declaration of the following C#/.NET Core class to Java (Spring Boot/Lombok).
+        
+        Target Context:
+        - Package Name: {file_mapping.package_name}
+        - Spring Boot Version: {plan.spring_boot_version}
+        - Dependencies available: {[d.artifact_id for d in plan.dependencies]}
+        
+        CRITICAL RULES:
+        1. Output a Java file with the package declaration, the imports and the annotated declaration of `{layout.name}` with an EMPTY body.
+        2. Do NOT translate the members; they are translated separately and inserted into the body.
+        3. Do NOT include markdown formatting or comments like '// Path: ...'.
+        4. Ensure the package declaration matches `{file_mapping.package_name}`.
+        5. Use Lombok @Data for models, @RestController for controllers.
+        {context_section}
+        Class skeleton (C#, member bodies omitted):
+        {skeleton}
+        """
+
+        def translate_chunk(index: int, chunk: str) -> Tuple[List[str], str]:
+            prompt = f"""
+            Translate part {index + 1} of {len(chunks)} of the members of the C# class `{layout.name}` to Java members of the Java class `{layout.name}` (package {file_mapping.package_name}).
+            
+            CRITICAL RULES:
+            1. Output ONLY the Java member declarations (fields, constructors, methods, nested types) for the C# members below, in order.
+            2. Do NOT output a package declaration, a class declaration or members that are not listed below.
+            3. Put the import statements these members need first, one per line.
+            4. Do NOT include markdown formatting.
+            5. Other members of the class are translated separately; call them by their Java names as given by the skeleton.
+            {context_section}
+            Class skeleton (C#, for context only):
+            {skeleton}
+            
+            C# members to translate:
+            {chunk}
+            """
+            response = self.llm.generate(
+                prompt, SYSTEM_INSTRUCTION,
+                validate=lambda text: _balanced(split_chunk_output(self._clean(text))[1]),
+            )
+            imports, members = split_chunk_output(self._clean(response))
+            if not _balanced(members):
+                raise ValueError(f"unbalanced braces in chunk {index + 1}")
+            return imports, members
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.chunk_workers, len(chunks) + 1),
+                                    thread_name_prefix="chunk") as pool:
+                shell = pool.submit(lambda: self._clean(self.llm.generate(
+                    shell_prompt, SYSTEM_INSTRUCTION, validate=lambda text: self.looks_valid(self._clean(text), file_mapping),
+                )))
+                parts = list(pool.map(translate_chunk, range(len(chunks)), chunks))
+                imports = [line for part_imports, _ in parts for line in part_imports]
+                java_code = assemble_class(shell.result(), imports, [members for _, members in parts])
+        except Exception:
+            profiler.count("translator.chunk_fallback")
+            return None
+        if not self.looks_valid(java_code, file_mapping):
+            profiler.count("translator.chunk_fallback")
+            return None
+        profiler.count("translator.chunks", len(chunks))
+        return java_code
+
+    def _llm_translate(self, source_code: str, file_mapping: FileMapping, plan: MigrationPlan) -> str:
+        context_section = self._target_section(file_mapping, plan)
+
         prompt = f"""
         Translate the following C#/.NET Core code to a SINGLE Java class (Spring Boot/Lombok).
         
@@ -20,15 +224,109 @@ class CodeTranslator:
         3. Do NOT include markdown formatting or comments like '// Path: ...'.
         4. Ensure the package declaration matches `{file_mapping.package_name}`.
         5. Use Lombok @Data for models, @RestController for controllers.
-        
+        6. Import referenced project types from the Java packages listed below.
+        {context_section}
         Source C# Code:
         {source_code}
         """
         
-        system_instruction = "You are an expert Java Developer. Output strictly valid Java code."
+        def valid(text: str) -> bool:
+            return self.looks_valid(self._clean(text), file_mapping)
+
+        java_code = self._clean(self.llm.generate(prompt, SYSTEM_INSTRUCTION, validate=valid))
+        if not self.looks_valid(java_code, file_mapping):
+            # Escalate to the pro model unless the router already picked it
+            if self.llm.router.choose(prompt) != self.llm.router.pro_model:
+                java_code = self._clean(self.llm.generate(prompt, SYSTEM_INSTRUCTION, tier="pro", validate=valid))
+        return java_code
+
+    @profiler.timed("translator.translate_batch")
+    def translate_batch(self, items: List[Tuple[str, FileMapping]], plan: MigrationPlan) -> Dict[str, str]:
+        """
+        Translates several small files in one request using a delimited
+        multi-file output protocol. Returns {source_file: java_code}; any member
+        missing or malformed in the response is retried on its own.
+        Files are only counted once the whole batch has succeeded, since the
+        engine retries every member through translate_file if it raises.
+        """
+        results = {}
+        remaining = []
+        for source_code, file_mapping in items:
+            java_code = self.try_fast_path(source_code, file_mapping, plan)
+            if java_code is not None:
+                results[file_mapping.source_file] = java_code
+            else:
+                remaining.append((source_code, file_mapping))
+        fast = len(results)
+        if len(remaining) <= 1:
+            for source_code, file_mapping in remaining:
+                results[file_mapping.source_file] = self._model_translate(source_code, file_mapping, plan)
+            for _ in range(fast):
+                self._count(fast=True)
+            for _ in remaining:
+                self._count(fast=False)
+            return results
+        items = remaining
+
+        contexts = []
+        files_section = []
+        for source_code, file_mapping in items:
+            context = self.reference_context(file_mapping, plan)
+            if context and context not in contexts:
+                contexts.append(context)
+            files_section.append(
+                f"--- {file_mapping.source_file} (package {file_mapping.package_name}) ---\n{source_code}"
+            )
+        context_section = f"""
+        Referenced project types (C# signatures, already migrated to the Java classes noted above each):
+        {chr(10).join(contexts)}
+        """ if contexts else ""
+
+        prompt = f"""
+        Translate each of the following C#/.NET Core files to a SINGLE Java class (Spring Boot/Lombok) per file.
         
-        response = self.llm.generate(prompt, system_instruction)
+        Target Context:
+        - Spring Boot Version: {plan.spring_boot_version}
+        - Dependencies available: {[d.artifact_id for d in plan.dependencies]}
         
+        CRITICAL RULES:
+        1. For EVERY input file output exactly one block, in this exact format:
+        {FILE_START.format("<source file path>")}
+        <the Java code of the one class for that file>
+        {FILE_END}
+        2. Each block contains ONLY the class corresponding to that file, never other classes.
+        3. Do NOT include markdown formatting or comments like '// Path: ...'.
+        4. Each block's package declaration must match the package given for that file.
+        5. Use Lombok @Data for models, @RestController for controllers.
+        6. Import referenced project types from the Java packages listed below.
+        {context_section}
+        Source C# Files:
+        {chr(10).join(files_section)}
+        """
+
+        def parse(response: str) -> Dict[str, str]:
+            return {path.strip(): self._clean(body) for path, body in _FILE_BLOCK.findall(response)}
+
+        def complete(response: str) -> bool:
+            parts = parse(response)
+            return all(m.source_file in parts and self.looks_valid(parts[m.source_file], m) for _, m in items)
+
+        # Only complete answers are cached; members retried alone get their own entries
+        parts = parse(self.llm.generate(prompt, SYSTEM_INSTRUCTION, validate=complete))
+
+        for source_code, file_mapping in items:
+            java_code = parts.get(file_mapping.source_file)
+            if java_code is None or not self.looks_valid(java_code, file_mapping):
+                java_code = self._llm_translate(source_code, file_mapping, plan)
+            results[file_mapping.source_file] = java_code
+
+        for _ in range(fast):
+            self._count(fast=True)
+        for _ in items:
+            self._count(fast=False)
+        return results
+
+    def _clean(self, response: str) -> str:
         # Cleanup
         if "```java" in response:
             return response.split("```java")[1].split("```")[0].strip()
@@ -36,3 +334,15 @@ class CodeTranslator:
             return response.split("```")[1].split("```")[0].strip()
             
         return response.strip()
+
+    def looks_valid(self, java_code: str, file_mapping: dict) -> bool:
+        """
+        Cheap structural check on a translation: right package, a type
+        declaration, balanced braces. Not a compiler, just enough to catch
+        truncated or off-format responses.
+        """
+        if not re.search(rf"^\s*package\s+{re.escape(file_mapping.package_name)}\s*;", java_code, re.M):
+            return False
+        if not re.search(r"\b(class|interface|enum|record)\s+\w+", java_code):
+            return False
+        return java_code.count("{") == java_code.count("}") and java_code.count("{") > 0
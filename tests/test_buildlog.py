@@ -0,0 +1,85 @@
+from migrator_tool.buildlog import BuildErrorStream, dedupe_errors
+
+PROJECT = "/work/app"
+
+MAVEN_LOG = f"""[INFO] Compiling 3 source files
+[ERROR] COMPILATION ERROR :
+[ERROR] {PROJECT}/src/main/java/a/Foo.java:[3,8] cannot find symbol
+[ERROR]   symbol:   class   Bar
+[ERROR]   location: class a.Foo
+[ERROR] {PROJECT}/src/main/java/a/Foo.java:[9,8] cannot find symbol
+[ERROR]   symbol:   class   Bar
+[ERROR] {PROJECT}/src/main/java/a/Baz.java:[4,1] ';' expected
+[INFO] 3 errors
+[INFO] BUILD FAILURE
+[ERROR] {PROJECT}/src/main/java/a/Foo.java:[3,8] cannot find symbol
+"""
+
+
+def test_dedupe_errors_groups_lines_per_message():
+    assert dedupe_errors([[3, "x"], [9, "x"], [3, "x"], [4, "y"]]) == ["Lines 3, 9: x", "Line 4: y"]
+
+
+def test_stream_reports_each_file_once_when_complete():
+    reported = []
+    stream = BuildErrorStream(PROJECT, on_file_complete=lambda path, msgs: reported.append((path, msgs)))
+    for line in MAVEN_LOG.splitlines():
+        assert stream.feed(line) is False
+
+    foo, baz = "src/main/java/a/Foo.java", "src/main/java/a/Baz.java"
+    assert reported == [
+        (foo, ["Lines 3, 9: cannot find symbol (symbol: class Bar)"]),
+        (baz, ["Line 4: ';' expected"]),
+    ]
+    # The summary's repeat is neither reported again nor counted twice
+    assert stream.error_count == 3
+    assert stream.reported == {foo, baz}
+    assert stream.finish() == {}
+    assert stream.errors()[foo] == ["Lines 3, 9: cannot find symbol (symbol: class Bar)"]
+
+
+def test_stream_javac_output_and_finish():
+    reported = []
+    stream = BuildErrorStream(PROJECT, on_file_complete=lambda path, msgs: reported.append(path))
+    stream.feed(f"{PROJECT}/src/A.java:18: error: <identifier> expected")
+    stream.feed("    void f(")
+    stream.feed(f"{PROJECT}/src/B.java:2: error: class, interface, or enum expected")
+    # A's errors are over once B's start; B is still open until the build ends
+    assert reported == ["src/A.java"]
+    assert stream.finish() == {"src/B.java": ["Line 2: class, interface, or enum expected"]}
+
+
+def test_stream_keeps_paths_outside_the_project():
+    stream = BuildErrorStream(PROJECT)
+    stream.feed("[ERROR] /elsewhere/Gen.java:[1,1] bad")
+    assert stream.errors() == {"/elsewhere/Gen.java": ["Line 1: bad"]}
+
+
+def test_stream_signals_error_threshold():
+    stream = BuildErrorStream(PROJECT, max_errors=2)
+    assert stream.feed(f"[ERROR] {PROJECT}/A.java:[1,1] one") is False
+    assert stream.feed(f"[ERROR] {PROJECT}/A.java:[1,1] one") is False
+    assert stream.feed(f"[ERROR] {PROJECT}/A.java:[2,1] two") is True
+
+
+def test_new_errors_for_a_reported_file_come_back_from_finish():
+    reported = []
+    stream = BuildErrorStream(PROJECT, on_file_complete=lambda path, msgs: reported.append((path, msgs)))
+    for line in MAVEN_LOG.splitlines():
+        stream.feed(line)
+    # e.g. a second compiler pass (tests, another module) finds more in Foo
+    stream.feed(f"[ERROR] {PROJECT}/src/main/java/a/Foo.java:[20,5] incompatible types")
+    stream.feed(f"[ERROR] {PROJECT}/src/main/java/a/Foo.java:[3,8] cannot find symbol")
+    stream.feed("[INFO] BUILD FAILURE")
+
+    assert [path for path, _ in reported] == ["src/main/java/a/Foo.java", "src/main/java/a/Baz.java"]
+    assert stream.finish() == {"src/main/java/a/Foo.java": ["Line 20: incompatible types"]}
+    assert stream.finish() == {}
+    assert stream.error_count == 4
+
+
+def test_same_line_errors_in_different_columns_are_kept():
+    stream = BuildErrorStream(PROJECT)
+    stream.feed(f"[ERROR] {PROJECT}/A.java:[5,3] cannot find symbol")
+    stream.feed(f"[ERROR] {PROJECT}/A.java:[5,17] cannot find symbol")
+    assert stream.error_count == 2
@@ -0,0 +1,77 @@
+import os
+from migrator_tool.cache import ResponseCache
+from migrator_tool.fake_llm import FakeLLMClient
+
+PROMPT = "Package Name: com.acme\nSource C# Code:\npublic class Order { }"
+
+
+def test_put_get_and_stats(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    key = ResponseCache.make_key("model", "system", "prompt")
+    assert cache.get(key) is None
+    cache.put(key, "réponse")
+    assert cache.get(key) == "réponse"
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1, "bytes": len("réponse".encode("utf-8"))}
+    assert not list(tmp_path.glob("*/*.tmp"))
+
+
+def test_keys_depend_on_model_instruction_and_prompt():
+    keys = {ResponseCache.make_key(*parts) for parts in
+            [("a", "s", "p"), ("b", "s", "p"), ("a", "t", "p"), ("a", "s", "q")]}
+    assert len(keys) == 4
+    assert ResponseCache.make_key("a", "s", "p") == ResponseCache.make_key("a", "s", "p")
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=25)
+    for name in "abc":
+        cache.put(name * 64, name * 10)
+    assert cache.get("a" * 64) is None
+    assert cache.get("b" * 64) == "b" * 10
+    cache.put("d" * 64, "d" * 10)
+    # b was read after c was written, so c goes first
+    assert cache.get("c" * 64) is None
+    assert cache.get("b" * 64) == "b" * 10
+    assert cache.stats()["bytes"] <= 25
+
+
+def test_index_survives_restart_in_lru_order(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.put("a" * 64, "old")
+    cache.put("b" * 64, "new")
+    os.utime(cache._path("a" * 64), (1, 1))
+    reopened = ResponseCache(str(tmp_path), max_bytes=3)
+    assert reopened.stats()["entries"] == 2
+    reopened.put("c" * 64, "xyz")
+    assert reopened.get("a" * 64) is None
+    assert reopened.get("c" * 64) == "xyz"
+
+
+def test_generate_uses_cache(tmp_path):
+    llm = FakeLLMClient(latency=0.0, jitter=0.0, cache=ResponseCache(str(tmp_path)))
+    first = llm.generate(PROMPT)
+    assert llm.generate(PROMPT) == first
+    assert llm.calls == 1
+    assert llm.generate(PROMPT, use_cache=False) == first
+    assert llm.calls == 2
+
+
+def test_rejected_responses_are_not_cached(tmp_path):
+    llm = FakeLLMClient(latency=0.0, jitter=0.0, cache=ResponseCache(str(tmp_path)))
+    reject = lambda text: False
+    llm.generate(PROMPT, validate=reject)
+    llm.generate(PROMPT, validate=reject)
+    assert llm.calls == 2
+    assert llm.cache.stats()["entries"] == 0
+
+
+def test_cached_response_failing_validation_is_asked_again(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    llm = FakeLLMClient(latency=0.0, jitter=0.0, cache=cache)
+    key = ResponseCache.make_key(llm.router.choose(PROMPT, "auto"), "", PROMPT)
+    cache.put(key, "stale")
+    assert llm.generate(PROMPT) == "stale"
+    fresh = llm.generate(PROMPT, validate=lambda text: text != "stale")
+    assert fresh.startswith("package com.acme;")
+    assert cache.get(key) == fresh
+    assert llm.calls == 1
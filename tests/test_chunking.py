@@ -0,0 +1,120 @@
+import pytest
+from migrator_tool.chunking import (assemble_class, chunk_members, merge_partial_sources, parse_layout,
+                                    split_chunk_output)
+from migrator_tool.symbols import blank_noise, type_declarations
+
+SERVICE = '''using System;
+using System.Linq;
+
+namespace Shop.Services
+{
+    // Orders
+    public class OrderService : IOrderService
+    {
+        private readonly int _limit = 10;
+        public string Name { get; set; } = "orders";
+        public int Count => _limit;
+
+        [Obsolete("x }")]
+        public int Total(int a)
+        {
+            if (a > 0) { return a; }
+            return 0;
+        }
+
+        public void Run() => Console.WriteLine("}");
+    }
+}
+'''
+
+
+def test_parse_layout_splits_members_and_round_trips():
+    layout = parse_layout(SERVICE)
+    assert layout.name == "OrderService"
+    assert len(layout.members) == 5
+    assert layout.header + "".join(layout.members) + layout.footer == SERVICE
+    # Attributes and braces inside strings stay with their member
+    assert '[Obsolete("x }")]' in layout.members[3]
+    assert layout.members[3].rstrip().endswith("}")
+    assert layout.footer.strip() == "}\n}"
+
+
+def test_skeleton_drops_bodies_and_initialisers():
+    skeleton = parse_layout(SERVICE).skeleton()
+    assert "public string Name { get; set; }" in skeleton
+    assert "public int Count { get; }" in skeleton
+    assert "public int Total(int a);" in skeleton
+    assert "return 0" not in skeleton
+    assert "= 10" not in skeleton
+    assert skeleton.count("{") == skeleton.count("}")
+
+
+def test_skeleton_truncates_long_member_lists():
+    skeleton = parse_layout(SERVICE).skeleton(max_chars=60)
+    assert "more members" in skeleton
+
+
+def test_parse_layout_rejects_files_without_a_single_main_type():
+    assert parse_layout("using System;\n") is None
+    big = "public class A\n{\n" + "    int a;\n" * 300 + "}\n"
+    assert parse_layout(big + big.replace("class A", "class B")) is None
+    assert parse_layout("public class A\n{\n    void F() {\n") is None
+
+
+def test_parse_layout_keeps_nested_types_inside_members():
+    source = "public class Outer\n{\n    public class Inner { int x; }\n    int y;\n}\n"
+    layout = parse_layout(source)
+    assert layout.name == "Outer"
+    assert [m.strip() for m in layout.members] == ["public class Inner { int x; }", "int y;"]
+
+
+def test_chunk_members_packs_consecutive_members():
+    chunks = chunk_members(["a" * 4, "b" * 4, "c" * 4], max_chunk_chars=8)
+    assert chunks == ["aaaabbbb", "cccc"]
+    assert chunk_members(["x" * 20], max_chunk_chars=8) == ["x" * 20]
+
+
+def test_split_chunk_output_unwraps_class_and_collects_imports():
+    java = ("package a.b;\nimport java.util.List;\n\n@Service\npublic class X {\n"
+            "    int f() { return 1; }\n}\n")
+    assert split_chunk_output(java) == (["import java.util.List;"], "int f() { return 1; }")
+    assert split_chunk_output("int g() {\n    return 2;\n}") == ([], "int g() {\n    return 2;\n}")
+
+
+def test_assemble_class_inserts_members_and_merges_imports():
+    shell = "package a;\n\nimport java.util.Map;\n\npublic class OrderService {\n}\n"
+    java = assemble_class(shell, ["import java.util.List;", "import java.util.Map;", "import java.util.List;"],
+                          ["int a() {\n    return 1;\n}", "", "int b;"])
+    assert java.count("import java.util.Map;") == 1
+    assert java.count("import java.util.List;") == 1
+    assert java.index("import java.util.List;") < java.index("public class")
+    assert "    int a() {\n        return 1;\n    }\n\n    int b;\n}\n" in java
+
+
+def test_assemble_class_without_imports_uses_package_as_anchor():
+    java = assemble_class("package a;\n\npublic class X {\n}\n", ["import java.util.List;"], ["int b;"])
+    assert java.startswith("package a;\nimport java.util.List;\n")
+
+
+def test_assemble_class_needs_a_body():
+    with pytest.raises(ValueError):
+        assemble_class("package a;", [], ["int b;"])
+
+
+def test_merge_partial_sources_appends_members_and_usings():
+    main = "using System;\n\nnamespace N\n{\n    public partial class Svc\n    {\n        int a;\n    }\n}\n"
+    extra = "using System.Linq;\nusing System;\n\nnamespace N\n{\n    public partial class Svc\n    {\n        int b;\n    }\n}\n"
+    merged = merge_partial_sources([main, extra])
+    assert merged.startswith("using System.Linq;\n")
+    assert merged.count("using System;") == 1
+    layout = parse_layout(merged)
+    assert [m.strip() for m in layout.members] == ["int a;", "int b;"]
+    assert merged.count("{") == merged.count("}")
+
+
+def test_blank_noise_keeps_offsets_and_hides_braces_in_literals():
+    source = 'var s = "{ class Fake }"; // class Other {\nclass Real { }'
+    blank = blank_noise(source)
+    assert len(blank) == len(source) and blank.count("\n") == 1
+    assert [m.group("name") for m in type_declarations(blank)] == ["Real"]
+    assert blank.index("class Real") == source.index("class Real")
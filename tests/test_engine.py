@@ -0,0 +1,102 @@
+import time
+from migrator_tool.engine import TranslationEngine, plan_units
+from migrator_tool.fake_llm import FakeLLMClient
+from migrator_tool.models import FileMapping, MigrationPlan
+from migrator_tool.resilience import RetryPolicy
+from migrator_tool.translator import CodeTranslator
+
+SERVICE = "public class {name}\n{{\n    public int Run(int input) {{ return input; }}\n}}\n"
+MODEL = "public enum {name} {{ A, B }}\n"
+
+
+def _mapping(name, package="com.shop"):
+    return FileMapping(source_file=f"{name}.cs", target_path=f"src/main/java/{package.replace('.', '/')}/{name}.java",
+                       package_name=package)
+
+
+def _plan(mappings):
+    return MigrationPlan(project_name="Shop", dependencies=[], file_mappings=mappings, application_properties={})
+
+
+class CountingLLM(FakeLLMClient):
+    def __init__(self, fail=False, slow=None, **kwargs):
+        self.fail = fail
+        self.slow = slow
+        self.prompts = []
+        super().__init__(latency=0.0, jitter=0.0, retry=RetryPolicy(max_attempts=1), **kwargs)
+
+    def _send(self, model_name, system_instruction, prompt):
+        self.prompts.append(prompt)
+        if self.fail:
+            raise PermissionError("denied")
+        if self.slow and f"class {self.slow}" in prompt:
+            time.sleep(0.5)
+        return super()._send(model_name, system_instruction, prompt)
+
+
+def test_results_are_yielded_in_order_and_completion_reported_early():
+    names = ["Slow", "B", "C"]
+    mappings = [_mapping(n) for n in names]
+    sources = {f"{n}.cs": SERVICE.format(name=n) for n in names}
+    engine = TranslationEngine(CodeTranslator(CountingLLM(slow="Slow")), workers=3)
+    completed = []
+    results = list(engine.run(mappings, lambda m: sources[m.source_file], _plan(mappings),
+                              on_complete=lambda r: completed.append(r.mapping.source_file)))
+    assert [r.mapping.source_file for r in results] == ["Slow.cs", "B.cs", "C.cs"]
+    assert completed[-1] == "Slow.cs"
+    assert all(r.error is None and "class" in r.java_code for r in results)
+
+
+def test_plan_units_groups_small_files_per_package():
+    mappings = [_mapping("A"), _mapping("B", "com.other"), _mapping("C"), _mapping("Big"), _mapping("D")]
+    sizes = {"Big.cs": 10_000}
+    size_of = lambda m: sizes.get(m.source_file, 100)
+    assert plan_units(mappings, size_of, batch_size=2) == [[0, 2], [3], [1], [4]]
+    assert plan_units(mappings, size_of, batch_size=1) == [[0], [1], [2], [3], [4]]
+    assert plan_units(mappings, None, batch_size=4) == [[0], [1], [2], [3], [4]]
+
+
+def test_batch_is_one_request_and_counts_each_file_once():
+    names = ["A", "B", "C"]
+    mappings = [_mapping(n) for n in names] + [_mapping("Status")]
+    sources = {f"{n}.cs": SERVICE.format(name=n) for n in names}
+    sources["Status.cs"] = MODEL.format(name="Status")
+    llm = CountingLLM()
+    translator = CodeTranslator(llm)
+    engine = TranslationEngine(translator, batch_size=4)
+    results = list(engine.run(mappings, lambda m: sources[m.source_file], _plan(mappings),
+                              size_of=lambda m: len(sources[m.source_file])))
+    assert len(llm.prompts) == 1
+    assert "Source C# Files:" in llm.prompts[0]
+    assert [r.error for r in results] == [None] * 4
+    assert (translator.fast_path_files, translator.llm_files) == (1, 3)
+
+
+def test_failed_batch_with_one_llm_member_is_counted_once():
+    mappings = [_mapping("Status"), _mapping("A")]
+    sources = {"Status.cs": MODEL.format(name="Status"), "A.cs": SERVICE.format(name="A")}
+    translator = CodeTranslator(CountingLLM(fail=True))
+    engine = TranslationEngine(translator, batch_size=2)
+    results = list(engine.run(mappings, lambda m: sources[m.source_file], _plan(mappings),
+                              size_of=lambda m: len(sources[m.source_file])))
+    # The batch raised, the engine retried each member alone
+    assert results[0].error is None
+    assert isinstance(results[1].error, PermissionError)
+    assert (translator.fast_path_files, translator.llm_files) == (1, 1)
+
+
+def test_members_missing_from_a_batch_answer_are_retried_alone():
+    names = ["A", "B"]
+    mappings = [_mapping(n) for n in names]
+    sources = {f"{n}.cs": SERVICE.format(name=n) for n in names}
+    llm = CountingLLM()
+    original = llm._respond
+    # Batch answers are garbage; single-file answers are fine
+    llm._respond = lambda prompt: "nonsense" if "Source C# Files:" in prompt else original(prompt)
+    translator = CodeTranslator(llm)
+    results = list(TranslationEngine(translator, batch_size=2).run(
+        mappings, lambda m: sources[m.source_file], _plan(mappings), size_of=lambda m: len(sources[m.source_file])))
+    assert all(r.error is None and f"class {r.mapping.source_file[:-3]}" in r.java_code for r in results)
+    # One batch request, then each member alone
+    assert len(llm.prompts) == 3
+    assert translator.llm_files == 2
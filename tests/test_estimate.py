@@ -0,0 +1,65 @@
+from migrator_tool.estimate import PLAN_TEMPLATE_TOKENS, MigrationEstimator, estimate_tokens
+from migrator_tool.planner import planning_inputs
+from migrator_tool.scanner import ProjectScanner
+
+METHOD = """
+    public int Method{i}(int input)
+    {{
+        var total = input;
+        for (var step = 0; step < {i}; step++) {{ total += step * 2; }}
+        return total;
+    }}
+"""
+
+PROJECT = """<Project Sdk="Microsoft.NET.Sdk.Web">
+  <PropertyGroup>
+    <TargetFramework>net8.0</TargetFramework>
+  </PropertyGroup>
+  <ItemGroup>
+    <!-- Packages the resolver maps locally never reach the model -->
+    <PackageReference Include="Newtonsoft.Json" Version="13.0.1" />
+    <PackageReference Include="Microsoft.EntityFrameworkCore" Version="8.0.0" />
+    <PackageReference Include="Microsoft.EntityFrameworkCore.SqlServer" Version="8.0.0" />
+    <PackageReference Include="Serilog.AspNetCore" Version="8.0.0" />
+  </ItemGroup>
+</Project>
+"""
+
+
+def _scan(root, methods=150):
+    (root / "Services").mkdir(parents=True)
+    body = "".join(METHOD.format(i=i) for i in range(methods))
+    (root / "Services" / "Big.cs").write_text(f"namespace App\n{{\npublic class Big\n{{{body}}}\n}}\n",
+                                              encoding="utf-8")
+    (root / "Services" / "Small.cs").write_text("public class Small { public int Run() { return 1; } }\n",
+                                                encoding="utf-8")
+    (root / "App.csproj").write_text(PROJECT, encoding="utf-8")
+    return ProjectScanner(str(root)).scan(lazy=True, index_symbols=True)
+
+
+def test_large_files_count_a_call_per_chunk(tmp_path):
+    scan_result = _scan(tmp_path)
+    big = len(scan_result["contents"]["Services/Big.cs"])
+    assert big > 20000
+
+    chunked = MigrationEstimator(chunk_chars=20000).estimate(scan_result)
+    whole = MigrationEstimator(chunk_chars=0).estimate(scan_result)
+    record = next(r for r in chunked["per_file"] if r["file"] == "Services/Big.cs")
+    # A shell call plus at least big / 8000 member chunks
+    assert record["calls"] >= 1 + big // 8000
+    assert chunked["phases"]["translate"]["calls"] == record["calls"] + 1
+    assert whole["phases"]["translate"]["calls"] == 2
+    # Every chunk prompt carries the skeleton again
+    assert chunked["phases"]["translate"]["prompt_tokens"] > whole["phases"]["translate"]["prompt_tokens"]
+
+    # Below the threshold the file is translated whole
+    assert MigrationEstimator(chunk_chars=big + 1).estimate(scan_result)["phases"]["translate"]["calls"] == 2
+
+
+def test_planning_prompt_uses_the_summarized_project(tmp_path):
+    scan_result = _scan(tmp_path, methods=1)
+    plan = MigrationEstimator().estimate(scan_result)["phases"]["plan"]
+    raw = sum(estimate_tokens(text) for text in planning_inputs(scan_result).values())
+    assert plan["calls"] == 1
+    # The XML is well over what the planner sends for it
+    assert plan["prompt_tokens"] - PLAN_TEMPLATE_TOKENS < raw
@@ -0,0 +1,115 @@
+import pytest
+from migrator_tool.fake_llm import FakeLLMClient
+from migrator_tool.fastpath import RuleBasedTranslator
+from migrator_tool.models import FileMapping, MigrationPlan
+from migrator_tool.symbols import SymbolIndex
+from migrator_tool.translator import CodeTranslator
+
+MAPPING = FileMapping(source_file="Models/Order.cs", target_path="src/main/java/com/shop/model/Order.java",
+                      package_name="com.shop.model")
+PLAN = MigrationPlan(project_name="Shop", dependencies=[], file_mappings=[MAPPING], application_properties={})
+
+
+def _translate(source, plan=PLAN, resolve_type=None):
+    return RuleBasedTranslator(resolve_type).try_translate(source, MAPPING, plan)
+
+
+def test_data_class_with_initialisers_and_computed_getter():
+    java = _translate("""
+using System;
+namespace Shop.Models
+{
+    public class Order
+    {
+        public Guid Id { get; set; }
+        public string Name { get; set; } = string.Empty;
+        public decimal? Total { get; init; }
+        public List<string> Tags { get; set; } = new();
+        public int TemperatureC { get; set; }
+        public int TemperatureF => 32 + (int)(TemperatureC / 0.5556);
+    }
+}
+""")
+    assert java == """package com.shop.model;
+
+import java.math.BigDecimal;
+import java.util.ArrayList;
+import java.util.List;
+import java.util.UUID;
+import lombok.Data;
+
+@Data
+public class Order {
+    private UUID id;
+    private String name = "";
+    private BigDecimal total;
+    private List<String> tags = new ArrayList<>();
+    private int temperatureC;
+
+    public int getTemperatureF() {
+        return 32 + (int) (temperatureC / 0.5556);
+    }
+}
+"""
+
+
+def test_record_and_enum():
+    assert _translate("namespace Shop;\npublic record Line(string Sku, int? Quantity);") == \
+        "package com.shop.model;\n\npublic record Line(String sku, Integer quantity) {\n}\n"
+    assert _translate("public enum Status { Open, Closed }") == \
+        "package com.shop.model;\n\npublic enum Status {\n    Open, Closed\n}\n"
+
+
+def test_records_need_java_16():
+    plan = PLAN.model_copy(update={"java_version": "11"})
+    assert _translate("public record Line(string Sku);", plan=plan) is None
+
+
+def test_project_types_resolve_through_the_callback():
+    source = "public class Order { public Customer Buyer { get; set; } }"
+    assert _translate(source) is None
+    java = _translate(source, resolve_type=lambda name: "com.shop.crm.Customer" if name == "Customer" else None)
+    assert "import com.shop.crm.Customer;" in java
+    assert "private Customer buyer;" in java
+
+
+@pytest.mark.parametrize("source", [
+    "public class Order { public void Ship() { } }",
+    "[Table(\"orders\")]\npublic class Order { public int Id { get; set; } }",
+    "public class Order { public int Id { get; set; } }\npublic class Line { }",
+    "public enum Flags { A = 1, B = 2 }",
+    "public class Order { public string Name { get; set; } = Compute(); }",
+])
+def test_anything_else_goes_to_the_llm(source):
+    assert _translate(source) is None
+
+
+@pytest.mark.parametrize("source", [
+    "public class Order { public string Default { get; set; } }",
+    "public class Order { public bool Public { get; set; } }",
+    "public class Order { public int Class { get; set; } }",
+])
+def test_data_class_reserved_word_fields_go_to_the_llm(source):
+    assert _translate(source) is None
+
+
+@pytest.mark.parametrize("source", [
+    "public record Pkg(string Package, int New);",
+    "public record Pkg(string Name, bool Final);",
+])
+def test_record_reserved_word_components_go_to_the_llm(source):
+    assert _translate(source) is None
+
+
+def test_enum_reserved_word_members_go_to_the_llm():
+    assert _translate("public enum Modifier { native, transient }") is None
+
+
+def test_translator_falls_back_to_the_llm_for_reserved_words():
+    symbols = SymbolIndex()
+    source = "public class Order { public string Default { get; set; } }"
+    symbols.add_file(MAPPING.source_file, source)
+    translator = CodeTranslator(FakeLLMClient(latency=0.0, jitter=0.0), symbol_index=symbols)
+    java = translator.translate_file(source, MAPPING, PLAN)
+    assert "default;" not in java
+    assert (translator.fast_path_files, translator.llm_files) == (0, 1)
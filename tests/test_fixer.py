@@ -0,0 +1,82 @@
+import threading
+from migrator_tool.fake_llm import FakeLLMClient
+from migrator_tool.fixer import FixerAgent
+
+# Compiler lists them least-depended-on first; Core is used by all the others
+SOURCES = {
+    "Api": "public class Api { Service s; Repo r; Core c; }",
+    "Service": "public class Service { Repo r; Core c; }",
+    "Repo": "public class Repo { Core c; }",
+    "Core": "public class Core { }",
+}
+
+
+class ScriptedBuildFixer(FixerAgent):
+    """Builds replay a canned log; fixes are recorded instead of calling the model."""
+    def __init__(self, project_dir, log, **kwargs):
+        super().__init__(project_dir, FakeLLMClient(latency=0.0, jitter=0.0), **kwargs)
+        self.log = log
+        self.fixed = []
+        self.build_over = threading.Event()
+
+    def run_fast_check(self, on_line=None):
+        for line in self.log:
+            on_line(line)
+        self.build_over.set()
+        return False, "\n".join(self.log)
+
+    def fix_file(self, file_path, error_msgs, patch=None):
+        # The first fix holds its worker until the build is over, so the rest queue up
+        self.build_over.wait(5)
+        self.fixed.append((file_path, error_msgs, patch))
+
+
+def _project(tmp_path):
+    package = tmp_path / "src" / "main" / "java" / "a"
+    package.mkdir(parents=True)
+    for name, source in SOURCES.items():
+        (package / f"{name}.java").write_text(f"package a;\n{source}\n", encoding="utf-8")
+    return tmp_path
+
+
+def _error(project, name, line, msg):
+    return f"[ERROR] {project}/src/main/java/a/{name}.java:[{line},1] {msg}"
+
+
+def test_prioritize_puts_most_depended_on_files_first(tmp_path):
+    project = _project(tmp_path)
+    agent = FixerAgent(str(project), FakeLLMClient(latency=0.0, jitter=0.0))
+    errors = {f"src/main/java/a/{name}.java": ["Line 1: x"] for name in SOURCES}
+    assert agent.prioritize(errors) == [f"src/main/java/a/{name}.java" for name in
+                                        ("Core", "Repo", "Service", "Api")]
+
+
+def test_streamed_files_are_fixed_by_dependents(tmp_path):
+    project = _project(tmp_path)
+    log = [_error(project, name, 2, "cannot find symbol") for name in SOURCES]
+    log += ["[INFO] 4 errors", "[INFO] BUILD FAILURE"]
+    agent = ScriptedBuildFixer(str(project), log, workers=1)
+    assert agent.auto_heal(max_retries=1) is False
+
+    order = [path.rsplit("/", 1)[1][:-5] for path, _, _ in agent.fixed]
+    # The idle worker took whatever was queued first; everything queued behind it is prioritized
+    rank = ["Core", "Repo", "Service", "Api"]
+    assert sorted(order) == sorted(rank)
+    assert order[1:] == sorted(order[1:], key=rank.index)
+    assert order != list(SOURCES)
+
+
+def test_late_errors_are_fixed_in_the_same_attempt(tmp_path):
+    project = _project(tmp_path)
+    log = [_error(project, "Repo", 2, "cannot find symbol"), _error(project, "Core", 2, "';' expected"),
+           "[INFO] 2 errors",
+           # Second compile pass: one new error in Repo, one repeat
+           _error(project, "Repo", 2, "cannot find symbol"), _error(project, "Repo", 7, "incompatible types"),
+           "[INFO] BUILD FAILURE"]
+    agent = ScriptedBuildFixer(str(project), log, workers=2)
+    agent.auto_heal(max_retries=1)
+
+    repo_fixes = [(msgs, patch) for path, msgs, patch in agent.fixed if path.endswith("Repo.java")]
+    # The follow-up waits for the first fix and rewrites instead of patching stale line numbers
+    assert repo_fixes == [(["Line 2: cannot find symbol"], None), (["Line 7: incompatible types"], False)]
+    assert len(agent.fixed) == 3
@@ -0,0 +1,99 @@
+from migrator_tool.fake_llm import FakeLLMClient
+from migrator_tool.journal import JOURNAL_DIR, MigrationJournal
+from migrator_tool.manifest import MANIFEST_FILE
+from migrator_tool.models import FileMapping, JournalRecord, MigrationPlan
+from migrator_tool.pipeline import migrate_project
+
+
+def _plan(*names):
+    mappings = [FileMapping(source_file=f"{n}.cs", target_path=f"src/main/java/a/{n}.java", package_name="a")
+                for n in names]
+    return MigrationPlan(project_name="Shop", dependencies=[], file_mappings=mappings, application_properties={})
+
+
+def _record(name, source_hash="h1"):
+    return JournalRecord(source_file=f"{name}.cs", source_hash=source_hash, target_path=f"src/main/java/a/{name}.java",
+                         java_hash="j")
+
+
+class FailingClassLLM(FakeLLMClient):
+    """Fails translations of one class; counts planning calls."""
+    def __init__(self, failing=None):
+        self.failing = failing
+        self.plans = 0
+        super().__init__(latency=0.0, jitter=0.0)
+
+    def _send(self, model_name, system_instruction, prompt):
+        if "migration plan" in prompt:
+            self.plans += 1
+        if self.failing and f"public class {self.failing}" in prompt:
+            raise PermissionError("denied")
+        return super()._send(model_name, system_instruction, prompt)
+
+
+def test_plan_is_only_loaded_for_the_same_input(tmp_path):
+    journal = MigrationJournal(str(tmp_path / "out"))
+    assert journal.load_plan(str(tmp_path / "in")) is None
+    journal.start(str(tmp_path / "in"), _plan("Order"))
+    assert [m.source_file for m in journal.load_plan(str(tmp_path / "in")).file_mappings] == ["Order.cs"]
+    assert journal.load_plan(str(tmp_path / "other")) is None
+
+
+def test_completed_ignores_a_torn_last_line_and_later_records_win(tmp_path):
+    journal = MigrationJournal(str(tmp_path))
+    journal.start(str(tmp_path), _plan("Order", "Line"))
+    journal.append(_record("Order", "h1"))
+    journal.append(_record("Order", "h2"))
+    journal.append(_record("Line"))
+    journal.close()
+    with open(journal.records_path, "a", encoding="utf-8") as f:
+        f.write('{"source_file": "Item.cs", "sour')
+
+    completed = MigrationJournal(str(tmp_path)).completed()
+    assert sorted(completed) == ["Line.cs", "Order.cs"]
+    assert completed["Order.cs"].source_hash == "h2"
+
+
+def test_is_done_needs_same_source_target_and_output_on_disk(tmp_path):
+    journal = MigrationJournal(str(tmp_path))
+    plan = _plan("Order")
+    mapping = plan.file_mappings[0]
+    completed = {"Order.cs": _record("Order")}
+    assert not journal.is_done(completed, mapping, "h1")  # output not written
+    (tmp_path / mapping.target_path).parent.mkdir(parents=True)
+    (tmp_path / mapping.target_path).write_text("class Order {}", encoding="utf-8")
+    assert journal.is_done(completed, mapping, "h1")
+    assert not journal.is_done(completed, mapping, "edited")
+    assert not journal.is_done(completed, mapping.model_copy(update={"target_path": "src/Other.java"}), "h1")
+
+
+def test_start_and_finish_clear_earlier_runs(tmp_path):
+    journal = MigrationJournal(str(tmp_path))
+    journal.start(str(tmp_path), _plan("Order"))
+    journal.append(_record("Order"))
+    journal.start(str(tmp_path), _plan("Order"))
+    assert journal.completed() == {}
+    journal.finish()
+    assert not (tmp_path / JOURNAL_DIR).exists()
+
+
+def test_resume_reuses_the_plan_and_finished_files(tmp_path):
+    source = tmp_path / "in" / "Services"
+    source.mkdir(parents=True)
+    for name in ("Good", "Bad"):
+        (source / f"{name}.cs").write_text(f"public class {name} {{ public int Run() {{ return 1; }} }}\n",
+                                           encoding="utf-8")
+    out = tmp_path / "out"
+    first = migrate_project(FailingClassLLM(failing="Bad"), str(tmp_path / "in"), str(out), {})
+    assert first["failed"] == ["Services/Bad.cs"]
+    assert (out / JOURNAL_DIR).exists()
+    # As if the run died before saving its manifest
+    (out / MANIFEST_FILE).unlink()
+
+    llm = FailingClassLLM()
+    messages = []
+    second = migrate_project(llm, str(tmp_path / "in"), str(out), {"resume": True}, on_message=messages.append)
+    assert llm.plans == 0
+    assert (second["translated"], second["failed"]) == (1, [])
+    assert any("1 file(s) finished before the interruption" in m for m in messages)
+    assert not (out / JOURNAL_DIR).exists()
@@ -0,0 +1,150 @@
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from migrator_tool.fake_llm import FakeLLMClient, SimulatedLLMError, SimulatedQuotaError
+from migrator_tool.resilience import AdaptiveRateLimiter, LLMTimeoutError, RetryPolicy, classify_error
+
+NO_WAIT = dict(latency=0.0, jitter=0.0)
+
+
+class ScriptedLLM(FakeLLMClient):
+    """FakeLLMClient whose calls follow a script: an exception to raise or (seconds, text) to answer with."""
+    def __init__(self, script, **kwargs):
+        self.script = list(script)
+        self._script_lock = threading.Lock()
+        kwargs.setdefault("retry", RetryPolicy(max_attempts=3, base_delay=0))
+        super().__init__(**NO_WAIT, **kwargs)
+
+    def _send(self, model_name, system_instruction, prompt):
+        with self._script_lock:
+            self.calls += 1
+            step = self.script.pop(0) if self.script else (0.0, "ok")
+        if isinstance(step, Exception):
+            raise step
+        delay, text = step
+        time.sleep(delay)
+        return SimpleNamespace(text=text, usage_metadata=None)
+
+
+class PermissionDenied(Exception):
+    code = 403
+
+
+def test_classify_error():
+    assert classify_error(SimulatedQuotaError()) == "throttle"
+    assert classify_error(SimulatedLLMError()) == "transient"
+    assert classify_error(LLMTimeoutError()) == "transient"
+    assert classify_error(ConnectionResetError()) == "transient"
+    assert classify_error(type("ServiceUnavailable", (Exception,), {})()) == "transient"
+    assert classify_error(SimpleNamespace(code=SimpleNamespace(value=(429, "RESOURCE_EXHAUSTED")))) == "throttle"
+    assert classify_error(PermissionDenied()) == "fatal"
+    assert classify_error(ValueError()) == "fatal"
+
+
+def test_retry_delay_is_jittered_and_capped():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0, seed=1)
+    delays = [policy.delay(attempt) for attempt in range(10)]
+    assert all(0 <= d <= 4.0 for d in delays)
+    assert delays[0] <= 1.0
+    assert len(set(delays)) == len(delays)
+
+
+def test_rate_limiter_backs_off_once_per_cooldown():
+    limiter = AdaptiveRateLimiter(rate=8.0, min_rate=1.0, cooldown=60)
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.rate == 4.0
+    limiter.on_success()
+    assert limiter.rate == 4.25
+    for _ in range(5):
+        limiter._last_decrease = float("-inf")
+        limiter.on_throttle()
+    assert limiter.rate == 1.0
+
+
+def test_transient_errors_are_retried():
+    llm = ScriptedLLM([SimulatedLLMError("503"), LLMTimeoutError("slow"), (0.0, "answer")])
+    assert llm.generate("prompt") == "answer"
+    assert llm.calls == 3
+
+
+def test_retries_give_up_after_max_attempts():
+    llm = FakeLLMClient(**NO_WAIT, failure_rate=1.0, retry=RetryPolicy(max_attempts=3, base_delay=0))
+    with pytest.raises(SimulatedLLMError):
+        llm.generate("prompt")
+    assert llm.calls == 3
+
+
+def test_fatal_errors_are_not_retried():
+    llm = ScriptedLLM([PermissionDenied("no access"), (0.0, "never")])
+    with pytest.raises(PermissionDenied):
+        llm.generate("prompt")
+    assert llm.calls == 1
+
+
+def test_throttling_slows_the_shared_rate_limiter():
+    limiter = AdaptiveRateLimiter(rate=50.0, cooldown=0)
+    llm = FakeLLMClient(**NO_WAIT, throttle_rate=1.0, rate_limiter=limiter,
+                        retry=RetryPolicy(max_attempts=2, base_delay=0))
+    with pytest.raises(SimulatedQuotaError):
+        llm.generate("prompt")
+    assert llm.calls == 2
+    assert limiter.rate == 12.5
+
+
+def test_call_past_deadline_is_abandoned_and_retried():
+    llm = ScriptedLLM([(1.0, "too late"), (0.0, "in time")], max_in_flight=2, timeout=0.1)
+    start = time.perf_counter()
+    assert llm.generate("prompt") == "in time"
+    assert time.perf_counter() - start < 0.8
+    assert llm.calls == 2
+
+
+def test_deadline_error_after_last_attempt_and_slot_is_returned():
+    llm = ScriptedLLM([(0.3, "too late")], max_in_flight=1, timeout=0.05, retry=RetryPolicy(max_attempts=1))
+    with pytest.raises(LLMTimeoutError):
+        llm.generate("prompt")
+    # The abandoned request gave its slot back right away, though it is still running
+    assert llm._in_flight.acquire(blocking=False)
+    llm._in_flight.release()
+    assert llm.generate("again") == "ok"
+
+
+def test_retry_is_not_blocked_by_the_abandoned_call():
+    llm = ScriptedLLM([(1.0, "too late"), (0.0, "in time")], max_in_flight=1, timeout=0.1)
+    start = time.perf_counter()
+    assert llm.generate("prompt") == "in time"
+    assert time.perf_counter() - start < 0.5
+
+
+def test_abandoned_calls_keep_their_slot_once_spare_threads_run_out():
+    # The first abandoned call gets the spare thread; the second keeps its slot until it ends
+    llm = ScriptedLLM([(0.6, "late"), (0.6, "late"), (0.0, "in time")], max_in_flight=1, timeout=0.1)
+    start = time.perf_counter()
+    assert llm.generate("prompt") == "in time"
+    assert 0.5 < time.perf_counter() - start < 1.0
+
+
+def test_straggler_is_hedged_and_first_answer_wins():
+    llm = ScriptedLLM([(2.0, "straggler"), (0.0, "hedge")], hedge_percentile=90)
+    model = llm.router.choose("prompt", "auto")
+    for _ in range(llm.latencies.min_samples):
+        llm.latencies.observe(model, 0.01)
+    start = time.perf_counter()
+    assert llm.generate("prompt") == "hedge"
+    assert time.perf_counter() - start < 1.0
+    assert llm.calls == 2
+
+
+def test_no_hedging_without_latency_history():
+    llm = ScriptedLLM([(0.2, "only")], hedge_percentile=90)
+    assert llm.generate("prompt") == "only"
+    assert llm.calls == 1
+
+
+def test_fake_llm_answers_pipeline_prompts():
+    llm = FakeLLMClient(**NO_WAIT)
+    java = llm.generate("Package Name: com.acme.orders\nSource C# Code:\npublic class OrderService { }")
+    assert java.startswith("package com.acme.orders;")
+    assert "public class OrderService" in java
@@ -0,0 +1,73 @@
+from migrator_tool.fake_llm import FakeLLMClient
+from migrator_tool.manifest import MANIFEST_FILE, ManifestTracker, hash_content
+from migrator_tool.models import FileMapping
+from migrator_tool.pipeline import migrate_project
+
+
+def _mapping(name, package="com.shop"):
+    return FileMapping(source_file=f"{name}.cs", target_path=f"src/main/java/{package.replace('.', '/')}/{name}.java",
+                       package_name=package)
+
+
+def _write(root, mapping, code="class X {}"):
+    path = root / mapping.target_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(code, encoding="utf-8")
+
+
+def test_only_unchanged_sources_with_the_same_mapping_and_output_are_up_to_date(tmp_path):
+    order, line, item, gone = _mapping("Order"), _mapping("Line"), _mapping("Item"), _mapping("Gone")
+    first = ManifestTracker(str(tmp_path))
+    for mapping in (order, line, item, gone):
+        _write(tmp_path, mapping)
+        first.record(mapping, hash_content(mapping.source_file), "class X {}")
+    first.save()
+    (tmp_path / gone.target_path).unlink()
+
+    second = ManifestTracker(str(tmp_path))
+    assert second.is_up_to_date(order, hash_content("Order.cs"))
+    assert not second.is_up_to_date(line, hash_content("edited"))
+    assert not second.is_up_to_date(_mapping("Item", "com.shop.items"), hash_content("Item.cs"))
+    assert not second.is_up_to_date(gone, hash_content("Gone.cs"))
+    assert not second.is_up_to_date(_mapping("New"), hash_content("New.cs"))
+    # Only what was carried forward or recorded again ends up in the next manifest
+    assert list(second.current.entries) == ["Order.cs"]
+
+
+def test_remove_stale_deletes_outputs_no_mapping_produces(tmp_path):
+    order, line, item = _mapping("Order"), _mapping("Line"), _mapping("Item")
+    first = ManifestTracker(str(tmp_path))
+    for mapping in (order, line, item):
+        _write(tmp_path, mapping)
+        first.record_hash(mapping, hash_content(mapping.source_file), "java")
+    first.save()
+
+    # Line.cs was deleted and Item.cs moved to another package
+    moved = _mapping("Item", "com.shop.items")
+    removed = ManifestTracker(str(tmp_path)).remove_stale([order, moved])
+    assert sorted(removed) == [item.target_path, line.target_path]
+    assert (tmp_path / order.target_path).exists()
+    assert not (tmp_path / line.target_path).exists()
+
+
+def test_corrupt_manifest_means_a_full_run(tmp_path):
+    (tmp_path / MANIFEST_FILE).write_text("{not json", encoding="utf-8")
+    order = _mapping("Order")
+    _write(tmp_path, order)
+    assert not ManifestTracker(str(tmp_path)).is_up_to_date(order, hash_content("Order.cs"))
+
+
+def test_migrate_removes_the_output_of_a_deleted_source(tmp_path):
+    source = tmp_path / "in" / "Services"
+    source.mkdir(parents=True)
+    for name in ("Keep", "Drop"):
+        (source / f"{name}.cs").write_text(f"public class {name} {{ public int Run() {{ return 1; }} }}\n",
+                                           encoding="utf-8")
+    out = tmp_path / "out"
+    migrate_project(FakeLLMClient(latency=0.0, jitter=0.0), str(tmp_path / "in"), str(out), {})
+    assert sorted(p.name for p in out.rglob("*.java")) == ["Drop.java", "Keep.java"]
+
+    (source / "Drop.cs").unlink()
+    result = migrate_project(FakeLLMClient(latency=0.0, jitter=0.0), str(tmp_path / "in"), str(out), {})
+    assert sorted(p.name for p in out.rglob("*.java")) == ["Keep.java"]
+    assert result["unchanged"] == 1
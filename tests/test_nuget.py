@@ -0,0 +1,123 @@
+import json
+import pytest
+from migrator_tool.models import CsprojInfo, MavenDependency, PackageReference
+from migrator_tool.nuget import (MAPPING_TABLE_VERSION, DependencyResolver, merge_dependencies, parse_csproj,
+                                 version_matches)
+
+SDK_PROJECT = """﻿<Project Sdk="Microsoft.NET.Sdk.Web">
+  <PropertyGroup>
+    <TargetFrameworks>net6.0;net8.0</TargetFrameworks>
+  </PropertyGroup>
+  <ItemGroup>
+    <PackageReference Include="Npgsql" Version="7.0.4" />
+    <PackageReference Include="Serilog.AspNetCore">
+      <Version>8.0.0</Version>
+    </PackageReference>
+    <PackageReference Update="Dapper" />
+    <ProjectReference Include="..\\Core\\Core.csproj" />
+  </ItemGroup>
+</Project>
+"""
+
+LEGACY_PROJECT = """<?xml version="1.0" encoding="utf-8"?>
+<Project ToolsVersion="15.0" xmlns="http://schemas.microsoft.com/developer/msbuild/2003">
+  <PropertyGroup>
+    <TargetFramework>net48</TargetFramework>
+  </PropertyGroup>
+  <ItemGroup>
+    <PackageReference Include="Newtonsoft.Json" Version="13.0.1" />
+  </ItemGroup>
+</Project>
+"""
+
+
+def _project(*packages):
+    return CsprojInfo(path="App/App.csproj",
+                      package_references=[PackageReference(name=n, version=v) for n, v in packages])
+
+
+def test_parse_csproj_sdk_style():
+    info = parse_csproj("src/Api/Api.csproj", SDK_PROJECT)
+    assert info.sdk == "Microsoft.NET.Sdk.Web"
+    assert info.target_frameworks == ["net6.0", "net8.0"]
+    assert [(p.name, p.version) for p in info.package_references] == [
+        ("Npgsql", "7.0.4"), ("Serilog.AspNetCore", "8.0.0"), ("Dapper", None)]
+    assert info.project_references == ["src/Core/Core.csproj"]
+
+
+def test_parse_csproj_namespaced_and_broken_files():
+    info = parse_csproj("Legacy.csproj", LEGACY_PROJECT)
+    assert info.target_frameworks == ["net48"]
+    assert info.package_references == [PackageReference(name="Newtonsoft.Json", version="13.0.1")]
+    assert parse_csproj("Bad.csproj", "<Project>") == CsprojInfo(path="Bad.csproj")
+
+
+@pytest.mark.parametrize("version, constraint, expected", [
+    ("7.0.4", None, True),
+    ("7.0.4", ">=7", True),
+    ("6.0.25", ">=7", False),
+    ("6.0", ">=6,<8", True),
+    ("8.0.1", ">=6,<8", False),
+    ("5", "==5.0.0", True),
+    (None, ">=1", False),
+    ("1.0", "~1", False),
+])
+def test_version_matches(version, constraint, expected):
+    assert version_matches(version, constraint) is expected
+
+
+def test_resolver_maps_known_packages_and_reports_unknown():
+    resolver = DependencyResolver()
+    resolved, unmapped = resolver.resolve([
+        _project(("Microsoft.EntityFrameworkCore.SqlServer", "8.0.0"), ("Serilog.Sinks.Console", "5.0.0"),
+                 ("Acme.Billing", "1.2.0")),
+        _project(("microsoft.entityframeworkcore", "8.0.0"), ("ACME.billing", "1.3.0")),
+    ])
+    assert [(d.group_id, d.artifact_id) for d in resolved] == [
+        ("org.springframework.boot", "spring-boot-starter-data-jpa"),
+        ("com.microsoft.sqlserver", "mssql-jdbc"),
+    ]
+    assert resolved[1].scope == "runtime"
+    # Known but nothing to add (Serilog*), unknown deduplicated case-insensitively
+    assert unmapped == [PackageReference(name="Acme.Billing", version="1.2.0")]
+
+
+def test_resolver_prefers_longer_globs():
+    resolver = DependencyResolver()
+    redis = resolver.lookup(PackageReference(name="Microsoft.Extensions.Caching.StackExchangeRedis"))
+    assert [d.artifact_id for d in redis] == ["spring-boot-starter-data-redis", "spring-boot-starter-cache"]
+    assert resolver.lookup(PackageReference(name="Microsoft.Extensions.Logging")) == []
+    assert resolver.lookup(PackageReference(name="Acme.Billing")) is None
+
+
+def test_overrides_win_and_respect_versions():
+    resolver = DependencyResolver({
+        "$table_version": MAPPING_TABLE_VERSION,
+        "Npgsql": [{"group_id": "org.postgresql", "artifact_id": "postgresql", "version": "42.7.1"}],
+        "Acme.*": [
+            {"versions": ">=2", "maven": [{"group_id": "com.acme", "artifact_id": "acme2"}]},
+            {"versions": "<2", "maven": [{"group_id": "com.acme", "artifact_id": "acme1"}]},
+        ],
+    })
+    assert resolver.lookup(PackageReference(name="Npgsql", version="7.0.0")) == [
+        MavenDependency(group_id="org.postgresql", artifact_id="postgresql", version="42.7.1")]
+    assert resolver.lookup(PackageReference(name="Acme.Billing", version="2.1"))[0].artifact_id == "acme2"
+    assert resolver.lookup(PackageReference(name="Acme.Billing", version="1.9"))[0].artifact_id == "acme1"
+    # Version-constrained rules don't apply to unknown versions
+    assert resolver.lookup(PackageReference(name="Acme.Billing")) is None
+
+
+def test_from_file_rejects_newer_tables(tmp_path):
+    path = tmp_path / "map.json"
+    path.write_text(json.dumps({"$table_version": MAPPING_TABLE_VERSION + 1}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        DependencyResolver.from_file(str(path))
+    assert DependencyResolver.from_file(None).mappings.keys() == DependencyResolver().mappings.keys()
+
+
+def test_merge_dependencies_keeps_resolved_coordinates():
+    resolved = [MavenDependency(group_id="org.postgresql", artifact_id="postgresql", scope="runtime")]
+    suggested = [MavenDependency(group_id="org.postgresql", artifact_id="postgresql", version="42.0.0"),
+                 MavenDependency(group_id="com.acme", artifact_id="acme")]
+    merged = merge_dependencies(resolved, suggested)
+    assert merged == [resolved[0], suggested[1]]
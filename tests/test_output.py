@@ -0,0 +1,69 @@
+import os
+import stat
+import pytest
+from migrator_tool.output import OutputWriter
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    writer = OutputWriter(str(tmp_path))
+    assert writer.write("src/A.java", "class A {}") is True
+    path = tmp_path / "src" / "A.java"
+    os.utime(path, (1_000_000, 1_000_000))
+
+    assert writer.write("src/A.java", "class A {}") is False
+    assert path.stat().st_mtime == 1_000_000
+    assert writer.write("src/A.java", "class A { int x; }") is True
+    assert path.read_text(encoding="utf-8") == "class A { int x; }"
+    assert (writer.written, writer.unchanged) == (2, 1)
+
+
+def test_existing_files_are_compared_by_content(tmp_path):
+    (tmp_path / "pom.xml").write_text("<project/>", encoding="utf-8")
+    # A new writer has no hashes yet and reads what is on disk
+    writer = OutputWriter(str(tmp_path))
+    assert writer.write("pom.xml", "<project/>") is False
+    # Changed behind its back: the cached hash is not trusted once the file is gone
+    (tmp_path / "pom.xml").unlink()
+    assert writer.write("pom.xml", "<project/>") is True
+
+
+def test_writes_keep_the_file_mode_and_leave_no_temp_files(tmp_path):
+    writer = OutputWriter(str(tmp_path))
+    writer.write("run.sh", "echo 1")
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE((tmp_path / "run.sh").stat().st_mode) == 0o666 & ~umask
+
+    os.chmod(tmp_path / "run.sh", 0o755)
+    writer.write("run.sh", "echo 2")
+    assert stat.S_IMODE((tmp_path / "run.sh").stat().st_mode) == 0o755
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["run.sh"]
+
+
+def test_failed_write_leaves_the_old_file(tmp_path, monkeypatch):
+    writer = OutputWriter(str(tmp_path))
+    writer.write("A.java", "old")
+
+    def fail(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        writer.write("A.java", "new")
+    assert (tmp_path / "A.java").read_text(encoding="utf-8") == "old"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["A.java"]
+
+
+def test_background_writes_call_back_and_flush_raises_errors(tmp_path):
+    writer = OutputWriter(str(tmp_path))
+    changes = []
+    for i in range(5):
+        writer.submit(f"src/F{i}.java", f"class F{i} {{}}", on_done=changes.append)
+    writer.submit("src/F0.java", "class F0 {}", on_done=changes.append)
+    writer.flush()
+    assert changes == [True] * 5 + [False]
+
+    (tmp_path / "blocked").write_text("a file, not a directory", encoding="utf-8")
+    writer.submit("blocked/X.java", "class X {}")
+    with pytest.raises(OSError):
+        writer.flush()
+    writer.close()
@@ -0,0 +1,114 @@
+import pytest
+from migrator_tool.patching import (PatchError, apply_edits, apply_patch_response, error_lines, numbered_excerpt,
+                                    parse_line_edits, parse_unified_diff, validate_patch)
+
+CODE = """package com.example;
+
+import java.util.List;
+
+public class Foo {
+    int a = 1;
+    int b = 2;
+}
+"""
+
+
+def test_error_lines_collects_line_numbers():
+    assert error_lines(["Line 9: cannot find symbol", "Lines 3, 12: ';' expected", "BUILD FAILURE"]) == [3, 9, 12]
+
+
+def test_numbered_excerpt_small_file_is_complete():
+    excerpt = numbered_excerpt(CODE, [6])
+    assert "    1| package com.example;" in excerpt
+    assert "    8| }" in excerpt
+    assert "..." not in excerpt
+
+
+def test_numbered_excerpt_large_file_keeps_header_and_windows():
+    code = "package a;\nimport b.C;\npublic class X {\n" + "".join(f"    int f{i};\n" for i in range(400)) + "}\n"
+    excerpt = numbered_excerpt(code, [200], context=2)
+    lines = excerpt.splitlines()
+    assert lines[:3] == ["    1| package a;", "    2| import b.C;", "    3| public class X {"]
+    assert "  198|     int f194;" in lines
+    assert "  202|     int f198;" in lines
+    assert "  203|     int f199;" not in lines
+    assert lines[3] == lines[-1] == "  ..."
+
+
+def test_parse_line_edits_all_directives():
+    response = """Some explanation first.
+@@ REPLACE 6-7
+    6| int a = 10;
+    7| int b = 20;
+@@ END
+@@ INSERT AFTER 3
+import java.util.Map;
+@@ END
+@@ DELETE 2
+"""
+    assert parse_line_edits(response) == [
+        (6, 7, ["int a = 10;", "int b = 20;"]),  # echoed line numbers are stripped
+        (4, 3, ["import java.util.Map;"]),
+        (2, 2, []),
+    ]
+
+
+def test_parse_line_edits_rejects_bad_edits():
+    with pytest.raises(PatchError):
+        parse_line_edits("@@ REPLACE 3\nint x;\n")
+    with pytest.raises(PatchError):
+        parse_line_edits("@@ REPLACE 5-3\nint x;\n@@ END\n")
+    with pytest.raises(PatchError):
+        parse_line_edits("@@ DELETE 3\nint x;\n@@ END\n")
+
+
+def test_apply_edits_bottom_up():
+    patched = apply_edits(CODE, [(6, 6, ["    int a = 10;"]), (4, 3, ["import java.util.Map;"]), (2, 2, [])])
+    assert patched.splitlines()[:4] == ["package com.example;", "import java.util.List;", "import java.util.Map;", ""]
+    assert "    int a = 10;" in patched
+    assert patched.endswith("}\n")
+
+
+def test_apply_edits_rejects_overlaps_and_out_of_range():
+    with pytest.raises(PatchError):
+        apply_edits(CODE, [])
+    with pytest.raises(PatchError):
+        apply_edits(CODE, [(5, 7, ["x"]), (6, 6, ["y"])])
+    with pytest.raises(PatchError):
+        apply_edits(CODE, [(8, 9, ["x"])])
+
+
+def test_unified_diff_applies_with_offset():
+    # Stated position is off by two lines; the hunk is found by its context
+    diff = """--- a/Foo.java
++++ b/Foo.java
+@@ -8,3 +8,3 @@
+ public class Foo {
+-    int a = 1;
++    int a = 10;
+     int b = 2;
+"""
+    edits = parse_unified_diff(CODE, diff)
+    assert edits == [(5, 7, ["public class Foo {", "    int a = 10;", "    int b = 2;"])]
+    assert "    int a = 10;" in apply_patch_response(CODE, diff)
+
+
+def test_unified_diff_must_match_the_file():
+    diff = "@@ -6,1 +6,1 @@\n-    int c = 3;\n+    int c = 4;\n"
+    with pytest.raises(PatchError):
+        parse_unified_diff(CODE, diff)
+
+
+def test_apply_patch_response_line_protocol():
+    patched = apply_patch_response(CODE, "@@ REPLACE 7\n    int b = 3;\n@@ END\n")
+    assert "    int b = 3;" in patched
+    assert "int b = 2;" not in patched
+
+
+def test_validate_patch():
+    assert validate_patch(CODE, CODE.replace("1;", "10;"), "Foo") is None
+    assert validate_patch(CODE, "  \n", "Foo") == "empty result"
+    assert validate_patch(CODE, CODE.replace("package com.example;", ""), "Foo") == \
+        "package declaration changed or removed"
+    assert validate_patch(CODE, CODE.replace("class Foo", "class Bar"), "Foo") == "type Foo no longer declared"
+    assert validate_patch(CODE, CODE.rstrip().rstrip("}"), "Foo") == "unbalanced braces"
@@ -0,0 +1,68 @@
+import time
+from migrator_tool.fake_llm import FakeLLMClient
+from migrator_tool.pipeline import migrate_project
+
+SERVICE = """namespace Shop.Services
+{{
+    public class {name}
+    {{
+        public int Run(int input) {{ return input + 1; }}
+    }}
+}}
+"""
+
+
+class SlowFileLLM(FakeLLMClient):
+    """Answers instantly except for the translation of one class."""
+    def __init__(self, slow_class: str, delay: float, **kwargs):
+        self.slow_class = slow_class
+        self.delay = delay
+        super().__init__(latency=0.0, jitter=0.0, **kwargs)
+
+    def _send(self, model_name, system_instruction, prompt):
+        if f"public class {self.slow_class}" in prompt:
+            time.sleep(self.delay)
+        return super()._send(model_name, system_instruction, prompt)
+
+
+def _project(root, count=5):
+    for i in range(count):
+        path = root / "Services" / f"Service{i}.cs"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(SERVICE.format(name=f"Service{i}"), encoding="utf-8")
+    return root
+
+
+def test_translate_progress_moves_while_an_early_file_is_slow(tmp_path):
+    source = _project(tmp_path / "in")
+    events = []
+    start = time.perf_counter()
+
+    def on_progress(stage, done, total):
+        events.append((stage, done, total, time.perf_counter() - start))
+
+    result = migrate_project(SlowFileLLM("Service0", delay=1.0), str(source), str(tmp_path / "out"),
+                             {"workers": 5}, on_progress=on_progress)
+    assert result["translated"] == 5 and result["failed"] == []
+
+    translate = [e for e in events if e[0] == "translate"]
+    assert [done for _, done, _, _ in translate] == [0, 1, 2, 3, 4, 5]
+    # The four quick files show up long before the slow first one is done
+    assert translate[4][3] < translate[5][3] - 0.5
+
+
+def test_migrate_writes_outputs_and_skips_unchanged_files(tmp_path):
+    source = _project(tmp_path / "in", count=3)
+    out = tmp_path / "out"
+    messages = []
+    first = migrate_project(FakeLLMClient(latency=0.0, jitter=0.0), str(source), str(out), {},
+                            on_message=messages.append)
+    assert first["translated"] == 3
+    assert (out / "pom.xml").exists()
+    java = sorted(p.name for p in out.rglob("*.java"))
+    assert java == ["Service0.java", "Service1.java", "Service2.java"]
+
+    (source / "Services" / "Service1.cs").write_text(SERVICE.format(name="Service1").replace("+ 1", "+ 2"),
+                                                     encoding="utf-8")
+    second = migrate_project(FakeLLMClient(latency=0.0, jitter=0.0), str(source), str(out), {})
+    assert (second["translated"], second["unchanged"]) == (1, 2)
@@ -0,0 +1,110 @@
+import pytest
+from migrator_tool.fake_llm import FakeLLMClient, SimulatedLLMError
+from migrator_tool.models import FileMapping, PlanSkeleton
+from migrator_tool.planner import MigrationPlanner, default_mapping, planning_inputs, shard_by_directory
+from migrator_tool.resilience import RetryPolicy
+
+
+class PermissionDenied(Exception):
+    code = 403
+
+
+class ShardFailingLLM(FakeLLMClient):
+    """Fails every shard mapping call with `error`; other prompts get the usual canned answers."""
+    def __init__(self, error, **kwargs):
+        self.error = error
+        super().__init__(latency=0.0, jitter=0.0, retry=RetryPolicy(max_attempts=1), **kwargs)
+
+    def _send(self, model_name, system_instruction, prompt):
+        if "Map the following C# files" in prompt:
+            raise self.error
+        return super()._send(model_name, system_instruction, prompt)
+
+
+def _mapping(source, target, package="com.example.app"):
+    return FileMapping(source_file=source, target_path=target, package_name=package)
+
+
+def _scan_result(files):
+    return {"structure": {"files": files}, "contents": {f: "" for f in files}}
+
+
+def test_planning_inputs_picks_project_and_startup_files():
+    contents = {"App.csproj": "<Project/>", "Program.cs": "x", "Startup.cs": "y", "appsettings.json": "{}",
+                "Models/Order.cs": "z"}
+    assert set(planning_inputs({"contents": contents})) == {"App.csproj", "Program.cs", "Startup.cs",
+                                                            "appsettings.json"}
+
+
+def test_shard_by_directory_keeps_directories_together():
+    files = [f"A/{i}.cs" for i in range(3)] + [f"B/{i}.cs" for i in range(2)] + [f"C/{i}.cs" for i in range(5)]
+    shards = shard_by_directory(files, shard_size=4)
+    assert shards == [["A/0.cs", "A/1.cs", "A/2.cs"], ["B/0.cs", "B/1.cs"],
+                      ["C/0.cs", "C/1.cs", "C/2.cs", "C/3.cs"], ["C/4.cs"]]
+    assert sorted(f for shard in shards for f in shard) == sorted(files)
+
+
+@pytest.mark.parametrize("source, package", [
+    ("Models/Order.cs", "com.shop.models"),
+    ("Api-V1/Orders.cs", "com.shop.apiv1"),
+    ("2024/Report.cs", "com.shop._2024"),
+    ("Interface/Default/IRepo.cs", "com.shop.interface_.default_"),
+    ("Order.cs", "com.shop"),
+])
+def test_default_mapping_builds_valid_packages(source, package):
+    mapping = default_mapping(source, "com.shop")
+    assert mapping.package_name == package
+    assert mapping.target_path == f"src/main/java/{package.replace('.', '/')}/{source.rsplit('/', 1)[-1][:-3]}.java"
+
+
+def test_merge_mappings_drops_unknown_duplicate_and_colliding_mappings():
+    messages = []
+    planner = MigrationPlanner(FakeLLMClient(latency=0.0, jitter=0.0), on_message=messages.append)
+    cs_files = ["A/Order.cs", "B/Order.cs", "C/Line.cs", "D/Item.cs"]
+    batches = [
+        [_mapping("A/Order.cs", "src/main/java/com/app/Order.java"),
+         _mapping("Unknown.cs", "src/main/java/com/app/Unknown.java")],
+        [_mapping("B/Order.cs", "src/main/java/com/app/Order.java"),
+         _mapping("A/Order.cs", "src/main/java/com/app/other/Order.java"),
+         _mapping("C/Line.cs", "src/main/java/com/app/Line.java")],
+    ]
+    merged = planner._merge_mappings(cs_files, batches, "com.app")
+    assert [m.source_file for m in merged] == cs_files
+    assert [m.target_path for m in merged] == [
+        "src/main/java/com/app/Order.java",
+        "src/main/java/com/app/b/Order.java",  # collided, falls back to its directory
+        "src/main/java/com/app/Line.java",
+        "src/main/java/com/app/d/Item.java",  # no shard mapped it
+    ]
+    assert len(messages) == 1 and "B/Order.cs" in messages[0]
+
+
+def test_directory_fallbacks_never_share_a_target():
+    planner = MigrationPlanner(FakeLLMClient(latency=0.0, jitter=0.0))
+    merged = planner._merge_mappings(["Api-V1/Orders.cs", "ApiV1/Orders.cs"], [], "com.app")
+    assert [m.package_name for m in merged] == ["com.app.apiv1", "com.app.apiv12"]
+    assert len({m.target_path for m in merged}) == 2
+
+
+def test_sharded_plan_maps_every_file():
+    files = ["App.csproj"] + [f"Dir{d}/File{i}.cs" for d in range(3) for i in range(4)]
+    planner = MigrationPlanner(FakeLLMClient(latency=0.0, jitter=0.0), shard_size=5, workers=3)
+    plan = planner.create_plan(_scan_result(files))
+    assert [m.source_file for m in plan.file_mappings] == [f for f in files if f.endswith(".cs")]
+    assert len({m.target_path for m in plan.file_mappings}) == 12
+    assert plan.project_name == "BenchApp"
+
+
+def test_failed_shard_falls_back_and_reports_through_the_callback(capsys):
+    messages = []
+    planner = MigrationPlanner(ShardFailingLLM(SimulatedLLMError("503")), on_message=messages.append)
+    skeleton = PlanSkeleton(project_name="App", base_package="com.app", dependencies=[], application_properties={})
+    assert planner._map_shard(skeleton, ["A/One.cs", "A/Two.cs"]) == []
+    assert len(messages) == 1 and "2 file(s)" in messages[0]
+    assert capsys.readouterr().out == ""
+
+
+def test_fatal_shard_errors_fail_the_plan():
+    planner = MigrationPlanner(ShardFailingLLM(PermissionDenied("no access")), shard_size=1)
+    with pytest.raises(PermissionDenied):
+        planner.create_plan(_scan_result(["A/One.cs", "B/Two.cs"]))
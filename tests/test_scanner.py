@@ -0,0 +1,58 @@
+import pytest
+from migrator_tool import scanner as scanner_module
+from migrator_tool.scanner import LazyContents, ProjectScanner
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "Models").mkdir()
+    (tmp_path / "Models" / "Order.cs").write_bytes("﻿public class Order { }\n".encode("utf-8"))
+    (tmp_path / "Legacy.cs").write_bytes("// Caf\xe9\npublic class Legacy { }\n".encode("cp1252"))
+    (tmp_path / "App.csproj").write_text("<Project/>", encoding="utf-8")
+    (tmp_path / "Big.cs").write_text("// " + "x" * 2000 + "\n", encoding="utf-8")
+    (tmp_path / "Blob.config").write_bytes(b"MZ\0\0binary")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG")
+    (tmp_path / "bin").mkdir()
+    (tmp_path / "bin" / "Generated.cs").write_text("class Generated { }", encoding="utf-8")
+    return tmp_path
+
+
+def test_scan_classifies_files_and_skips_ignored_directories(project):
+    result = ProjectScanner(str(project), max_file_bytes=1024).scan()
+    structure = result["structure"]
+    assert sorted(structure["files"]) == ["App.csproj", "Big.cs", "Blob.config", "Legacy.cs", "Models/Order.cs",
+                                          "logo.png"]
+    assert structure["skipped"] == {"binary": ["Blob.config"], "too_large": ["Big.cs"]}
+    assert sorted(result["contents"]) == ["App.csproj", "Legacy.cs", "Models/Order.cs"]
+
+
+def test_contents_strip_the_bom_and_fall_back_to_cp1252(project):
+    contents = ProjectScanner(str(project)).scan()["contents"]
+    assert contents["Models/Order.cs"] == "public class Order { }\n"
+    assert contents["Legacy.cs"].startswith("// Caf\xe9")
+
+
+def test_lazy_contents_read_on_every_access(project):
+    result = ProjectScanner(str(project), max_file_bytes=1024).scan(lazy=True)
+    contents = result["contents"]
+    assert isinstance(contents, LazyContents)
+    assert contents["App.csproj"] == "<Project/>"
+    assert contents.record("App.csproj").size == len("<Project/>")
+    # Nothing is cached, so the current file content is what comes back
+    (project / "App.csproj").write_text("<Project Sdk=\"x\"/>", encoding="utf-8")
+    assert contents["App.csproj"] == "<Project Sdk=\"x\"/>"
+    assert dict(contents) == ProjectScanner(str(project), max_file_bytes=1024).scan()["contents"]
+
+
+def test_large_files_decode_from_the_mmap(project, monkeypatch):
+    monkeypatch.setattr(scanner_module, "MMAP_THRESHOLD", 16)
+    contents = ProjectScanner(str(project)).scan(lazy=True)["contents"]
+    assert contents["Big.cs"] == "// " + "x" * 2000 + "\n"
+    assert contents["Models/Order.cs"] == "public class Order { }\n"
+    assert contents["Legacy.cs"].startswith("// Caf\xe9")
+
+
+def test_scan_indexes_symbols_and_honours_excludes(project):
+    result = ProjectScanner(str(project), exclude=["Legacy.cs"]).scan(lazy=True, index_symbols=True)
+    assert "Legacy.cs" not in result["structure"]["files"]
+    assert result["symbols"].declared_in("Order") == ["Models/Order.cs"]
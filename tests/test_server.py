@@ -0,0 +1,104 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+import pytest
+from migrator_tool.fake_llm import FakeLLMClient
+from migrator_tool.server import MigrationService, make_server
+
+SAMPLE_APP = Path(__file__).resolve().parent.parent / "sample_dotnet_app"
+
+
+@pytest.fixture
+def service():
+    service = MigrationService(FakeLLMClient(latency=0.0, jitter=0.0), jobs=1)
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def base_url(service):
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _request(url, method="GET", body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def _wait(service, job_id, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = service.get(job_id)
+        if job.status not in ("queued", "running"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} still {job.status}")
+
+
+def test_submit_validates_parameters(service):
+    with pytest.raises(ValueError, match="Unknown job type"):
+        service.submit("deploy", {})
+    with pytest.raises(ValueError, match="output_dir"):
+        service.submit("migrate", {"input_dir": "src"})
+    with pytest.raises(ValueError, match="colour"):
+        service.submit("analyze", {"input_dir": "src", "colour": "blue"})
+
+
+def test_analyze_job_runs_to_completion(service):
+    job = _wait(service, service.submit("analyze", {"input_dir": str(SAMPLE_APP)}).id)
+    assert job.status == "succeeded", job.error
+    sources = {m["source_file"] for m in job.result["plan"]["file_mappings"]}
+    assert "WeatherForecast.cs" in sources
+
+
+def test_migrate_job_reports_progress_and_messages(service, tmp_path):
+    job = service.submit("migrate", {"input_dir": str(SAMPLE_APP), "output_dir": str(tmp_path), "workers": 2})
+    job = _wait(service, job.id)
+    assert job.status == "succeeded", job.error
+    assert job.result["failed"] == []
+    assert (job.stage, job.done) == ("write", 0)
+    assert any(message.startswith("Plan generated") for message in job.messages)
+    assert (tmp_path / "pom.xml").exists()
+
+
+def test_http_rejects_malformed_bodies(base_url):
+    assert _request(f"{base_url}/jobs", "POST", ["migrate"])[0] == 400
+    assert _request(f"{base_url}/jobs", "POST", {"type": "migrate", "params": ["x"]})[0] == 400
+    status, body = _request(f"{base_url}/jobs", "POST", {"type": "analyze", "params": {}})
+    assert status == 400 and "input_dir" in body["error"]
+    assert _request(f"{base_url}/jobs/nope")[0] == 404
+    assert _request(f"{base_url}/jobs/nope/cancel", "POST", {})[0] == 409
+
+
+def test_http_job_round_trip(base_url, service):
+    status, job = _request(f"{base_url}/jobs", "POST", {"type": "analyze", "params": {"input_dir": str(SAMPLE_APP)}})
+    assert status == 202 and job["status"] in ("queued", "running")
+    _wait(service, job["id"])
+    status, job = _request(f"{base_url}/jobs/{job['id']}")
+    assert status == 200 and job["status"] == "succeeded"
+    status, health = _request(f"{base_url}/health")
+    assert health["jobs"] == {"succeeded": 1}
+
+
+def test_shutdown_cancels_queued_jobs():
+    service = MigrationService(FakeLLMClient(latency=0.5, jitter=0.0), jobs=1)
+    first = service.submit("analyze", {"input_dir": str(SAMPLE_APP)})
+    second = service.submit("analyze", {"input_dir": str(SAMPLE_APP)})
+    while first.status == "queued":
+        time.sleep(0.01)
+    service.shutdown()
+    assert first.status == "succeeded"
+    assert second.status == "cancelled"
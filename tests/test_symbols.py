@@ -0,0 +1,73 @@
+from migrator_tool.symbols import SymbolIndex, parse_csharp
+
+ORDER = """using System;
+namespace Shop.Models
+{
+    // class NotAType { }
+    public class Order
+    {
+        public int Id { get; set; }
+        public string Name => "order";
+        private int _secret;
+        public Line AddLine(Product product, int count) { return null; }
+    }
+
+    public record Summary(int Total);
+}
+"""
+
+SOURCES = {
+    "Models/Order.cs": ORDER,
+    "Models/Line.cs": "namespace Shop.Models { public class Line { public Product Product { get; set; } } }",
+    "Models/Product.cs": "namespace Shop.Models { public class Product { } }",
+    "Api/OrdersController.cs": "using Shop.Models;\nnamespace Shop.Api { public class OrdersController "
+                               "{ public Order Get(int id) { return null; } } }",
+    "Legacy/Product.cs": "namespace Shop.Legacy { public class Product { } }",
+}
+
+
+def _index(paths=SOURCES):
+    index = SymbolIndex()
+    for path in paths:
+        index.add_file(path, SOURCES[path])
+    return index
+
+
+def test_parse_csharp_keeps_visible_signatures_only():
+    symbols = parse_csharp("Models/Order.cs", ORDER)
+    assert symbols.namespaces == ["Shop.Models"]
+    assert symbols.usings == ["System"]
+    assert [(t.name, t.kind) for t in symbols.types] == [("Order", "class"), ("Summary", "record")]
+    order = symbols.types[0]
+    assert order.members == ["public int Id { get; set; }", "public string Name { get; }",
+                             "public Line AddLine(Product product, int count);"]
+
+
+def test_declared_in_lists_every_declaring_file():
+    index = _index()
+    assert index.declared_in("Product") == ["Models/Product.cs", "Legacy/Product.cs"]
+    assert index.declared_in("Missing") == []
+
+
+def test_referenced_types_prefer_the_visible_namespace():
+    index = _index()
+    referenced = index.referenced_types("Models/Order.cs")
+    assert [(t.name, t.namespace) for t in referenced] == [("Line", "Shop.Models"), ("Product", "Shop.Models")]
+    # Without a namespace match every candidate is kept
+    index.add_file("Tools/Export.cs", "namespace Tools { public class Export { Product p; } }")
+    assert [t.namespace for t in index.referenced_types("Tools/Export.cs")] == ["Shop.Models", "Shop.Legacy"]
+
+
+def test_dependency_order_puts_used_types_first():
+    index = _index()
+    paths = ["Api/OrdersController.cs", "Models/Order.cs", "Models/Line.cs", "Models/Product.cs"]
+    assert index.dependency_order(paths) == ["Models/Product.cs", "Models/Line.cs", "Models/Order.cs",
+                                             "Api/OrdersController.cs"]
+
+
+def test_dependency_cycles_keep_input_order():
+    index = SymbolIndex()
+    index.add_file("A.cs", "public class A { B b; }")
+    index.add_file("B.cs", "public class B { A a; }")
+    index.add_file("C.cs", "public class C { }")
+    assert index.dependency_order(["B.cs", "A.cs", "C.cs"]) == ["C.cs", "B.cs", "A.cs"]